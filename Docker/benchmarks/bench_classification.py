@@ -0,0 +1,45 @@
+"""
+Series.apply(classify_drug) vs classify_efficacy.
+
+Usage (from Docker/):
+    python benchmarks/bench_classification.py --sizes 10000 1000000 10000000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from common import timed
+from data_processor import classify_drug, classify_efficacy
+
+PHASE_BINS = {
+    "thresholds": [0.5, 0.8],
+    "labels": ["Low Efficacy", "Moderate Efficacy", "High Efficacy"],
+    "phases": {
+        "Phase 1": {"thresholds": [0.3, 0.6], "labels": ["Low Efficacy", "Moderate Efficacy", "High Efficacy"]},
+        "Phase 2": {"thresholds": [0.4, 0.7], "labels": ["Low Efficacy", "Moderate Efficacy", "High Efficacy"]},
+    },
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**6, 10**7])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'apply_s':>9} {'vectorized_s':>13} {'per_phase_s':>12} {'apply_MB':>9} {'categorical_MB':>15}")
+    for n_rows in args.sizes:
+        efficacy = pd.Series(rng.uniform(0, 1, size=n_rows))
+        phases = rng.choice(["Phase 1", "Phase 2", "Phase 3"], size=n_rows)
+
+        labels, apply_time = timed(efficacy.apply, classify_drug)
+        categories, vectorized_time = timed(classify_efficacy, efficacy)
+        _, per_phase_time = timed(classify_efficacy, efficacy, phases, PHASE_BINS)
+        assert (categories.astype(object) == labels.to_numpy()).all()
+
+        apply_mb = labels.memory_usage(deep=True) / 1e6
+        categorical_mb = categories.memory_usage(deep=True) / 1e6
+        print(f"{n_rows:>10} {apply_time:>9.3f} {vectorized_time:>13.3f} {per_phase_time:>12.3f} {apply_mb:>9.1f} {categorical_mb:>15.1f}")
+
+if __name__ == "__main__":
+    main()
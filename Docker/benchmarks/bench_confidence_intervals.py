@@ -0,0 +1,49 @@
+"""
+Row-wise vs vectorized Beta posterior intervals.
+
+Usage (from Docker/):
+    python benchmarks/bench_confidence_intervals.py --sizes 10000 1000000 10000000
+
+The row-wise path is timed on at most --rowwise-limit rows and extrapolated
+linearly above that, since at 10^7 rows it would run for the better part of an hour.
+"""
+import argparse
+
+import numpy as np
+
+from common import timed
+from data_processor import calculate_confidence_interval, calculate_confidence_intervals
+from synthetic_data import generate_trials
+
+def rowwise(df):
+    ci_bounds = df.apply(lambda row: calculate_confidence_interval(row["successful_outcomes"], row["total_patients"]), axis=1)
+    lower, upper = zip(*ci_bounds)
+    return np.asarray(lower), np.asarray(upper)
+
+def vectorized(df):
+    return calculate_confidence_intervals(df["successful_outcomes"], df["total_patients"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**6, 10**7])
+    parser.add_argument("--rowwise-limit", type=int, default=10**5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'rowwise_s':>12} {'vectorized_s':>13} {'speedup':>9}")
+    for n_rows in args.sizes:
+        df = generate_trials(n_rows)[["successful_outcomes", "total_patients"]]
+
+        sample = df.iloc[:min(n_rows, args.rowwise_limit)]
+        (row_lower, row_upper), row_time = timed(rowwise, sample)
+        row_time *= n_rows / len(sample)
+
+        (vec_lower, vec_upper), vec_time = timed(vectorized, df)
+        assert np.array_equal(row_lower, vec_lower[:len(sample)])
+        assert np.array_equal(row_upper, vec_upper[:len(sample)])
+
+        estimate = "*" if len(sample) < n_rows else " "
+        print(f"{n_rows:>10} {row_time:>11.2f}{estimate} {vec_time:>13.3f} {row_time / vec_time:>8.0f}x")
+    print("* extrapolated from --rowwise-limit rows")
+
+if __name__ == "__main__":
+    main()
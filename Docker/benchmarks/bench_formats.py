@@ -0,0 +1,43 @@
+"""
+Read/process/write time and file size for CSV, Parquet and Arrow IPC.
+
+Usage (from Docker/):
+    python benchmarks/bench_formats.py --sizes 1000000 10000000
+
+Inputs are read with projection onto the required columns plus TRIAL_ID.
+"""
+import argparse
+import os
+import tempfile
+
+from common import timed
+from data_io import read_trials, write_results
+from data_processor import process_clinical_trials
+from synthetic_data import generate_trials
+
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**6, 10**7])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'format':>8} {'read_s':>8} {'process_s':>10} {'write_s':>8} {'in_MB':>8} {'out_MB':>8}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_rows in args.sizes:
+            df = generate_trials(n_rows)
+            for data_format, extension in EXTENSIONS.items():
+                input_file = os.path.join(tmpdir, "trials" + extension)
+                output_file = os.path.join(tmpdir, "results" + extension)
+                write_results(df, input_file)
+
+                trials, read_time = timed(read_trials, input_file, passthrough_columns=["TRIAL_ID"])
+                processed_df, process_time = timed(process_clinical_trials, trials)
+                _, write_time = timed(write_results, processed_df, output_file)
+
+                in_mb = os.path.getsize(input_file) / 1e6
+                out_mb = os.path.getsize(output_file) / 1e6
+                print(f"{n_rows:>10} {data_format:>8} {read_time:>8.2f} {process_time:>10.2f} {write_time:>8.2f} {in_mb:>8.1f} {out_mb:>8.1f}")
+
+if __name__ == "__main__":
+    main()
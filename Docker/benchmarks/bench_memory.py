@@ -0,0 +1,64 @@
+"""
+Peak RSS of ingesting and processing a synthetic trials CSV, comparing plain
+pd.read_csv + process_clinical_trials with the read_trials dtype plan and
+completed-only filtering.
+
+Usage (from Docker/):
+    python benchmarks/bench_memory.py --rows 10000000
+
+Each variant runs in a fresh subprocess so its peak RSS is measured on its own.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import SRC_DIR
+from synthetic_data import generate_trials
+
+VARIANTS = {
+    "imports only": "df = pd.read_csv(path, nrows=0)",
+    "inferred dtypes": "df = pd.read_csv(path)",
+    "dtype plan": "df = read_trials(path, completed_only=True)",
+}
+
+SCRIPT = """
+import resource, sys, time
+sys.path.insert(0, {src_dir!r})
+import pandas as pd
+from data_io import read_trials
+from data_processor import process_clinical_trials
+path = {path!r}
+start = time.perf_counter()
+{read}
+read_mb = df.memory_usage(deep=True).sum() / 1e6
+processed_df = process_clinical_trials(df)
+try:
+    # VmHWM starts fresh at exec; ru_maxrss on Linux keeps the forking parent's peak.
+    with open("/proc/self/status") as f:
+        peak_mb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 1024
+except OSError:
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(read_mb, peak_mb, time.perf_counter() - start)
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10**7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "clinical_trials.csv")
+        generate_trials(args.rows).to_csv(path, index=False)
+
+        print(f"{args.rows} rows, {os.path.getsize(path) / 1e6:.0f} MB CSV")
+        print(f"{'variant':>16} {'frame_MB':>9} {'peak_RSS_MB':>12} {'seconds':>8}")
+        for name, read in VARIANTS.items():
+            script = SCRIPT.format(src_dir=SRC_DIR, path=path, read=read)
+            output = subprocess.run([sys.executable, "-W", "ignore", "-c", script], capture_output=True, text=True, check=True)
+            frame_mb, peak_mb, seconds = map(float, output.stdout.split())
+            print(f"{name:>16} {frame_mb:>9.0f} {peak_mb:>12.0f} {seconds:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Scaling of process_clinical_trials_parallel with the number of workers.
+
+Usage (from Docker/):
+    python benchmarks/bench_parallel.py --rows 5000000 --workers 1 2 4 8 16
+"""
+import argparse
+import os
+
+from common import timed
+from data_processor import process_clinical_trials, process_clinical_trials_parallel
+from synthetic_data import generate_trials
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5 * 10**6)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    df = generate_trials(args.rows)
+    _, serial_time = timed(process_clinical_trials, df.copy())
+
+    print(f"{args.rows} rows, {os.cpu_count()} CPUs, serial {serial_time:.2f}s")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>9} {'efficiency':>11}")
+    for max_workers in args.workers:
+        _, elapsed = timed(process_clinical_trials_parallel, df.copy(), max_workers)
+        speedup = serial_time / elapsed
+        print(f"{max_workers:>8} {elapsed:>9.2f} {speedup:>8.2f}x {speedup / max_workers:>10.0%}")
+
+if __name__ == "__main__":
+    main()
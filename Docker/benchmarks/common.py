@@ -0,0 +1,16 @@
+import os
+import sys
+import time
+
+# Benchmarks run from the Docker/ directory; make the flat src/ modules importable
+# the same way they are inside the container (/app).
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC_DIR)
+
+def timed(func, *args, **kwargs):
+    """
+    Runs func once and returns (result, elapsed seconds).
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
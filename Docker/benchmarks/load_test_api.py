@@ -0,0 +1,94 @@
+"""
+Load test for the scoring API (APP_MODE=api).
+
+Usage (from Docker/):
+    python benchmarks/load_test_api.py --spawn --requests 2000 --concurrency 64 --rows 100
+
+Each client keeps one connection open and posts --rows synthetic trials per
+request. --spawn starts the API in a subprocess on --port first.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from common import SRC_DIR
+from synthetic_data import generate_trials
+
+async def client(host, port, body, n_requests, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (
+        f"POST /score HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        writer.write(request)
+        status_line = await reader.readline()
+        headers = {}
+        while (line := await reader.readline()) != b"\r\n":
+            name, value = line.decode().split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+        await reader.readexactly(int(headers["content-length"]))
+        if b" 200 " not in status_line:
+            raise RuntimeError(status_line.decode().strip())
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+
+async def wait_for_server(host, port, timeout=30):
+    deadline = time.time() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.time() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+async def run(args):
+    await wait_for_server(args.host, args.port)
+    body = json.dumps(generate_trials(args.rows).to_dict(orient="records")).encode()
+    latencies = []
+    per_client = [args.requests // args.concurrency] * args.concurrency
+    for i in range(args.requests % args.concurrency):
+        per_client[i] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client(args.host, args.port, body, n, latencies) for n in per_client if n])
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"{len(latencies)} requests x {args.rows} rows, concurrency {args.concurrency}")
+    print(f"p50 {np.percentile(latencies_ms, 50):.1f} ms  p99 {np.percentile(latencies_ms, 99):.1f} ms  "
+          f"{len(latencies) / elapsed:.0f} req/s  {len(latencies) * args.rows / elapsed:.0f} rows/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--spawn", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        env = dict(os.environ, APP_MODE="api", API_HOST=args.host, API_PORT=str(args.port), LOG_FILE=os.devnull)
+        server = subprocess.Popen([sys.executable, os.path.join(SRC_DIR, "app.py")], env=env)
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
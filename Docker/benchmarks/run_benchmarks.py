@@ -0,0 +1,157 @@
+"""
+Regression-gated benchmark suite for the read, process and write stages.
+
+Usage (from Docker/):
+    python benchmarks/run_benchmarks.py                       # compare with benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --update-baseline     # record a new baseline
+    python benchmarks/run_benchmarks.py --rows 10000000 --threshold 0.1 --output results.json
+
+Each stage is timed --repeat times (best run kept) and run once more under
+tracemalloc for its peak Python/NumPy allocation (Arrow buffers are not
+traced). Absolute timings only compare on the machine that recorded the
+baseline, so the gate uses ratios measured within the same run:
+
+- relative_cost: stage seconds over the seconds of a fixed NumPy/pandas
+  calibration workload, timed alternately with the stage;
+- peak_ratio: peak traced memory over the in-memory size of the input rows.
+
+The run fails with exit status 1 when a stage's relative_cost grows by more
+than --threshold, or its peak_ratio by more than --memory-threshold, over
+the baseline. Timing stays noisy on shared machines even as a ratio: on the
+1-CPU VM that recorded baseline.json, relative_cost varied by up to 55%
+(max/min over four runs; sub-second stages and write_csv worst), so the
+default 50% tolerance only catches gross slowdowns. Tighten it on a
+dedicated runner. Peak memory was identical between runs for given library
+versions, hence the tighter 10% memory tolerance.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from common import timed
+from data_io import read_trials, write_results
+from data_processor import process_clinical_trials
+from synthetic_data import generate_trials
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def calibration(n_values=1_000_000):
+    """
+    Fixed reference workload (sorting, arithmetic and a pandas groupby) whose
+    time scales with the machine like the stages do.
+    """
+    values = np.random.default_rng(0).random(n_values)
+    keys = (values * 1000).astype(np.int64)
+    return np.sort(values), pd.Series(values).groupby(keys).mean()
+
+def measure(func, repeat):
+    """
+    Returns (result, best seconds over repeat runs, best calibration seconds,
+    peak traced MB of one run). The calibration runs alternate with the
+    stage runs, so both see the same machine load.
+    """
+    seconds, calibration_seconds = [], []
+    for _ in range(repeat):
+        calibration_seconds.append(timed(calibration)[1])
+        seconds.append(timed(func)[1])
+    tracemalloc.start()
+    result = func()
+    peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, min(seconds), min(calibration_seconds), peak_mb
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+def run_suite(n_rows, repeat, seed=0):
+    stages = {}
+
+    def record(name, func, rows, input_mb):
+        result, seconds, calibration_seconds, peak_mb = measure(func, repeat)
+        stages[name] = {"seconds": seconds, "rows_per_second": rows / seconds, "peak_mb": peak_mb,
+                        "relative_cost": seconds / calibration_seconds, "peak_ratio": peak_mb / input_mb}
+        print(f"{name:>16} {seconds:>9.3f}s {rows / seconds:>13,.0f} rows/s {peak_mb:>9.1f} MB "
+              f"{stages[name]['relative_cost']:>8.2f}x {stages[name]['peak_ratio']:>7.2f}x")
+        return result
+
+    print(f"{'stage':>16} {'seconds':>10} {'rows/s':>20} {'peak':>12} {'cost':>9} {'peak':>8}")
+    trials = generate_trials(n_rows, seed)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for data_format in ("csv", "parquet"):
+            input_file = os.path.join(tmpdir, f"clinical_trials.{data_format}")
+            write_results(trials, input_file)
+            df = record(f"read_{data_format}", lambda: read_trials(input_file, completed_only=True), n_rows,
+                        frame_mb(trials))
+
+        processed_df = record("process", lambda: process_clinical_trials(df.copy(deep=False)), len(df), frame_mb(df))
+
+        for data_format in ("csv", "parquet"):
+            output_file = os.path.join(tmpdir, f"processed_results.{data_format}")
+            record(f"write_{data_format}", lambda: write_results(processed_df, output_file), len(processed_df),
+                   frame_mb(processed_df))
+
+    return {"rows": n_rows, "machine": platform.node(), "python": platform.python_version(), "stages": stages}
+
+def find_regressions(results, baseline, threshold, memory_threshold):
+    """
+    Lists stages whose relative_cost or peak_ratio exceeds the baseline's by
+    more than threshold or memory_threshold.
+    """
+    regressions = []
+    if results["rows"] != baseline["rows"]:
+        raise SystemExit(f"Baseline was recorded at {baseline['rows']} rows; rerun with --rows {baseline['rows']}.")
+    for name, stage in results["stages"].items():
+        if name not in baseline["stages"]:
+            continue
+        base = baseline["stages"][name]
+        if stage["relative_cost"] > base["relative_cost"] * (1 + threshold):
+            regressions.append(f"{name}: {stage['relative_cost']:.2f}x the calibration time "
+                               f"vs baseline {base['relative_cost']:.2f}x")
+        if stage["peak_ratio"] > base["peak_ratio"] * (1 + memory_threshold):
+            regressions.append(f"{name}: peak {stage['peak_ratio']:.2f}x the input size "
+                               f"vs baseline {base['peak_ratio']:.2f}x")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.5, help="tolerated relative_cost growth")
+    parser.add_argument("--memory-threshold", type=float, default=0.1, help="tolerated peak_ratio growth")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run_suite(args.rows, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to '{args.baseline}'.")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at '{args.baseline}'; run with --update-baseline first.")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["python"] != results["python"]:
+        print(f"Warning: baseline was recorded with Python {baseline['python']}; peak ratios may differ.")
+    regressions = find_regressions(results, baseline, args.threshold, args.memory_threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import asyncio
+import io
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import pyarrow as pa
+from data_io import REQUIRED_COLUMNS
+from data_processor import DEFAULT_EFFICACY_BINS, process_clinical_trials
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+def process_batch(frames, efficacy_bins=DEFAULT_EFFICACY_BINS):
+    """
+    Runs several independent requests through process_clinical_trials as one
+    frame and splits the result back per request. NORMALIZED_PATIENTS is
+    min-max normalized within each request, and each request's own columns
+    are cast back to their dtypes, which the concatenation may have widened
+    (e.g. int TRIAL_ID to float next to a request without it), so every
+    result is exactly what the request would get processed on its own.
+    """
+    frames = [frame.rename(columns=str.upper) for frame in frames]
+    batch = pd.concat(frames, keys=range(len(frames)), names=["REQUEST", None])
+    processed = process_clinical_trials(batch, efficacy_bins=efficacy_bins)
+
+    patients = processed["TOTAL_PATIENTS"].groupby(level="REQUEST")
+    patients_min, patients_max = patients.transform("min"), patients.transform("max")
+    processed["NORMALIZED_PATIENTS"] = (processed["TOTAL_PATIENTS"] - patients_min) / (patients_max - patients_min)
+
+    results = []
+    for i, frame in enumerate(frames):
+        result = processed[processed.index.get_level_values("REQUEST") == i].droplevel("REQUEST")
+        result = result[list(frame.columns) + [col for col in result.columns if col not in batch.columns]]
+        results.append(result.astype(frame.dtypes.to_dict()))
+    return results
+
+class MicroBatcher:
+    """
+    Collects concurrent requests and processes them together in an executor.
+    A batch is flushed as soon as it holds max_batch_rows rows, or
+    max_latency seconds after its first request arrived.
+    """
+
+    def __init__(self, executor, max_batch_rows=50000, max_latency=0.01, efficacy_bins=DEFAULT_EFFICACY_BINS):
+        self.executor = executor
+        self.max_batch_rows = max_batch_rows
+        self.max_latency = max_latency
+        self.efficacy_bins = efficacy_bins
+        self.pending = []
+        self.pending_rows = 0
+        self.timer = None
+        self.running = set()
+
+    async def submit(self, df):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((df, future))
+        self.pending_rows += len(df)
+        if self.pending_rows >= self.max_batch_rows:
+            self.flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.max_latency, self.flush)
+        return await future
+
+    def flush(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        pending, self.pending, self.pending_rows = self.pending, [], 0
+        if pending:
+            task = asyncio.ensure_future(self.run(pending))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def run(self, pending):
+        """
+        Processes pending (frame, future) pairs as one batch. If the batch
+        fails, each request is retried on its own, so one bad request only
+        fails itself.
+        """
+        frames, futures = zip(*pending)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, process_batch, list(frames), self.efficacy_bins
+            )
+        except Exception as e:
+            if len(pending) > 1:
+                logging.warning(f"Batch of {len(pending)} requests failed ({e}); retrying them one by one")
+                await asyncio.gather(*(self.run([item]) for item in pending))
+                return
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+def decode_rows(body, content_type):
+    """
+    Parses a request body: a JSON list of row objects (or {"rows": [...]}),
+    or an Arrow IPC stream.
+    """
+    if content_type == ARROW_STREAM:
+        return pa.ipc.open_stream(body).read_pandas()
+    rows = json.loads(body)
+    if isinstance(rows, dict):
+        rows = rows["rows"]
+    return pd.DataFrame.from_records(rows)
+
+def missing_columns(df):
+    columns = {col.upper() for col in df.columns}
+    return [col for col in REQUIRED_COLUMNS if col not in columns]
+
+def coerce_rows(df):
+    """
+    Validates one request before it joins a batch: upper-cases the column
+    names, parses the patient counts as numbers and STATUS as strings, so
+    frames from different requests concatenate to consistent dtypes.
+    Raises ValueError for non-numeric or negative counts.
+    """
+    df = df.rename(columns=str.upper)
+    for col in ("TOTAL_PATIENTS", "SUCCESSFUL_OUTCOMES"):
+        try:
+            df[col] = pd.to_numeric(df[col])
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"{col}: {e}") from None
+        if (df[col] < 0).any():
+            raise ValueError(f"{col}: counts must not be negative")
+    df["STATUS"] = df["STATUS"].astype(object)
+    return df
+
+def encode_rows(df, content_type):
+    if content_type == ARROW_STREAM:
+        sink = io.BytesIO()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue()
+    return df.to_json(orient="records").encode()
+
+async def write_response(writer, status, body, content_type):
+    writer.write(
+        f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+        f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+async def respond(method, path, headers, body, batcher):
+    """
+    Returns (status, body, content type) for one request.
+    """
+    if path == "/health":
+        return 200, b'{"status": "ok"}', "application/json"
+    if path != "/score":
+        return 404, b'{"error": "not found"}', "application/json"
+    if method != "POST":
+        return 405, b'{"error": "use POST"}', "application/json"
+
+    content_type = headers.get("content-type", "application/json").split(";")[0]
+    try:
+        df = decode_rows(body, content_type)
+    except Exception as e:
+        return 400, json.dumps({"error": str(e)}).encode(), "application/json"
+    if missing_columns(df):
+        error = f"missing columns: {', '.join(missing_columns(df))}"
+        return 400, json.dumps({"error": error}).encode(), "application/json"
+    try:
+        df = coerce_rows(df)
+    except ValueError as e:
+        return 400, json.dumps({"error": str(e)}).encode(), "application/json"
+    try:
+        result = await batcher.submit(df)
+        return 200, encode_rows(result, content_type), content_type
+    except Exception as e:
+        logging.error(f"Error scoring request: {e}")
+        return 500, json.dumps({"error": str(e)}).encode(), "application/json"
+
+async def handle_connection(reader, writer, batcher):
+    """
+    Minimal HTTP/1.1 keep-alive handler: POST /score with a JSON or Arrow
+    body returns the processed rows in the same encoding; GET /health
+    returns {"status": "ok"}.
+    """
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode().split(" ", 2)
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, value = line.decode().split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+            status, body, content_type = await respond(method, path, headers, body, batcher)
+            await write_response(writer, status, body, content_type)
+            if headers.get("connection", "").lower() == "close":
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(host, port, batcher, ready=None):
+    server = await asyncio.start_server(lambda reader, writer: handle_connection(reader, writer, batcher), host, port)
+    logging.info(f"Scoring API listening on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+    if ready is not None:
+        ready(server)
+    async with server:
+        await server.serve_forever()
+
+def run_api(host, port, workers=1, max_batch_rows=50000, max_latency=0.01, efficacy_bins=DEFAULT_EFFICACY_BINS):
+    """
+    Runs the scoring API until interrupted, with CPU-bound batches processed
+    in a pool of worker processes.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        batcher = MicroBatcher(executor, max_batch_rows, max_latency, efficacy_bins)
+        asyncio.run(serve(host, port, batcher))
@@ -1,23 +1,139 @@
-import os
 import logging
+import os
 import pandas as pd
-from data_processor import process_clinical_trials
+from api import run_api
+from config import (
+    API_HOST,
+    API_MAX_BATCH_ROWS,
+    API_MAX_LATENCY_MS,
+    API_PORT,
+    API_WORKERS,
+    APP_MODE,
+    CACHE_FILE,
+    CHUNK_SIZE,
+    DATA_DIR,
+    EFFICACY_BINS_FILE,
+    INCREMENTAL,
+    INPUT_FILE,
+    INPUT_FORMAT,
+    LOG_FILE,
+    MAX_WORKERS,
+    METRICS_FILE,
+    OUTPUT_FILE,
+    OUTPUT_FORMAT,
+    PASSTHROUGH_COLUMNS,
+    POLL_INTERVAL,
+    WORKER_CONCURRENCY,
+    WORKER_OUTPUT_DIR,
+    WORKER_POOL,
+    WORKER_QUEUE_SIZE,
+)
+from data_io import ResultsWriter, iter_trials, read_trials, write_results
+from data_processor import (
+    DEFAULT_EFFICACY_BINS,
+    load_efficacy_bins,
+    process_clinical_trials,
+    process_clinical_trials_parallel,
+)
+from instrumentation import StageRecorder
+from result_cache import ResultCache, process_clinical_trials_incremental
+from worker import run_worker
+
+logging.basicConfig(filename=LOG_FILE, level=logging.INFO)
 
-log_file = os.getenv("LOG_FILE", "logs/app.log")
-logging.basicConfig(filename=log_file, level=logging.INFO)
+def completed_patients_range(input_file, chunk_size, input_format=None):
+    """
+    First streaming pass: min and max TOTAL_PATIENTS over completed trials,
+    reading only the required columns.
+    """
+    patients_min, patients_max = float("nan"), float("nan")
+    for chunk in iter_trials(input_file, input_format, passthrough_columns=[], chunk_size=chunk_size):
+        chunk.columns = [col.upper() for col in chunk.columns]
+        patients = chunk.loc[chunk["STATUS"] == "Completed", "TOTAL_PATIENTS"].astype(float).dropna()
+        if patients.empty:
+            continue
+        patients_min = patients.min() if pd.isna(patients_min) else min(patients_min, patients.min())
+        patients_max = patients.max() if pd.isna(patients_max) else max(patients_max, patients.max())
+    return patients_min, patients_max
+
+def process_csv_in_chunks(input_file, output_file, chunk_size, passthrough_columns=None,
+                          efficacy_bins=DEFAULT_EFFICACY_BINS, input_format=None, output_format=None):
+    """
+    Streams input_file through process_clinical_trials chunk_size rows at a time
+    and appends each processed chunk to output_file. The global TOTAL_PATIENTS
+    bounds come from a first pass, so the output matches the in-memory path.
+    Reads CSV, Parquet and Arrow IPC; writes CSV or Parquet (ResultsWriter).
+    """
+    with ResultsWriter(output_file, output_format) as writer:
+        patients_range = completed_patients_range(input_file, chunk_size, input_format)
+        for chunk in iter_trials(input_file, input_format, passthrough_columns, chunk_size):
+            writer.write(process_clinical_trials(chunk, patients_range=patients_range, efficacy_bins=efficacy_bins))
+
+def batch_mode(chunk_size, incremental, max_workers):
+    """
+    Resolves the batch processing mode from CHUNK_SIZE, INCREMENTAL and
+    MAX_WORKERS: "stream", "incremental", "parallel" or "serial". The modes
+    are exclusive, so enabling more than one is a configuration error rather
+    than one setting silently winning.
+    """
+    modes = [mode for mode, enabled in (("stream", chunk_size > 0), ("incremental", incremental),
+                                        ("parallel", max_workers > 1)) if enabled]
+    if len(modes) > 1:
+        raise ValueError(f"CHUNK_SIZE, INCREMENTAL and MAX_WORKERS select conflicting modes ({', '.join(modes)}); "
+                         "enable only one.")
+    return modes[0] if modes else "serial"
 
 def main():
     logging.info("Starting pharmaceutical data processing...")
 
-    input_file = "data/clinical_trials.csv"
-    output_file = "data/processed_results.csv"
+    input_file = INPUT_FILE
+    output_file = OUTPUT_FILE
+
+    recorder = StageRecorder()
 
     try:
-        df = pd.read_csv(input_file)
-        processed_df = process_clinical_trials(df)
-        processed_df.to_csv(output_file, index=False)
+        efficacy_bins = load_efficacy_bins(EFFICACY_BINS_FILE) if EFFICACY_BINS_FILE else DEFAULT_EFFICACY_BINS
+        if APP_MODE == "api":
+            run_api(API_HOST, API_PORT, API_WORKERS, API_MAX_BATCH_ROWS, API_MAX_LATENCY_MS / 1000, efficacy_bins)
+        elif APP_MODE == "worker":
+            # DATA_DIR also holds the batch mode's OUTPUT_FILE, which is not an input.
+            run_worker(DATA_DIR, WORKER_OUTPUT_DIR, WORKER_CONCURRENCY, WORKER_POOL, WORKER_QUEUE_SIZE,
+                       POLL_INTERVAL, PASSTHROUGH_COLUMNS, efficacy_bins,
+                       ignore_patterns=[os.path.basename(OUTPUT_FILE)])
+        else:
+            mode = batch_mode(CHUNK_SIZE, INCREMENTAL, MAX_WORKERS)
+            # Only the serial mode passes the recorder into process_clinical_trials.
+            logging.info(f"Batch mode: {mode}" + ("" if mode == "serial" else ", without per-stage process metrics"))
+            if mode == "stream":
+                with recorder.stage("stream"):
+                    process_csv_in_chunks(input_file, output_file, CHUNK_SIZE, PASSTHROUGH_COLUMNS, efficacy_bins,
+                                          INPUT_FORMAT, OUTPUT_FORMAT)
+            else:
+                # The result cache is keyed by TRIAL_ID, so it is read even when not passed through.
+                drop_trial_id = mode == "incremental" and PASSTHROUGH_COLUMNS is not None and \
+                    "TRIAL_ID" not in {col.upper() for col in PASSTHROUGH_COLUMNS}
+                passthrough_columns = PASSTHROUGH_COLUMNS + ["TRIAL_ID"] if drop_trial_id else PASSTHROUGH_COLUMNS
+                with recorder.stage("read") as stage:
+                    df = read_trials(input_file, INPUT_FORMAT, passthrough_columns, completed_only=True)
+                    stage.rows_out = len(df)
+                with recorder.stage("process", len(df)) as stage:
+                    if mode == "incremental":
+                        cache = ResultCache(CACHE_FILE, efficacy_bins=efficacy_bins)
+                        processed_df = process_clinical_trials_incremental(df, cache, efficacy_bins=efficacy_bins)
+                        cache.close()
+                        if drop_trial_id:
+                            processed_df = processed_df.drop(columns="TRIAL_ID")
+                    elif mode == "parallel":
+                        processed_df = process_clinical_trials_parallel(df, MAX_WORKERS, efficacy_bins=efficacy_bins)
+                    else:
+                        processed_df = process_clinical_trials(df, efficacy_bins=efficacy_bins, recorder=recorder)
+                    stage.rows_out = len(processed_df)
+                with recorder.stage("write", len(processed_df)):
+                    write_results(processed_df, output_file, OUTPUT_FORMAT)
+        if METRICS_FILE:
+            recorder.write_prometheus(METRICS_FILE)
         logging.info("Data processing completed successfully.")
-        print("Processing complete! Check 'data/processed_results.csv'.")
+        print(f"Processing complete! Check '{output_file}'.")
     except Exception as e:
         logging.error(f"Error processing data: {e}")
         print("An error occurred during processing.")
@@ -2,3 +2,48 @@ import os
 
 DATA_DIR = os.getenv("DATA_DIR", "data/")
 LOG_FILE = os.getenv("LOG_FILE", "logs/app.log")
+# Optional Prometheus text-format file for per-stage metrics, e.g. logs/metrics.prom.
+METRICS_FILE = os.getenv("METRICS_FILE") or None
+
+INPUT_FILE = os.getenv("INPUT_FILE", os.path.join(DATA_DIR, "clinical_trials.csv"))
+OUTPUT_FILE = os.getenv("OUTPUT_FILE", os.path.join(DATA_DIR, "processed_results.csv"))
+
+# "csv", "parquet" or "arrow"; unset picks the format from the file extension.
+INPUT_FORMAT = os.getenv("INPUT_FORMAT") or None
+OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT") or None
+
+# Comma-separated input columns to carry into the output next to the required
+# STATUS/TOTAL_PATIENTS/SUCCESSFUL_OUTCOMES; unset keeps every column.
+PASSTHROUGH_COLUMNS = [col for col in os.getenv("PASSTHROUGH_COLUMNS", "").split(",") if col] or None
+
+# Rows per chunk for the streaming mode (CSV, Parquet or Arrow in; CSV or Parquet
+# out); 0 processes the whole file in memory. Exclusive with INCREMENTAL and MAX_WORKERS.
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "0"))
+
+# Worker processes for process_clinical_trials_parallel; 1 keeps the serial path.
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", "1"))
+
+# Optional JSON file with efficacy thresholds/labels (and per-phase tables),
+# laid out like data_processor.DEFAULT_EFFICACY_BINS.
+EFFICACY_BINS_FILE = os.getenv("EFFICACY_BINS_FILE") or None
+
+# Incremental mode recomputes only new or changed trials, reusing results
+# stored in CACHE_FILE from earlier runs.
+INCREMENTAL = os.getenv("INCREMENTAL", "0") == "1"
+CACHE_FILE = os.getenv("CACHE_FILE", os.path.join(DATA_DIR, "results_cache.sqlite"))
+
+# "batch" processes INPUT_FILE once and exits; "worker" stays resident and
+# processes every CSV/Parquet/Arrow file dropped into DATA_DIR; "api" serves
+# POST /score over HTTP.
+APP_MODE = os.getenv("APP_MODE", "batch")
+WORKER_OUTPUT_DIR = os.getenv("WORKER_OUTPUT_DIR", os.path.join(DATA_DIR, "processed"))
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "1"))
+WORKER_POOL = os.getenv("WORKER_POOL", "thread")  # "thread" or "process"
+WORKER_QUEUE_SIZE = int(os.getenv("WORKER_QUEUE_SIZE", "64"))
+POLL_INTERVAL = float(os.getenv("POLL_INTERVAL", "1.0"))
+
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+API_PORT = int(os.getenv("API_PORT", "8080"))
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+API_MAX_BATCH_ROWS = int(os.getenv("API_MAX_BATCH_ROWS", "50000"))
+API_MAX_LATENCY_MS = float(os.getenv("API_MAX_LATENCY_MS", "10"))
@@ -0,0 +1,269 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from pandas.api.types import union_categoricals
+
+# Columns process_clinical_trials needs; everything else is passthrough.
+REQUIRED_COLUMNS = ["STATUS", "TOTAL_PATIENTS", "SUCCESSFUL_OUTCOMES"]
+
+# Explicit dtypes for the clinical trials input (upper-cased names). Repeated
+# labels become categoricals and patient counts fit comfortably in 32 bits;
+# the nullable UInt32 keeps blank counts as <NA>.
+TRIAL_DTYPES = {
+    "DRUG_NAME": "category",
+    "PHASE": "category",
+    "STATUS": "category",
+    "TOTAL_PATIENTS": "UInt32",
+    "SUCCESSFUL_OUTCOMES": "UInt32",
+}
+
+# pd.read_csv wraps negative values around when parsing straight to UInt32,
+# so CSV counts are parsed as Int64 and range-checked by check_counts first.
+CSV_COUNT_DTYPE = "Int64"
+
+# Rows per block when filtering a CSV while it is read.
+CSV_BLOCK_SIZE = 1_000_000
+
+FORMATS_BY_EXTENSION = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+def detect_format(path, data_format=None):
+    """
+    Resolves the file format from an explicit data_format ("csv", "parquet"
+    or "arrow") or, failing that, from the file extension.
+    """
+    if data_format:
+        return data_format.lower()
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS_BY_EXTENSION:
+        raise ValueError(f"Cannot infer data format from '{path}'; set INPUT_FORMAT/OUTPUT_FORMAT to csv, parquet or arrow.")
+    return FORMATS_BY_EXTENSION[extension]
+
+def projected_columns(available_columns, passthrough_columns):
+    """
+    Returns the columns of available_columns (matched case-insensitively) to
+    materialize: the required inputs plus passthrough_columns.
+    None for passthrough_columns keeps every column.
+    """
+    if passthrough_columns is None:
+        return list(available_columns)
+    wanted = {col.upper() for col in REQUIRED_COLUMNS + list(passthrough_columns)}
+    return [col for col in available_columns if col.upper() in wanted]
+
+def csv_usecols(passthrough_columns):
+    """
+    pd.read_csv usecols equivalent of projected_columns.
+    """
+    if passthrough_columns is None:
+        return None
+    wanted = {col.upper() for col in REQUIRED_COLUMNS + list(passthrough_columns)}
+    return lambda col: col.upper() in wanted
+
+def trial_dtypes(columns):
+    """
+    TRIAL_DTYPES keyed by the actual (case-preserved) names in columns.
+    """
+    return {col: TRIAL_DTYPES[col.upper()] for col in columns if col.upper() in TRIAL_DTYPES}
+
+def csv_dtypes(columns):
+    """
+    pd.read_csv dtype plan: trial_dtypes with the counts parsed as CSV_COUNT_DTYPE.
+    """
+    return {col: CSV_COUNT_DTYPE if col_dtype == "UInt32" else col_dtype for col, col_dtype in trial_dtypes(columns).items()}
+
+def check_counts(df):
+    """
+    Casts the counts of a frame read with csv_dtypes to UInt32. Raises
+    ValueError for negative counts or counts beyond the uint32 range.
+    """
+    for col, col_dtype in trial_dtypes(df.columns).items():
+        if col_dtype != "UInt32" or df[col].dtype == col_dtype:
+            continue
+        invalid = (df[col] < 0) | (df[col] > np.iinfo(np.uint32).max)
+        if invalid.any():
+            raise ValueError(f"{col} must hold counts between 0 and {np.iinfo(np.uint32).max}, "
+                             f"got {df.loc[invalid.fillna(False), col].iloc[0]}.")
+        df[col] = df[col].astype(col_dtype)
+    return df
+
+def status_column(columns):
+    return next(col for col in columns if col.upper() == "STATUS")
+
+def concat_categorical_chunks(chunks):
+    """
+    Concatenates frames whose categorical columns may have different
+    categories, keeping those columns categorical instead of falling back to object.
+    """
+    categorical = [col for col in chunks[0].columns if isinstance(chunks[0][col].dtype, pd.CategoricalDtype)]
+    df = pd.concat([chunk.drop(columns=categorical) for chunk in chunks])
+    for col in categorical:
+        values = union_categoricals([chunk[col] for chunk in chunks])
+        df[col] = pd.Categorical.from_codes(values.codes, dtype=values.dtype)
+    return df[chunks[0].columns]
+
+def read_csv_trials(path, passthrough_columns=None, completed_only=False, block_size=CSV_BLOCK_SIZE):
+    """
+    Reads a clinical trials CSV with TRIAL_DTYPES. With completed_only, the
+    file is read in blocks of block_size rows and non-completed trials are
+    dropped from each block, so the unfiltered table is never held in memory.
+    """
+    usecols = csv_usecols(passthrough_columns)
+    header = pd.read_csv(path, nrows=0, usecols=usecols).columns
+    dtype = csv_dtypes(header)
+    if not completed_only:
+        return check_counts(pd.read_csv(path, usecols=usecols, dtype=dtype))
+
+    status = status_column(header)
+    chunks = [
+        chunk[chunk[status] == "Completed"]
+        for chunk in map(check_counts, pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=block_size))
+    ]
+    if not chunks:
+        return check_counts(pd.read_csv(path, usecols=usecols, dtype=dtype))
+    return concat_categorical_chunks(chunks) if len(chunks) > 1 else chunks[0]
+
+def table_to_trials(table, completed_only=False):
+    """
+    Filters an Arrow table down to completed trials (before any pandas
+    conversion) and converts it with TRIAL_DTYPES.
+    """
+    if completed_only:
+        table = table.filter(pc.equal(table[status_column(table.column_names)].cast(pa.string()), "Completed"))
+    dtype = trial_dtypes(table.column_names)
+    for col, col_dtype in dtype.items():
+        index = table.column_names.index(col)
+        if col_dtype == "category":
+            if not pa.types.is_dictionary(table.schema.field(col).type):
+                table = table.set_column(index, col, pc.dictionary_encode(table[col]))
+        else:
+            table = table.set_column(index, col, table[col].cast(pa.uint32()))
+    return table.to_pandas(types_mapper={pa.uint32(): pd.UInt32Dtype()}.get)
+
+def read_trials(path, data_format=None, passthrough_columns=None, completed_only=False):
+    """
+    Reads a clinical trials table from CSV, Parquet or Arrow IPC with the
+    TRIAL_DTYPES schema, only materializing the columns selected by
+    projected_columns. completed_only drops non-completed trials while
+    reading, which process_clinical_trials would discard anyway.
+    """
+    data_format = detect_format(path, data_format)
+    if data_format == "csv":
+        return read_csv_trials(path, passthrough_columns, completed_only)
+
+    if data_format == "parquet":
+        columns = projected_columns(pq.read_schema(path).names, passthrough_columns)
+        filters = [(status_column(columns), "==", "Completed")] if completed_only else None
+        categorical = [col for col, col_dtype in trial_dtypes(columns).items() if col_dtype == "category"]
+        table = pq.read_table(path, columns=columns, filters=filters, read_dictionary=categorical)
+        return table_to_trials(table)
+    if data_format == "arrow":
+        table = feather.read_table(path, memory_map=True)
+        table = table.select(projected_columns(table.column_names, passthrough_columns))
+        return table_to_trials(table, completed_only)
+    raise ValueError(f"Unsupported data format '{data_format}'.")
+
+def iter_trials(path, data_format=None, passthrough_columns=None, chunk_size=CSV_BLOCK_SIZE):
+    """
+    Yields a clinical trials table from CSV, Parquet or Arrow IPC as frames
+    of at most chunk_size rows with the TRIAL_DTYPES schema, materializing
+    only the columns selected by projected_columns. Parquet is read one
+    batch at a time and Arrow IPC is memory-mapped.
+    """
+    data_format = detect_format(path, data_format)
+    if data_format == "csv":
+        usecols = csv_usecols(passthrough_columns)
+        dtype = csv_dtypes(pd.read_csv(path, nrows=0, usecols=usecols).columns)
+        for chunk in pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunk_size):
+            yield check_counts(chunk)
+        return
+
+    if data_format == "parquet":
+        parquet_file = pq.ParquetFile(path)
+        columns = projected_columns(parquet_file.schema_arrow.names, passthrough_columns)
+        batches = parquet_file.iter_batches(batch_size=chunk_size, columns=columns)
+    elif data_format == "arrow":
+        table = feather.read_table(path, memory_map=True)
+        batches = table.select(projected_columns(table.column_names, passthrough_columns)).to_batches(chunk_size)
+    else:
+        raise ValueError(f"Unsupported data format '{data_format}'.")
+    for batch in batches:
+        yield table_to_trials(pa.Table.from_batches([batch]))
+
+def _results_table(df):
+    if "EFFICACY_CATEGORY" in df.columns:
+        df = df.assign(EFFICACY_CATEGORY=df["EFFICACY_CATEGORY"].astype("category"))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+class ResultsWriter:
+    """
+    Appends processed chunks to one CSV or Parquet file, for the streaming
+    mode. Parquet chunks are written as row groups; dictionary columns are
+    widened to int32 indices so that chunks with different category counts
+    share one schema. Arrow IPC files cannot replace a dictionary between
+    batches, so that format is rejected up front.
+    """
+    FORMATS = ("csv", "parquet")
+
+    def __init__(self, path, data_format=None):
+        self.path = path
+        self.data_format = detect_format(path, data_format)
+        if self.data_format not in self.FORMATS:
+            raise ValueError(f"Chunked output supports {' and '.join(self.FORMATS)}, not '{self.data_format}'; "
+                             "set CHUNK_SIZE=0 to write it in one piece.")
+        self._schema = None
+        self._parquet_writer = None
+        self._chunks = 0
+
+    def write(self, df):
+        if self.data_format == "csv":
+            df.to_csv(self.path, mode="w" if self._chunks == 0 else "a", header=self._chunks == 0, index=False)
+        else:
+            table = _results_table(df)
+            if self._parquet_writer is None:
+                self._schema = pa.schema([
+                    field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+                    if pa.types.is_dictionary(field.type) else field
+                    for field in table.schema
+                ], metadata=table.schema.metadata)
+                self._parquet_writer = pq.ParquetWriter(self.path, self._schema)
+            self._parquet_writer.write_table(table.cast(self._schema))
+        self._chunks += 1
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_results(df, path, data_format=None):
+    """
+    Writes processed results as CSV, Parquet or Arrow IPC. The columnar
+    formats keep the pandas dtypes, with EFFICACY_CATEGORY stored as a
+    dictionary-encoded categorical.
+    """
+    data_format = detect_format(path, data_format)
+    if data_format == "csv":
+        df.to_csv(path, index=False)
+        return
+
+    table = _results_table(df)
+    if data_format == "parquet":
+        pq.write_table(table, path)
+    elif data_format == "arrow":
+        feather.write_feather(table, path)
+    else:
+        raise ValueError(f"Unsupported data format '{data_format}'.")
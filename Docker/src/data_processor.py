@@ -1,16 +1,37 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import json
 import pandas as pd
 import numpy as np
 from scipy.stats import beta
+try:
+    from instrumentation import NullRecorder
+except ImportError:  # imported as src.data_processor, with Docker/ rather than src/ on sys.path
+    from src.instrumentation import NullRecorder
 
-def calculate_confidence_interval(successes, total, confidence=0.95):
+def calculate_confidence_interval(successes, total, confidence=0.95, prior_alpha=1, prior_beta=1):
     """
     Computes a Bayesian confidence interval for efficacy rate.
     Uses a Beta distribution (Beta-Binomial model).
     """
-    alpha, beta_params = successes + 1, total - successes + 1
+    alpha, beta_params = successes + prior_alpha, total - successes + prior_beta
     lower_bound, upper_bound = beta.ppf([(1 - confidence) / 2, (1 + confidence) / 2], alpha, beta_params)
     return lower_bound, upper_bound
 
+def calculate_confidence_intervals(successes, totals, confidence=0.95, prior_alpha=1, prior_beta=1):
+    """
+    Vectorized counterpart of calculate_confidence_interval.
+    Evaluates the Beta posterior quantiles for whole arrays in two beta.ppf
+    calls and returns (lower_bounds, upper_bounds) as float arrays.
+    """
+    successes = np.asarray(successes, dtype=float)
+    totals = np.asarray(totals, dtype=float)
+    alpha = successes + prior_alpha
+    beta_params = totals - successes + prior_beta
+    lower_bounds = beta.ppf((1 - confidence) / 2, alpha, beta_params)
+    upper_bounds = beta.ppf((1 + confidence) / 2, alpha, beta_params)
+    return lower_bounds, upper_bounds
+
 def classify_drug(efficacy):
     """
     Categorizes drugs based on efficacy rate.
@@ -22,31 +43,148 @@ def classify_drug(efficacy):
     else:
         return "Low Efficacy"
 
-def process_clinical_trials(df):
+# Bins equivalent to classify_drug. "thresholds" are ascending lower bounds
+# of every label but the first; "phases" optionally maps a PHASE value to its
+# own {"thresholds", "labels"} table.
+DEFAULT_EFFICACY_BINS = {
+    "thresholds": [0.5, 0.8],
+    "labels": ["Low Efficacy", "Moderate Efficacy", "High Efficacy"],
+    "phases": {},
+}
+
+def load_efficacy_bins(path):
+    """
+    Reads an efficacy bins table in the DEFAULT_EFFICACY_BINS layout from a JSON file.
+    """
+    with open(path) as f:
+        efficacy_bins = json.load(f)
+    for table in [efficacy_bins] + list(efficacy_bins.get("phases", {}).values()):
+        if len(table["labels"]) != len(table["thresholds"]) + 1:
+            raise ValueError("Efficacy bins need exactly one more label than thresholds.")
+        if list(table["thresholds"]) != sorted(table["thresholds"]):
+            raise ValueError("Efficacy bin thresholds must be sorted in ascending order.")
+    return efficacy_bins
+
+def efficacy_categories(efficacy_bins=DEFAULT_EFFICACY_BINS):
+    """
+    Categories of the EFFICACY_CATEGORY column: the default labels followed by
+    any extra labels introduced by the per-phase tables.
+    """
+    categories = list(efficacy_bins["labels"])
+    for table in efficacy_bins.get("phases", {}).values():
+        categories += [label for label in table["labels"] if label not in categories]
+    return categories
+
+def classify_efficacy(efficacy, phases=None, efficacy_bins=DEFAULT_EFFICACY_BINS):
+    """
+    Vectorized counterpart of classify_drug. Bins the whole efficacy array with
+    one searchsorted per threshold table and returns a pandas Categorical.
+    When phases is given, rows of a phase listed in efficacy_bins["phases"]
+    use that phase's table. Missing efficacy falls into the lowest bin, as in
+    classify_drug.
+    """
+    efficacy = np.asarray(efficacy, dtype=float)
+    categories = efficacy_categories(efficacy_bins)
+    codes = np.empty(len(efficacy), dtype=np.int8 if len(categories) < 128 else np.int32)
+
+    tables = [(None, efficacy_bins)]
+    if phases is not None and efficacy_bins.get("phases"):
+        phase_codes, phase_values = pd.factorize(pd.Series(phases))
+        phase_values = list(phase_values)
+        tables += [(phase_values.index(phase), table) for phase, table in efficacy_bins["phases"].items()
+                   if phase in phase_values]
+
+    default_rows = np.ones(len(efficacy), dtype=bool)
+    for phase_code, table in reversed(tables):
+        if phase_code is None:
+            rows = default_rows
+        else:
+            rows = phase_codes == phase_code
+            default_rows &= ~rows
+        label_codes = np.array([categories.index(label) for label in table["labels"]])
+        bins = np.searchsorted(table["thresholds"], efficacy[rows], side="right")
+        bins[np.isnan(efficacy[rows])] = 0
+        codes[rows] = label_codes[bins]
+
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+def process_clinical_trials(df, confidence=0.95, prior_alpha=1, prior_beta=1, patients_range=None,
+                            efficacy_bins=DEFAULT_EFFICACY_BINS, recorder=None):
     """
     Process clinical trial data with advanced analysis:
     - Normalize patient numbers
     - Compute efficacy rate
     - Estimate confidence intervals
     - Classify drugs based on efficacy
+
+    patients_range is an optional (min, max) pair of TOTAL_PATIENTS over the
+    completed trials of the full dataset. Pass it when df is only a chunk of
+    that dataset so NORMALIZED_PATIENTS matches the whole-frame result.
+    efficacy_bins is passed to classify_efficacy. recorder is an optional
+    instrumentation.StageRecorder timing each step.
     """
+    recorder = recorder or NullRecorder()
     df.columns = [col.upper() for col in df.columns]
     
-    # Filter only completed trials
-    df = df[df["STATUS"] == "Completed"]
+    # Filter only completed trials. Input that is already filtered (see
+    # data_io.read_trials) is not copied; the shallow copy only keeps the new
+    # columns from being added to the caller's frame.
+    with recorder.stage("filter", len(df)) as stage:
+        completed = df["STATUS"] == "Completed"
+        df = (df if completed.all() else df[completed]).copy(deep=False)
+        stage.rows_out = len(df)
     
-    # Compute Efficacy Rate
-    df["EFFICACY_RATE"] = df["SUCCESSFUL_OUTCOMES"] / df["TOTAL_PATIENTS"]
+    # Compute Efficacy Rate. The counts may be nullable UInt32 (see
+    # data_io.TRIAL_DTYPES); the derived columns are plain floats with NaN.
+    with recorder.stage("efficacy", len(df)):
+        successes, totals = df["SUCCESSFUL_OUTCOMES"].astype(float), df["TOTAL_PATIENTS"].astype(float)
+        df["EFFICACY_RATE"] = successes / totals
     
     # Normalize total patients using Min-Max normalization
-    df["NORMALIZED_PATIENTS"] = (df["TOTAL_PATIENTS"] - df["TOTAL_PATIENTS"].min()) / \
-                                 (df["TOTAL_PATIENTS"].max() - df["TOTAL_PATIENTS"].min())
+    with recorder.stage("normalization", len(df)):
+        if patients_range is None:
+            patients_range = (totals.min(), totals.max())
+        patients_min, patients_max = (float(bound) for bound in patients_range)
+        df["NORMALIZED_PATIENTS"] = (totals - patients_min) / (patients_max - patients_min)
     
     # Compute confidence intervals for efficacy rate
-    ci_bounds = df.apply(lambda row: calculate_confidence_interval(row["SUCCESSFUL_OUTCOMES"], row["TOTAL_PATIENTS"]), axis=1)
-    df["CI_LOWER"], df["CI_UPPER"] = zip(*ci_bounds)
+    with recorder.stage("ci", len(df)):
+        df["CI_LOWER"], df["CI_UPPER"] = calculate_confidence_intervals(
+            successes, totals, confidence, prior_alpha, prior_beta
+        )
     
     # Classify drugs into efficacy categories
-    df["EFFICACY_CATEGORY"] = df["EFFICACY_RATE"].apply(classify_drug)
+    with recorder.stage("classify", len(df)):
+        phases = df["PHASE"] if "PHASE" in df.columns else None
+        df["EFFICACY_CATEGORY"] = classify_efficacy(df["EFFICACY_RATE"], phases, efficacy_bins)
     
     return df
+
+def process_clinical_trials_parallel(df, max_workers, confidence=0.95, prior_alpha=1, prior_beta=1, patients_range=None,
+                                     efficacy_bins=DEFAULT_EFFICACY_BINS):
+    """
+    Same result as process_clinical_trials, computed across a process pool.
+    The completed trials are split into one contiguous shard per worker and
+    the TOTAL_PATIENTS bounds are computed once up front and handed to every
+    shard, so the concatenated shards match the serial result row for row.
+    """
+    df.columns = [col.upper() for col in df.columns]
+    df = df[df["STATUS"] == "Completed"]
+
+    if max_workers <= 1 or len(df) < 2:
+        return process_clinical_trials(df, confidence, prior_alpha, prior_beta, patients_range, efficacy_bins)
+
+    if patients_range is None:
+        # As in process_clinical_trials: float, so all-NA counts give NaN bounds rather than pd.NA.
+        totals = df["TOTAL_PATIENTS"].astype(float)
+        patients_range = (totals.min(), totals.max())
+
+    bounds = np.linspace(0, len(df), min(max_workers, len(df)) + 1).astype(int)
+    shards = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        processed_shards = executor.map(
+            process_clinical_trials, shards, repeat(confidence), repeat(prior_alpha), repeat(prior_beta),
+            repeat(patients_range), repeat(efficacy_bins)
+        )
+        return pd.concat(list(processed_shards))
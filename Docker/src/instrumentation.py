@@ -0,0 +1,101 @@
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process so far, in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1024
+
+class Stage:
+    """
+    Measurements of one stage. rows_out defaults to rows_in; set it inside
+    the stage when the stage changes the number of rows.
+    """
+
+    def __init__(self, name, rows_in):
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = rows_in
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss_delta_mb = 0.0
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "peak_rss_delta_mb": round(self.peak_rss_delta_mb, 3),
+        }
+
+class StageRecorder:
+    """
+    Records wall time, CPU time, rows in/out and the growth of peak RSS for
+    named stages, logging one JSON line per finished stage.
+    """
+
+    def __init__(self, logger=logging.getLogger(__name__)):
+        self.logger = logger
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        stage = Stage(name, rows_in)
+        rss_before = peak_rss_mb()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield stage
+        finally:
+            stage.wall_seconds = time.perf_counter() - wall_start
+            stage.cpu_seconds = time.process_time() - cpu_start
+            stage.peak_rss_delta_mb = peak_rss_mb() - rss_before
+            self.stages.append(stage)
+            self.logger.info(json.dumps({"event": "stage", **stage.as_dict()}))
+
+    def write_prometheus(self, path, prefix="pharma_stage"):
+        """
+        Writes the recorded stages in Prometheus text exposition format,
+        atomically so a textfile collector never reads a partial file.
+        The last run of a stage name wins.
+        """
+        metrics = [
+            ("wall_seconds", "Wall-clock time of the stage in seconds."),
+            ("cpu_seconds", "CPU time of the stage in seconds."),
+            ("rows_in", "Rows entering the stage."),
+            ("rows_out", "Rows leaving the stage."),
+            ("peak_rss_delta_mb", "Growth of the process peak RSS during the stage in MB."),
+        ]
+        stages = {stage.name: stage.as_dict() for stage in self.stages}
+        lines = []
+        for metric, help_text in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            for name, values in stages.items():
+                if values[metric] is not None:
+                    lines.append(f'{prefix}_{metric}{{stage="{name}"}} {values[metric]}')
+
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics.")
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+
+class NullRecorder:
+    """
+    Drop-in StageRecorder that measures nothing.
+    """
+
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        yield Stage(name, rows_in)
@@ -0,0 +1,103 @@
+import json
+import sqlite3
+import pandas as pd
+from data_processor import DEFAULT_EFFICACY_BINS, efficacy_categories, process_clinical_trials
+
+# Per-row results that only depend on the row itself. NORMALIZED_PATIENTS
+# depends on the bounds of the whole dataset and is never cached.
+CACHED_COLUMNS = ["EFFICACY_RATE", "CI_LOWER", "CI_UPPER", "EFFICACY_CATEGORY"]
+
+def row_hashes(df):
+    """
+    64-bit content hash of every row of df, as signed integers so they fit
+    an SQLite INTEGER column.
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().view("int64")
+
+class ResultCache:
+    """
+    On-disk SQLite cache of per-trial results keyed by TRIAL_ID and the
+    content hash of the input row. The cache is cleared when the interval or
+    efficacy bin settings it was built with change.
+    """
+
+    def __init__(self, path, confidence=0.95, prior_alpha=1, prior_beta=1, efficacy_bins=DEFAULT_EFFICACY_BINS):
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS settings (value TEXT)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "TRIAL_ID, ROW_HASH INTEGER, EFFICACY_RATE REAL, CI_LOWER REAL, CI_UPPER REAL, EFFICACY_CATEGORY TEXT, "
+            "PRIMARY KEY (TRIAL_ID, ROW_HASH))"
+        )
+        settings = json.dumps([confidence, prior_alpha, prior_beta, efficacy_bins], sort_keys=True)
+        stored = self.connection.execute("SELECT value FROM settings").fetchone()
+        if stored is None or stored[0] != settings:
+            self.connection.execute("DELETE FROM results")
+            self.connection.execute("DELETE FROM settings")
+            self.connection.execute("INSERT INTO settings VALUES (?)", (settings,))
+        self.connection.commit()
+
+    def lookup(self, keys):
+        """
+        Left-joins keys (TRIAL_ID, ROW_HASH) against the cache. CACHED is
+        False for rows without a cached result. The keys go into a temporary
+        table joined on the primary key, so only the matching rows are read.
+        """
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS lookup_keys (TRIAL_ID, ROW_HASH INTEGER)")
+        self.connection.execute("DELETE FROM lookup_keys")
+        self.connection.executemany("INSERT INTO lookup_keys VALUES (?, ?)", keys.astype(object).itertuples(index=False))
+        cached = pd.read_sql_query(
+            "SELECT results.* FROM lookup_keys JOIN results USING (TRIAL_ID, ROW_HASH)", self.connection
+        )
+        self.connection.execute("DELETE FROM lookup_keys")
+        cached = cached.astype({"TRIAL_ID": keys["TRIAL_ID"].dtype, "ROW_HASH": "int64", "EFFICACY_CATEGORY": object})
+        results = keys.merge(cached, how="left", on=["TRIAL_ID", "ROW_HASH"], indicator="CACHED")
+        results["CACHED"] = results["CACHED"] == "both"
+        return results
+
+    def store(self, results):
+        """
+        Inserts or replaces results, a frame with TRIAL_ID, ROW_HASH and
+        CACHED_COLUMNS, and drops the entries of older row versions of the
+        same trials, so the cache holds one row per TRIAL_ID.
+        """
+        keys = results[["TRIAL_ID", "ROW_HASH"]].astype(object).itertuples(index=False)
+        self.connection.executemany("DELETE FROM results WHERE TRIAL_ID = ? AND ROW_HASH != ?", keys)
+        rows = results[["TRIAL_ID", "ROW_HASH"] + CACHED_COLUMNS].astype(object).itertuples(index=False)
+        self.connection.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+def process_clinical_trials_incremental(df, cache, confidence=0.95, prior_alpha=1, prior_beta=1,
+                                        efficacy_bins=DEFAULT_EFFICACY_BINS):
+    """
+    Same result as process_clinical_trials, recomputing only the completed
+    trials that are new or changed since they were last stored in cache.
+    NORMALIZED_PATIENTS is always recomputed from the current bounds, so a
+    change in the TOTAL_PATIENTS range does not invalidate cached rows.
+    """
+    df.columns = [col.upper() for col in df.columns]
+    if "TRIAL_ID" not in df.columns:
+        raise ValueError("Incremental processing keys the cache by TRIAL_ID, which is missing from the input; "
+                         "add TRIAL_ID to PASSTHROUGH_COLUMNS.")
+    df = df[df["STATUS"] == "Completed"].copy()
+
+    keys = pd.DataFrame({"TRIAL_ID": df["TRIAL_ID"].to_numpy(), "ROW_HASH": row_hashes(df)})
+    results = cache.lookup(keys)
+    results.index = df.index
+
+    changed = ~results["CACHED"].to_numpy()
+    if changed.any():
+        fresh = process_clinical_trials(df[changed].copy(), confidence, prior_alpha, prior_beta, efficacy_bins=efficacy_bins)
+        results.loc[changed, CACHED_COLUMNS] = fresh[CACHED_COLUMNS]
+        cache.store(results[changed])
+
+    df["EFFICACY_RATE"] = results["EFFICACY_RATE"].astype(float)
+    totals = df["TOTAL_PATIENTS"].astype(float)
+    df["NORMALIZED_PATIENTS"] = (totals - totals.min()) / (totals.max() - totals.min())
+    df["CI_LOWER"] = results["CI_LOWER"].astype(float)
+    df["CI_UPPER"] = results["CI_UPPER"].astype(float)
+    df["EFFICACY_CATEGORY"] = pd.Categorical(results["EFFICACY_CATEGORY"], categories=efficacy_categories(efficacy_bins))
+    return df
@@ -0,0 +1,93 @@
+import argparse
+import numpy as np
+import pandas as pd
+from data_io import write_results
+
+DEFAULT_STATUS_MIX = {"Completed": 0.6, "Ongoing": 0.25, "Terminated": 0.1, "Withdrawn": 0.05}
+DEFAULT_PHASE_MIX = {"Phase 1": 0.3, "Phase 2": 0.4, "Phase 3": 0.3}
+
+# Per-phase enrolment as a log-normal (median, sigma) and the range of the
+# underlying success probability; later phases enrol more patients.
+DEFAULT_PHASE_PROFILES = {
+    "Phase 1": {"patients_median": 40, "patients_sigma": 0.5, "success_range": (0.1, 0.6)},
+    "Phase 2": {"patients_median": 150, "patients_sigma": 0.6, "success_range": (0.2, 0.8)},
+    "Phase 3": {"patients_median": 800, "patients_sigma": 0.7, "success_range": (0.4, 0.95)},
+}
+
+DRUG_TYPES = ["Small Molecule", "Monoclonal Antibody", "Peptide", "Gene Therapy", "Vaccine"]
+
+def generate_trials(n_rows, seed=0, status_mix=DEFAULT_STATUS_MIX, phase_mix=DEFAULT_PHASE_MIX,
+                    phase_profiles=DEFAULT_PHASE_PROFILES, n_drugs=1000, max_patients=100_000):
+    """
+    Generates a reproducible clinical trials table with the schema of
+    data/clinical_trial.csv. status_mix and phase_mix map labels to
+    probabilities; phase_profiles sets the patient count distribution and
+    success probabilities per phase.
+    """
+    check_phases(phase_mix, phase_profiles)
+    rng = np.random.default_rng(seed)
+    phases = list(phase_mix)
+    phase_codes = rng.choice(len(phases), size=n_rows, p=normalized(phase_mix))
+
+    total_patients = np.empty(n_rows, dtype=np.int64)
+    success_rate = np.empty(n_rows)
+    for code, phase in enumerate(phases):
+        rows = phase_codes == code
+        profile = phase_profiles[phase]
+        patients = rng.lognormal(np.log(profile["patients_median"]), profile["patients_sigma"], size=rows.sum())
+        total_patients[rows] = np.clip(np.rint(patients), 1, max_patients)
+        success_rate[rows] = rng.uniform(*profile["success_range"], size=rows.sum())
+
+    drug_names = np.array([f"Test {DRUG_TYPES[i % len(DRUG_TYPES)]} {i // len(DRUG_TYPES) + 1:02d}" for i in range(n_drugs)])
+    return pd.DataFrame({
+        "trial_id": np.arange(100_001, 100_001 + n_rows),
+        "drug_name": drug_names[rng.integers(0, n_drugs, size=n_rows)],
+        "phase": np.array(phases)[phase_codes],
+        "status": rng.choice(list(status_mix), size=n_rows, p=normalized(status_mix)),
+        "total_patients": total_patients,
+        "successful_outcomes": rng.binomial(total_patients, success_rate),
+    })
+
+def normalized(mix):
+    weights = np.array(list(mix.values()), dtype=float)
+    return weights / weights.sum()
+
+def parse_mix(text):
+    """
+    Parses "Completed=0.7,Ongoing=0.3" into a mix dict.
+    """
+    return {label: float(weight) for label, weight in (item.split("=") for item in text.split(","))}
+
+def check_phases(phase_mix, phase_profiles=DEFAULT_PHASE_PROFILES):
+    """
+    Raises ValueError listing the valid phases if phase_mix names a phase
+    without an entry in phase_profiles.
+    """
+    unknown = [phase for phase in phase_mix if phase not in phase_profiles]
+    if unknown:
+        raise ValueError(f"No phase profile for {', '.join(map(repr, unknown))}; "
+                         f"valid phases are {', '.join(map(repr, phase_profiles))}.")
+
+def parse_phase_mix(text):
+    mix = parse_mix(text)
+    try:
+        check_phases(mix)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return mix
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic clinical trials table (CSV, Parquet or Arrow).")
+    parser.add_argument("output", help="output file; the format follows the extension")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--status-mix", type=parse_mix, default=DEFAULT_STATUS_MIX)
+    parser.add_argument("--phase-mix", type=parse_phase_mix, default=DEFAULT_PHASE_MIX)
+    args = parser.parse_args()
+
+    df = generate_trials(args.rows, args.seed, args.status_mix, args.phase_mix)
+    write_results(df, args.output)
+    print(f"Wrote {len(df)} trials to '{args.output}'.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import fnmatch
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from data_io import FORMATS_BY_EXTENSION, read_trials, write_results
+from data_processor import DEFAULT_EFFICACY_BINS, process_clinical_trials
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+def process_file(input_file, output_file, passthrough_columns=None, efficacy_bins=DEFAULT_EFFICACY_BINS):
+    """
+    Processes one dropped file and writes the result atomically: the output
+    is written to a temporary file next to output_file and renamed into place.
+    Returns the number of input and output rows.
+    """
+    df = read_trials(input_file, passthrough_columns=passthrough_columns)
+    rows_in = len(df)
+    processed_df = process_clinical_trials(df, efficacy_bins=efficacy_bins)
+
+    output_dir, output_name = os.path.split(output_file)
+    fd, tmp_file = tempfile.mkstemp(dir=output_dir or ".", prefix=f".{output_name}.", suffix=os.path.splitext(output_name)[1])
+    os.close(fd)
+    try:
+        write_results(processed_df, tmp_file)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        os.remove(tmp_file)
+        raise
+    return rows_in, len(processed_df)
+
+def output_path(input_file, output_dir):
+    """
+    Output file for input_file: same name and format with a .processed suffix.
+    """
+    stem, extension = os.path.splitext(os.path.basename(input_file))
+    return os.path.join(output_dir, f"{stem}.processed{extension}")
+
+def is_input_file(name, ignore_patterns=()):
+    """
+    Skips hidden/temporary files, our own outputs, names matching any of the
+    glob ignore_patterns (e.g. the batch mode's OUTPUT_FILE) and unsupported formats.
+    """
+    stem, extension = os.path.splitext(name)
+    return not name.startswith(".") and not stem.endswith(".processed") and extension.lower() in FORMATS_BY_EXTENSION \
+        and not any(fnmatch.fnmatch(name, pattern) for pattern in ignore_patterns)
+
+def is_up_to_date(input_file, output_dir):
+    output_file = output_path(input_file, output_dir)
+    return os.path.exists(output_file) and os.path.getmtime(output_file) >= os.path.getmtime(input_file)
+
+def poll_directory(watch_dir, poll_interval, stop_event, ignore_patterns=()):
+    """
+    Yields paths of new or modified input files in watch_dir. A file is
+    reported once its size and mtime are unchanged between two polls, so
+    files still being copied in are not picked up half-written.
+    """
+    reported, pending = {}, {}
+    while not stop_event.is_set():
+        for entry in os.scandir(watch_dir):
+            if not entry.is_file() or not is_input_file(entry.name, ignore_patterns):
+                continue
+            stat = entry.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if reported.get(entry.path) == signature:
+                continue
+            if pending.get(entry.path) == signature:
+                reported[entry.path] = signature
+                del pending[entry.path]
+                yield entry.path
+            else:
+                pending[entry.path] = signature
+        stop_event.wait(poll_interval)
+
+def inotify_directory(watch_dir, poll_interval, stop_event, ignore_patterns=()):
+    """
+    Yields paths of input files closed after writing or moved into watch_dir.
+    Files already present are reported first.
+    """
+    for entry in sorted(os.scandir(watch_dir), key=lambda entry: entry.name):
+        if entry.is_file() and is_input_file(entry.name, ignore_patterns):
+            yield entry.path
+    flags = inotify_simple.flags
+    with inotify_simple.INotify() as inotify:
+        inotify.add_watch(watch_dir, flags.CLOSE_WRITE | flags.MOVED_TO)
+        while not stop_event.is_set():
+            for event in inotify.read(timeout=int(poll_interval * 1000)):
+                if is_input_file(event.name, ignore_patterns):
+                    yield os.path.join(watch_dir, event.name)
+
+class WorkerStats:
+    """
+    Thread-safe per-run counters for the resident worker.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.files = 0
+        self.failures = 0
+        self.rows = 0
+
+    def record(self, input_file, rows_in, rows_out, queued_seconds, processing_seconds):
+        with self.lock:
+            self.files += 1
+            self.rows += rows_in
+            uptime = time.perf_counter() - self.started
+            files, rows = self.files, self.rows
+        logging.info(
+            f"Processed {input_file}: rows_in={rows_in} rows_out={rows_out} "
+            f"queue_wait={queued_seconds:.3f}s latency={queued_seconds + processing_seconds:.3f}s "
+            f"throughput={rows_in / processing_seconds if processing_seconds else 0:.0f} rows/s | "
+            f"total files={files} rows={rows} avg={rows / uptime:.0f} rows/s"
+        )
+
+    def record_failure(self, input_file, error):
+        with self.lock:
+            self.failures += 1
+        logging.error(f"Error processing {input_file}: {error}")
+
+def run_worker(watch_dir, output_dir, concurrency=1, pool="thread", queue_size=64, poll_interval=1.0,
+               passthrough_columns=None, efficacy_bins=DEFAULT_EFFICACY_BINS, stop_event=None, ignore_patterns=()):
+    """
+    Resident worker: watches watch_dir for CSV/Parquet/Arrow drops and
+    processes them with concurrency consumer threads fed from a bounded
+    queue. With pool="process" the consumers hand the work to a process pool
+    of the same size. File names matching ignore_patterns are never picked
+    up. Runs until stop_event is set.
+    """
+    stop_event = stop_event or threading.Event()
+    os.makedirs(output_dir, exist_ok=True)
+    files = queue.Queue(maxsize=queue_size)
+    stats = WorkerStats()
+    executor = ProcessPoolExecutor(max_workers=concurrency) if pool == "process" else None
+
+    def consume():
+        while True:
+            item = files.get()
+            if item is None:
+                return
+            input_file, queued_at = item
+            started = time.perf_counter()
+            try:
+                args = (input_file, output_path(input_file, output_dir), passthrough_columns, efficacy_bins)
+                if executor is None:
+                    rows_in, rows_out = process_file(*args)
+                else:
+                    rows_in, rows_out = executor.submit(process_file, *args).result()
+                stats.record(input_file, rows_in, rows_out, started - queued_at, time.perf_counter() - started)
+            except Exception as e:
+                stats.record_failure(input_file, e)
+
+    consumers = [threading.Thread(target=consume, daemon=True) for _ in range(concurrency)]
+    for consumer in consumers:
+        consumer.start()
+
+    watch = inotify_directory if inotify_simple is not None else poll_directory
+    logging.info(f"Worker watching {watch_dir} with {watch.__name__}, {concurrency} {pool} workers")
+    try:
+        for input_file in watch(watch_dir, poll_interval, stop_event, ignore_patterns):
+            if not is_up_to_date(input_file, output_dir):
+                files.put((input_file, time.perf_counter()))
+    finally:
+        for _ in consumers:
+            files.put(None)
+        for consumer in consumers:
+            consumer.join()
+        if executor is not None:
+            executor.shutdown()
+    return stats
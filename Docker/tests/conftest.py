@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Inside the container src/ is the working directory and its modules import
+# each other by their flat names (e.g. "from data_processor import ...").
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("LOG_FILE", os.devnull)
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+import pandas as pd
+from api import MicroBatcher, coerce_rows, process_batch, respond, serve
+from data_processor import process_clinical_trials
+
+def make_request_rows(offset):
+    return pd.DataFrame({
+        "trial_id": [101 + offset, 102 + offset, 103 + offset],
+        "status": ["Completed", "Ongoing", "Completed"],
+        "total_patients": [100 + offset, 80, 120 + 3 * offset],
+        "successful_outcomes": [85, 50, 90],
+    })
+
+class TestApi(unittest.TestCase):
+    def test_process_batch_matches_per_request(self):
+        frames = [make_request_rows(offset) for offset in range(4)]
+        results = process_batch([frame.copy() for frame in frames])
+        for frame, result in zip(frames, results):
+            pd.testing.assert_frame_equal(result, process_clinical_trials(frame.copy()))
+
+    def test_concurrent_requests_are_micro_batched(self):
+        async def scenario():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                batcher = MicroBatcher(executor, max_batch_rows=1000, max_latency=0.05)
+                ready = asyncio.get_running_loop().create_future()
+                server_task = asyncio.ensure_future(serve("127.0.0.1", 0, batcher, ready.set_result))
+                port = (await ready).sockets[0].getsockname()[1]
+
+                async def post(payload):
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                    body = json.dumps(payload).encode()
+                    writer.write(
+                        f"POST /score HTTP/1.1\r\nContent-Type: application/json\r\n"
+                        f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+                    )
+                    response = await reader.read()
+                    writer.close()
+                    head, body = response.split(b"\r\n\r\n", 1)
+                    return int(head.split()[1]), json.loads(body)
+
+                responses = await asyncio.gather(
+                    *[post(make_request_rows(offset).to_dict(orient="records")) for offset in range(5)],
+                    post({"rows": [{"trial_id": 1}]}),
+                )
+                server_task.cancel()
+                return responses
+
+        responses = asyncio.run(scenario())
+        for offset, (status, rows) in enumerate(responses[:5]):
+            self.assertEqual(status, 200)
+            expected = process_clinical_trials(make_request_rows(offset))
+            self.assertEqual([row["TRIAL_ID"] for row in rows], list(expected["TRIAL_ID"]))
+            self.assertEqual([row["NORMALIZED_PATIENTS"] for row in rows], list(expected["NORMALIZED_PATIENTS"]))
+        self.assertEqual(responses[5][0], 400)
+
+    def test_batch_mates_do_not_change_dtypes(self):
+        async def scenario(frames):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                batcher = MicroBatcher(executor)
+                # Submitted together, so both land in one micro-batch.
+                return await asyncio.gather(*(batcher.submit(frame.copy()) for frame in frames))
+
+        with_ids = coerce_rows(make_request_rows(0))
+        float_counts = coerce_rows(make_request_rows(1).drop(columns="trial_id").astype({"successful_outcomes": float}))
+        result_ids, result_floats = asyncio.run(scenario([with_ids, float_counts]))
+        for frame, result in ((with_ids, result_ids), (float_counts, result_floats)):
+            pd.testing.assert_frame_equal(result, process_batch([frame.copy()])[0])
+            pd.testing.assert_frame_equal(result, process_clinical_trials(frame.copy()))
+        self.assertEqual(result_ids["TRIAL_ID"].dtype, with_ids["TRIAL_ID"].dtype)
+        self.assertEqual(result_ids["SUCCESSFUL_OUTCOMES"].dtype, with_ids["SUCCESSFUL_OUTCOMES"].dtype)
+
+    def test_coerce_rows(self):
+        rows = make_request_rows(0).astype({"total_patients": str})
+        self.assertEqual(coerce_rows(rows)["TOTAL_PATIENTS"].tolist(), [100, 80, 120])
+        with self.assertRaisesRegex(ValueError, "TOTAL_PATIENTS"):
+            coerce_rows(rows.assign(total_patients=["100", "many", "120"]))
+        with self.assertRaisesRegex(ValueError, "negative"):
+            coerce_rows(rows.assign(successful_outcomes=[85, -1, 90]))
+
+    def test_failed_batch_is_retried_per_request(self):
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                batcher = MicroBatcher(executor)
+                # Skips coerce_rows and cannot be processed; must not fail its batch mates.
+                bad = make_request_rows(9).assign(total_patients=["many", "few", "some"])
+                pending = [(frame, loop.create_future()) for frame in (make_request_rows(0), bad, make_request_rows(1))]
+                await batcher.run(pending)
+                return [future.exception() or future.result() for _, future in pending]
+
+        good0, bad, good1 = asyncio.run(scenario())
+        self.assertIsInstance(bad, ValueError)
+        pd.testing.assert_frame_equal(good0, process_clinical_trials(make_request_rows(0)))
+        pd.testing.assert_frame_equal(good1, process_clinical_trials(make_request_rows(1)))
+
+    def test_encoding_errors_return_500(self):
+        async def scenario():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                batcher = MicroBatcher(executor, max_latency=0)
+                body = make_request_rows(0).to_json(orient="records").encode()
+                with mock.patch("api.encode_rows", side_effect=TypeError("cannot encode")):
+                    return await respond("POST", "/score", {}, body, batcher)
+
+        status, body, _ = asyncio.run(scenario())
+        self.assertEqual((status, json.loads(body)), (500, {"error": "cannot encode"}))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from app import batch_mode, process_csv_in_chunks
+from data_io import write_results
+from data_processor import process_clinical_trials
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.tmpdir.name, "clinical_trials.csv")
+        self.output_file = os.path.join(self.tmpdir.name, "processed_results.csv")
+        pd.DataFrame({
+            "trial_id": range(101, 111),
+            "drug_name": [f"Test Drug {i:02d}" for i in range(10)],
+            "phase": ["Phase 3", "Phase 2", "Phase 3", "Phase 1", "Phase 2"] * 2,
+            "status": ["Completed", "Ongoing", "Completed", "Terminated", "Completed",
+                       "Completed", "Completed", "Ongoing", "Terminated", "Completed"],
+            "total_patients": [100, 500, 120, 50, 30, 400, 75, 10, 900, 210],
+            "successful_outcomes": [85, 50, 90, 10, 12, 380, 40, 2, 300, 150],
+        }).to_csv(self.input_file, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_chunked_output_matches_in_memory(self):
+        process_clinical_trials(pd.read_csv(self.input_file)).to_csv(self.output_file, index=False)
+        with open(self.output_file) as f:
+            expected = f.read()
+        for chunk_size in (1, 3, 4, 100):
+            process_csv_in_chunks(self.input_file, self.output_file, chunk_size)
+            with open(self.output_file) as f:
+                self.assertEqual(f.read(), expected)
+
+    def test_chunked_parquet_matches_in_memory(self):
+        parquet_input = os.path.join(self.tmpdir.name, "clinical_trials.parquet")
+        parquet_output = os.path.join(self.tmpdir.name, "processed_results.parquet")
+        write_results(pd.read_csv(self.input_file), parquet_input)
+        expected = process_clinical_trials(pd.read_csv(self.input_file)).reset_index(drop=True)
+        for input_file in (self.input_file, parquet_input):
+            process_csv_in_chunks(input_file, parquet_output, 3)
+            result = pd.read_parquet(parquet_output)
+            pd.testing.assert_frame_equal(result.astype(str), expected.astype(str))
+
+    def test_chunked_arrow_output_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "CHUNK_SIZE=0"):
+            process_csv_in_chunks(self.input_file, os.path.join(self.tmpdir.name, "out.arrow"), 3)
+
+class TestBatchMode(unittest.TestCase):
+    def test_modes(self):
+        self.assertEqual(batch_mode(0, False, 1), "serial")
+        self.assertEqual(batch_mode(100, False, 1), "stream")
+        self.assertEqual(batch_mode(0, True, 1), "incremental")
+        self.assertEqual(batch_mode(0, False, 4), "parallel")
+
+    def test_conflicting_settings_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "incremental, parallel"):
+            batch_mode(0, True, 4)
+        with self.assertRaisesRegex(ValueError, "stream, incremental"):
+            batch_mode(100, True, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from data_io import detect_format, read_csv_trials, read_trials, write_results
+from data_processor import process_clinical_trials
+
+class TestDataIO(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({
+            "trial_id": [101, 102, 103, 104],
+            "drug_name": ["Drug A", "Drug B", "Drug C", "Drug D"],
+            "phase": ["Phase 3", "Phase 2", "Phase 3", "Phase 1"],
+            "status": ["Completed", "Ongoing", "Completed", "Terminated"],
+            "total_patients": [100, 80, 120, 50],
+            "successful_outcomes": [85, 50, 90, 10],
+        })
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_detect_format(self):
+        self.assertEqual(detect_format("data/trials.parquet"), "parquet")
+        self.assertEqual(detect_format("data/trials.arrow"), "arrow")
+        self.assertEqual(detect_format("data/trials.dat", "CSV"), "csv")
+        with self.assertRaises(ValueError):
+            detect_format("data/trials.dat")
+
+    def test_projection(self):
+        for name in ("trials.csv", "trials.parquet", "trials.arrow"):
+            write_results(self.df, self.path(name))
+            df = read_trials(self.path(name), passthrough_columns=["TRIAL_ID"])
+            self.assertEqual(list(df.columns), ["trial_id", "status", "total_patients", "successful_outcomes"])
+
+    def test_columnar_round_trip_is_typed(self):
+        write_results(self.df, self.path("trials.csv"))
+        processed_df = process_clinical_trials(read_trials(self.path("trials.csv"))).reset_index(drop=True)
+        for name in ("results.parquet", "results.arrow"):
+            write_results(processed_df, self.path(name))
+            df = read_trials(self.path(name))
+            self.assertIsInstance(df["EFFICACY_CATEGORY"].dtype, pd.CategoricalDtype)
+            pd.testing.assert_frame_equal(df, processed_df)
+        category_type = pq.read_schema(self.path("results.parquet")).field("EFFICACY_CATEGORY").type
+        self.assertTrue(pa.types.is_dictionary(category_type))
+
+    def test_dtype_plan_and_completed_filter(self):
+        expected = process_clinical_trials(self.df.copy())
+        for name in ("trials.csv", "trials.parquet", "trials.arrow"):
+            write_results(self.df, self.path(name))
+            df = read_csv_trials(self.path(name), completed_only=True, block_size=1) if name.endswith(".csv") else \
+                read_trials(self.path(name), completed_only=True)
+            self.assertEqual(list(df["trial_id"]), [101, 103])
+            self.assertEqual(str(df["total_patients"].dtype), "UInt32")
+            for col in ("drug_name", "phase", "status"):
+                self.assertIsInstance(df[col].dtype, pd.CategoricalDtype)
+            processed_df = process_clinical_trials(df)
+            pd.testing.assert_frame_equal(processed_df.astype(expected.dtypes).reset_index(drop=True),
+                                          expected.reset_index(drop=True))
+
+    def test_missing_and_negative_counts(self):
+        missing = self.df.astype({"total_patients": "Int64", "successful_outcomes": "Int64"})
+        missing.loc[0, "total_patients"] = pd.NA
+        missing.loc[2, "successful_outcomes"] = pd.NA
+        expected = process_clinical_trials(missing.astype({"total_patients": float, "successful_outcomes": float}))
+        for name in ("trials.csv", "trials.parquet", "trials.arrow"):
+            write_results(missing, self.path(name))
+            df = read_trials(self.path(name), completed_only=True)
+            self.assertEqual(str(df["total_patients"].dtype), "UInt32")
+            self.assertEqual(df["total_patients"].isna().tolist(), [True, False])
+            processed_df = process_clinical_trials(df).reset_index(drop=True)
+            self.assertTrue(processed_df[["EFFICACY_RATE", "CI_LOWER", "CI_UPPER"]].isna().all(axis=None))
+            for col in ("EFFICACY_RATE", "NORMALIZED_PATIENTS", "CI_LOWER", "CI_UPPER", "EFFICACY_CATEGORY"):
+                pd.testing.assert_series_equal(processed_df[col], expected[col].reset_index(drop=True))
+
+        negative = self.df.assign(successful_outcomes=[85, -50, 90, 10])
+        for name in ("trials.csv", "trials.parquet", "trials.arrow"):
+            write_results(negative, self.path(name))
+            with self.assertRaises(ValueError):
+                read_trials(self.path(name))
+
+if __name__ == "__main__":
+    unittest.main()
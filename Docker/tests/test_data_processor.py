@@ -1,6 +1,14 @@
 import unittest
+import numpy as np
 import pandas as pd
-from src.data_processor import process_clinical_trials
+from src.data_processor import (
+    calculate_confidence_interval,
+    calculate_confidence_intervals,
+    classify_drug,
+    classify_efficacy,
+    process_clinical_trials,
+    process_clinical_trials_parallel,
+)
 
 class TestDataProcessor(unittest.TestCase):
     def test_process_clinical_trials(self):
@@ -25,5 +33,54 @@ class TestDataProcessor(unittest.TestCase):
         self.assertIn("EFFICACY_RATE", processed_df.columns)  # Efficacy rate column exists
         self.assertAlmostEqual(processed_df["EFFICACY_RATE"].iloc[0], 0.85, places=2)
 
+    def test_vectorized_confidence_intervals_match_rowwise(self):
+        successes = np.array([85, 50, 90, 10, 0, 7])
+        totals = np.array([100, 80, 120, 50, 12, 7])
+        for confidence, prior_alpha, prior_beta in [(0.95, 1, 1), (0.9, 0.5, 0.5), (0.99, 2, 3)]:
+            lower, upper = calculate_confidence_intervals(successes, totals, confidence, prior_alpha, prior_beta)
+            for i in range(len(successes)):
+                expected = calculate_confidence_interval(successes[i], totals[i], confidence, prior_alpha, prior_beta)
+                self.assertEqual((lower[i], upper[i]), tuple(expected))
+
+    def test_vectorized_classification_matches_classify_drug(self):
+        efficacy = np.concatenate([np.linspace(0, 1, 101), [0.5, 0.8, np.nan]])
+        categories = classify_efficacy(efficacy)
+        self.assertEqual(list(categories.astype(object)), [classify_drug(e) for e in efficacy])
+
+    def test_per_phase_classification(self):
+        efficacy_bins = {
+            "thresholds": [0.5, 0.8],
+            "labels": ["Low Efficacy", "Moderate Efficacy", "High Efficacy"],
+            "phases": {"Phase 1": {"thresholds": [0.3], "labels": ["Low Efficacy", "Promising"]}},
+        }
+        categories = classify_efficacy([0.4, 0.4, 0.9], ["Phase 1", "Phase 3", "Phase 1"], efficacy_bins)
+        self.assertEqual(list(categories.astype(object)), ["Promising", "Low Efficacy", "Promising"])
+        self.assertEqual(list(categories.categories), ["Low Efficacy", "Moderate Efficacy", "High Efficacy", "Promising"])
+
+    def test_parallel_matches_serial(self):
+        rng = np.random.default_rng(0)
+        total_patients = rng.integers(20, 500, size=50)
+        data = {
+            "trial_id": np.arange(50),
+            "status": rng.choice(["Completed", "Ongoing"], size=50),
+            "total_patients": total_patients,
+            "successful_outcomes": rng.binomial(total_patients, 0.6),
+        }
+        expected = process_clinical_trials(pd.DataFrame(data))
+        for max_workers in (1, 3):
+            processed_df = process_clinical_trials_parallel(pd.DataFrame(data), max_workers)
+            pd.testing.assert_frame_equal(processed_df, expected)
+
+    def test_parallel_matches_serial_without_counts(self):
+        data = pd.DataFrame({
+            "trial_id": [101, 102, 103],
+            "status": ["Completed", "Completed", "Completed"],
+            "total_patients": pd.array([None, None, None], dtype="UInt32"),
+            "successful_outcomes": pd.array([None, None, None], dtype="UInt32"),
+        })
+        expected = process_clinical_trials(data.copy())
+        self.assertTrue(expected["NORMALIZED_PATIENTS"].isna().all())
+        pd.testing.assert_frame_equal(process_clinical_trials_parallel(data.copy(), 2), expected)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,36 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+import pandas as pd
+from data_processor import process_clinical_trials
+from instrumentation import StageRecorder
+
+class TestInstrumentation(unittest.TestCase):
+    def test_stages_are_recorded_and_exported(self):
+        df = pd.DataFrame({
+            "status": ["Completed", "Ongoing", "Completed"],
+            "total_patients": [100, 80, 120],
+            "successful_outcomes": [85, 50, 90],
+        })
+        logger = logging.getLogger("test_instrumentation")
+        recorder = StageRecorder(logger)
+        with self.assertLogs(logger, level="INFO") as logs:
+            process_clinical_trials(df, recorder=recorder)
+
+        self.assertEqual([stage.name for stage in recorder.stages], ["filter", "efficacy", "normalization", "ci", "classify"])
+        first = json.loads(logs.records[0].getMessage())
+        self.assertEqual((first["stage"], first["rows_in"], first["rows_out"]), ("filter", 3, 2))
+        self.assertGreaterEqual(first["wall_seconds"], 0)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "metrics.prom")
+            recorder.write_prometheus(path)
+            with open(path) as f:
+                text = f.read()
+        self.assertIn("# TYPE pharma_stage_wall_seconds gauge", text)
+        self.assertIn('pharma_stage_rows_out{stage="filter"} 2', text)
+
+if __name__ == "__main__":
+    unittest.main()
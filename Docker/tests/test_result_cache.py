@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from data_processor import process_clinical_trials
+from result_cache import ResultCache, process_clinical_trials_incremental
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache_file = os.path.join(self.tmpdir.name, "results_cache.sqlite")
+        self.df = pd.DataFrame({
+            "trial_id": [101, 102, 103, 104, 105],
+            "drug_name": ["Drug A", "Drug B", "Drug C", "Drug D", "Drug E"],
+            "phase": ["Phase 3", "Phase 2", "Phase 3", "Phase 1", "Phase 2"],
+            "status": ["Completed", "Ongoing", "Completed", "Terminated", "Completed"],
+            "total_patients": [100, 80, 120, 50, 60],
+            "successful_outcomes": [85, 50, 90, 10, 20],
+        })
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assert_matches_full_run(self, df, cache):
+        expected = process_clinical_trials(df.copy())
+        pd.testing.assert_frame_equal(process_clinical_trials_incremental(df.copy(), cache), expected)
+
+    def test_incremental_matches_full_run(self):
+        cache = ResultCache(self.cache_file)
+        self.assert_matches_full_run(self.df, cache)
+        self.assert_matches_full_run(self.df, cache)
+
+        # Changes the TOTAL_PATIENTS bounds and one cached row; only that row is
+        # recomputed and its old entry is replaced.
+        changed_df = self.df.copy()
+        changed_df.loc[0, "total_patients"] = 300
+        self.assert_matches_full_run(changed_df, cache)
+        count = cache.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        self.assertEqual(count, 3)
+        cache.close()
+
+    def test_missing_trial_id_is_rejected(self):
+        cache = ResultCache(self.cache_file)
+        with self.assertRaisesRegex(ValueError, "PASSTHROUGH_COLUMNS"):
+            process_clinical_trials_incremental(self.df.drop(columns="trial_id"), cache)
+        cache.close()
+
+    def test_settings_change_clears_cache(self):
+        cache = ResultCache(self.cache_file)
+        process_clinical_trials_incremental(self.df.copy(), cache)
+        cache.close()
+        cache = ResultCache(self.cache_file, confidence=0.9)
+        self.assertEqual(cache.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0], 0)
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import argparse
+import unittest
+import pandas as pd
+from synthetic_data import generate_trials, parse_mix, parse_phase_mix
+
+class TestSyntheticData(unittest.TestCase):
+    def test_seeded_and_consistent(self):
+        df = generate_trials(5000, seed=7)
+        pd.testing.assert_frame_equal(df, generate_trials(5000, seed=7))
+        self.assertFalse(df.equals(generate_trials(5000, seed=8)))
+        self.assertEqual(list(df.columns), ["trial_id", "drug_name", "phase", "status", "total_patients", "successful_outcomes"])
+        self.assertTrue(df["trial_id"].is_unique)
+        self.assertTrue((df["successful_outcomes"] <= df["total_patients"]).all())
+        self.assertTrue((df["total_patients"] >= 1).all())
+
+    def test_mixes(self):
+        df = generate_trials(20000, status_mix=parse_mix("Completed=3,Ongoing=1"), phase_mix={"Phase 3": 1})
+        self.assertEqual(set(df["phase"]), {"Phase 3"})
+        self.assertAlmostEqual((df["status"] == "Completed").mean(), 0.75, delta=0.02)
+        self.assertGreater(df["total_patients"].median(), 500)
+
+    def test_unknown_phase(self):
+        with self.assertRaisesRegex(ValueError, "'Phase 4'.*valid phases are 'Phase 1', 'Phase 2', 'Phase 3'"):
+            generate_trials(10, phase_mix={"Phase 3": 1, "Phase 4": 1})
+        with self.assertRaisesRegex(argparse.ArgumentTypeError, "'Phase 4'"):
+            parse_phase_mix("Phase 3=1,Phase 4=1")
+        self.assertEqual(parse_phase_mix("Phase 1=2"), {"Phase 1": 2.0})
+
+if __name__ == "__main__":
+    unittest.main()
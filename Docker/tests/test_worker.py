@@ -0,0 +1,64 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import pandas as pd
+import worker
+from data_processor import process_clinical_trials
+
+class TestWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.tmpdir.name, "processed")
+        os.makedirs(self.output_dir)
+        self.df = pd.DataFrame({
+            "trial_id": [101, 102, 103],
+            "status": ["Completed", "Ongoing", "Completed"],
+            "total_patients": [100, 80, 120],
+            "successful_outcomes": [85, 50, 90],
+        })
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_process_file_writes_atomically(self):
+        input_file = os.path.join(self.tmpdir.name, "trials.csv")
+        output_file = os.path.join(self.output_dir, "trials.processed.csv")
+        self.df.to_csv(input_file, index=False)
+        self.assertEqual(worker.process_file(input_file, output_file), (3, 2))
+        self.assertEqual(os.listdir(self.output_dir), ["trials.processed.csv"])
+        expected = process_clinical_trials(self.df.copy()).reset_index(drop=True)
+        pd.testing.assert_frame_equal(pd.read_csv(output_file), expected.astype({"EFFICACY_CATEGORY": object}))
+
+    def test_is_input_file(self):
+        self.assertTrue(worker.is_input_file("trials.parquet"))
+        self.assertFalse(worker.is_input_file("trials.processed.csv"))
+        self.assertFalse(worker.is_input_file(".trials.csv.tmp.csv"))
+        self.assertFalse(worker.is_input_file("results_cache.sqlite"))
+        self.assertFalse(worker.is_input_file("processed_results.csv", ["processed_results.csv"]))
+        self.assertTrue(worker.is_input_file("trials.csv", ["processed_results.csv"]))
+
+    def test_run_worker_picks_up_drops(self):
+        self.df.to_csv(os.path.join(self.tmpdir.name, "before.csv"), index=False)
+        self.df.to_csv(os.path.join(self.tmpdir.name, "processed_results.csv"), index=False)
+        stop_event = threading.Event()
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(stats=worker.run_worker(
+            self.tmpdir.name, self.output_dir, concurrency=2, poll_interval=0.05, stop_event=stop_event,
+            ignore_patterns=["processed_results.csv"])))
+        thread.start()
+        self.df.to_parquet(os.path.join(self.tmpdir.name, "after.parquet"))
+
+        deadline = time.time() + 10
+        expected = {"before.processed.csv", "after.processed.parquet"}
+        while time.time() < deadline and not expected <= set(os.listdir(self.output_dir)):
+            time.sleep(0.05)
+        stop_event.set()
+        thread.join()
+
+        self.assertEqual(set(os.listdir(self.output_dir)), expected)
+        self.assertEqual((result["stats"].files, result["stats"].rows), (2, 6))
+
+if __name__ == "__main__":
+    unittest.main()
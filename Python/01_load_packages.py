@@ -7,6 +7,7 @@ packages = {
     "seaborn": "seaborn",
     "scanpy": "scanpy",
     "pandas": "pandas",
+    "patsy": "patsy",
     "bioconda-bioconductor-singlecellexperiment": "SingleCellExperiment"
 }
 
@@ -2,6 +2,9 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
+import theme
+
+theme.use()
 
 # Sample data with error bars
 df = pd.DataFrame({
@@ -32,18 +35,5 @@ ax.set_title("Bar Plot with Error Bars", fontsize=14)
 ax.set_xlabel("Group", fontsize=14)
 ax.set_ylabel("Value", fontsize=14)
 
-# Customize background and grid
-ax.set_facecolor("#f2f2f2")
-ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
-ax.grid(which="minor", linestyle="-", linewidth=0.25, color="#dbe3db")
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.spines["bottom"].set_linewidth(0.5)
-ax.spines["left"].set_linewidth(0.5)
-
-# Adjust tick labels
-ax.tick_params(axis="x", labelsize=12)
-ax.tick_params(axis="y", labelsize=12)
-
 # Show the plot
 plt.show()
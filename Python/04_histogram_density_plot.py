@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
+import theme
+
+theme.use()
 
 # Generate sample data
 np.random.seed(42)
@@ -29,15 +32,4 @@ ax.set_title("Histogram with Density Overlay", fontsize=14)
 ax.set_xlabel("Values", fontsize=14)
 ax.set_ylabel("Density", fontsize=14)
 
-ax.set_facecolor("#f2f2f2")
-ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
-ax.grid(which="minor", linestyle="-", linewidth=0.25, color="#dbe3db")
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.spines["bottom"].set_linewidth(0.5)
-ax.spines["left"].set_linewidth(0.5)
-
-ax.tick_params(axis="x", labelsize=12)
-ax.tick_params(axis="y", labelsize=12)
-
 plt.show()
@@ -1,7 +1,10 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
+from density_scatter import density_scatter
+import theme
+
+theme.use(overrides={"xtick.labelsize": "medium", "ytick.labelsize": "medium"})
 
 # Generate data
 np.random.seed(42)
@@ -29,14 +32,16 @@ colors = {True: "#1a1a1a", False: "grey"}
 # Create figure
 fig, ax = plt.subplots(figsize=(7, 6))
 
-# Scatter plot
-sns.scatterplot(data=data, x="logFC", y="neg_log", hue="significant", palette=colors, edgecolor="black", s=30, alpha=0.8, ax=ax)
-
 ax.set_xlim(x_axis_min, x_axis_max)
 ax.set_xticks(np.arange(x_axis_min, x_axis_max + 1, x_axis_breaks))
 ax.set_ylim(y_axis_min, y_axis_max)
 ax.set_yticks(np.arange(y_axis_min, y_axis_max + 1, y_axis_breaks))
 
+# Scatter plot: significant genes are vector markers; with many genes the rest
+# become one density image at the given dpi (set the axis limits first).
+density_scatter(ax, data["logFC"], data["neg_log"], hue=data["significant"], palette=colors,
+                highlight=data["significant"], edgecolor="black", s=30, alpha=0.8, dpi=300)
+
 ax.set_title("Volcano Plot", fontsize=14)
 ax.set_xlabel("Log2 Fold Change", fontsize=14)
 ax.set_ylabel("-Log10 P-value", fontsize=14)
@@ -46,14 +51,4 @@ ax.axvline(x=fold_change_threshold, linestyle="dashed", color="black", linewidth
 ax.axvline(x=-fold_change_threshold, linestyle="dashed", color="black", linewidth=1)
 ax.axhline(y=-np.log10(pvalue_threshold), linestyle="dashed", color="black", linewidth=1)
 
-ax.set_facecolor("#f2f2f2")
-ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
-ax.grid(which="minor", linestyle="-", linewidth=0.25, color="#dbe3db")
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.spines["bottom"].set_linewidth(0.5)
-ax.spines["left"].set_linewidth(0.5)
-
-ax.get_legend().remove()
-
 plt.show()
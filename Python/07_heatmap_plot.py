@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
+from fast_heatmap import clustermap
 
 np.random.seed(1)
 
@@ -40,13 +40,15 @@ batch_colors = sample_info['Batch'].map(batch_palette)
 col_colors_df = pd.DataFrame({'Condition': condition_colors, 'Batch': batch_colors})
 
 # --- Generate Clustermap with Column Annotations ---
-g = sns.clustermap(data,
-                   cmap="vlag",
-                   standard_scale=1,
-                   col_colors=col_colors_df,
-                   linewidths=0.1,
-                   figsize=(10, 10)
-                  )
+# The matrix is drawn as one raster image and the linkage is cached, so the
+# same call scales to genome-wide matrices (approximate row ordering above
+# fast_heatmap.APPROXIMATE_MIN_ROWS genes).
+g = clustermap(data,
+               cmap="vlag",
+               standard_scale_axis=1,
+               col_colors=col_colors_df,
+               figsize=(10, 10)
+              )
 
 g.fig.suptitle("Clustermap with Sample Annotations", y=1.03)
 
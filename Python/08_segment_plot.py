@@ -1,6 +1,10 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import theme
+
+theme.use(overrides={"axes.facecolor": "#f9f9f9", "axes.grid.which": "major",
+                     "xtick.labelsize": "medium", "ytick.labelsize": "medium"})
 
 # Data
 df = pd.DataFrame({
@@ -37,11 +41,4 @@ ax.set_title("Segment Plot", fontsize=14)
 
 ax.set_xticks(range(0, 201, 20))
 
-ax.set_facecolor("#f9f9f9")
-ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.spines["bottom"].set_linewidth(0.5)
-ax.spines["left"].set_linewidth(0.5)
-
 plt.show()
@@ -1,6 +1,10 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+import theme
+
+theme.use(overrides={"axes.facecolor": "#f9f9f9", "axes.spines.left": False, "axes.grid.which": "major",
+                     "xtick.labelsize": "medium", "ytick.labelsize": "medium"})
 
 # Generate data
 np.random.seed(42)
@@ -34,11 +38,4 @@ ax.scatter(df["hazard_ratio"], df["group"], color=(0.2, 0.7, 0.1, 0.5), s=50)
 ax.set_xlabel("Hazard Ratio", fontsize=14)
 ax.set_ylabel("")
 
-ax.set_facecolor("#f9f9f9")
-ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.spines["left"].set_visible(False)
-ax.spines["bottom"].set_linewidth(0.5)
-
 plt.show()
@@ -3,6 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from lifelines import CoxPHFitter
+from cox_batch import hazard_ratio_table
 
 # Simulate data
 np.random.seed(123)
@@ -27,12 +28,8 @@ cph.fit(df, duration_col="time", event_col="status")
 summary_df = cph.summary
 
 # Create a dataframe for hazard ratio plotting
-hr_df = pd.DataFrame({
-    "Predictor": summary_df.index,
-    "HazardRatio": np.exp(summary_df["coef"]),
-    "LowerCI": np.exp(summary_df["coef"] - 1.96 * summary_df["se(coef)"]),
-    "UpperCI": np.exp(summary_df["coef"] + 1.96 * summary_df["se(coef)"])
-})
+# (for many cohorts at once, see cox_batch.fit_cohorts)
+hr_df = hazard_ratio_table(summary_df)
 
 hr_df = hr_df.sort_values(by="HazardRatio")
 
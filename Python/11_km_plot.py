@@ -1,8 +1,7 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from lifelines import KaplanMeierFitter
-from lifelines.statistics import logrank_test
+from km_engine import kaplan_meier, logrank_test, median_survival, plot_survival
 
 # Simulate data
 np.random.seed(123)
@@ -12,21 +11,24 @@ df = pd.DataFrame({
     "group": ["Treatment"] * 50 + ["Control"] * 50  # Group variable
 })
 
-# Fit Kaplan-Meier estimator
-kmf = KaplanMeierFitter()
+# Fit Kaplan-Meier estimators for all groups in one pass
+km = kaplan_meier(df["time"], df["status"], df["group"])
+medians = median_survival(km)
+
+# Log-rank test between the groups
+statistic, dof, p_value = logrank_test(df["time"], df["status"], df["group"])
+print(f"Log-rank test: chi2 = {statistic:.3f}, df = {dof}, p = {p_value:.4f}")
 
 # Plot Kaplan-Meier curves
 plt.figure(figsize=(8, 6))
+ax = plt.gca()
 
-# Fit and plot for Treatment group
-kmf.fit(df[df["group"] == "Treatment"]["time"], event_observed=df[df["group"] == "Treatment"]["status"], label="Treatment")
-kmf.plot(ci_show=True, color="#E69F00", linestyle='-', linewidth=2)
-
-# Fit and plot for Control group
-kmf.fit(df[df["group"] == "Control"]["time"], event_observed=df[df["group"] == "Control"]["status"], label="Control")
-kmf.plot(ci_show=True, color="#56B4E9", linestyle='-', linewidth=2)
+# Plot Treatment and Control groups
+plot_survival(ax, km, "Treatment", color="#E69F00", ci_show=True, linestyle='-', linewidth=2)
+plot_survival(ax, km, "Control", color="#56B4E9", ci_show=True, linestyle='-', linewidth=2)
+plt.legend()
 
-plt.axvline(x=kmf.median_, color='black', linestyle='--', linewidth=1)
+plt.axvline(x=medians["Control"], color='black', linestyle='--', linewidth=1)
 
 plt.title("Kaplan-Meier Survival Curves", fontsize=16)
 plt.xlabel("Time in days", fontsize=14)
@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-import statsmodels.api as sm
+from mass_lm import fit_genes
 
 # Simulate data (100 samples, 1000 genes)
 np.random.seed(123)
@@ -28,25 +28,30 @@ data = pd.DataFrame(X, columns=gene_names)
 data['time'] = surv_time
 data['status'] = event_status
 
-# Separate predictors (X) and target (y)
-X = data[gene_names]
-y = data['time']
-
-# Convert all feature columns to numeric (if needed)
-X = X.apply(pd.to_numeric, errors='coerce')
-y = pd.to_numeric(y, errors='coerce')
-
-# Handle missing data (drop rows with NaN values)
-X = X.dropna()
-y = y[X.index]  # Align y with X after dropping rows
-
-# Add a constant (intercept) to the model
-X = sm.add_constant(X)
-
-# Fit the OLS model
-try:
-    model = sm.OLS(y, X).fit()
-    # Print the summary of the model
-    print(model.summary())
-except Exception as e:
-    print(f"Error fitting model: {e}")
+# Gene expression (one response per gene) and the shared design variables
+expression = data[gene_names]
+design_data = data[['time', 'status']]
+
+# Convert all columns to numeric (if needed)
+expression = expression.apply(pd.to_numeric, errors='coerce')
+design_data = design_data.apply(pd.to_numeric, errors='coerce')
+
+# Handle missing data (drop samples with NaN values)
+complete = expression.notna().all(axis=1) & design_data.notna().all(axis=1)
+expression = expression[complete]
+design_data = design_data[complete]
+
+# Note: this is a different model from earlier versions of this script. They
+# fit a single OLS of time on all 1000 genes, which with 100 samples has more
+# predictors than observations: no residual degrees of freedom, so its
+# coefficients, standard errors and p-values were not meaningful. The script
+# now reverses the direction and fits one model per gene,
+#     expression ~ intercept + status + log(time),
+# and reports the genes associated with (log) survival time.
+results = fit_genes(expression, "status + np.log(time)", data=design_data, terms=["status", "np.log(time)"])
+
+# Top genes associated with log survival time (BH-adjusted p-values)
+print("Per-gene models: expression ~ status + log(time) (replaces the earlier time ~ all-genes OLS)")
+time_results = results[results["term"] == "np.log(time)"].sort_values("p")
+print(time_results.head(10).to_string(index=False))
+print(f"{(time_results['p_adjusted'] < 0.05).sum()} genes with FDR < 0.05")
@@ -1,6 +1,6 @@
 import numpy as np
 import pandas as pd
-from sklearn.decomposition import PCA
+from scalable_pca import run_pca
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -23,12 +23,12 @@ treatment_expr[:200, :] += 0.3  # Upregulate first 200 genes
 expr_matrix = np.hstack([control_expr, treatment_expr])
 expr_df = pd.DataFrame(expr_matrix.T, columns=genes, index=samples)
 
-# Run PCA
-pca = PCA(n_components=2)
-pca_scores = pca.fit_transform(expr_df)
+# Run PCA (mode="auto" picks exact, randomized, incremental or sparse from the input;
+# pass a .npy/.parquet path or a scipy.sparse matrix for data that does not fit in RAM)
+pca = run_pca(expr_df, n_components=2, mode="auto")
 
 # Prepare plot data
-pca_df = pd.DataFrame(pca_scores, columns=["PC1", "PC2"])
+pca_df = pca.pca_df
 pca_df["Group"] = group
 
 # Custom colors
@@ -1,8 +1,7 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from sklearn.manifold import TSNE
-from sklearn.preprocessing import StandardScaler
+from tsne_pipeline import run_tsne
 import seaborn as sns
 
 # Parameters
@@ -26,16 +25,9 @@ expr_matrix = pd.DataFrame(expr_matrix, index=genes, columns=samples)
 # Transpose the matrix to match samples as rows
 expr_t = expr_matrix.T
 
-# Standardize the expression data
-scaler = StandardScaler()
-expr_t_scaled = scaler.fit_transform(expr_t)
-
-# Run t-SNE
-tsne = TSNE(n_components=2, init='pca', random_state=42)
-tsne_results = tsne.fit_transform(expr_t_scaled)
-
-# Create a DataFrame for t-SNE results
-tsne_df = pd.DataFrame(tsne_results, columns=["tSNE1", "tSNE2"])
+# Standardize (float32, in place), reduce with PCA, build the kNN graph and run t-SNE.
+# Pass cache_dir to reuse the kNN graph across perplexity or seed sweeps.
+tsne_df = run_tsne(expr_t.to_numpy(dtype=np.float32), perplexity=30, n_pca=50, random_state=42)
 tsne_df['Group'] = group
 
 # Custom color vector: named by group
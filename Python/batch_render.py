@@ -0,0 +1,190 @@
+"""
+Headless batch rendering of many figures on a process pool.
+
+A RenderJob is a plot type, its data and its parameters, plus where to write
+the figure. render() spreads jobs over worker processes. render_pdf()
+collects them as the pages of one PDF. Each worker:
+
+- draws on matplotlib Figure objects directly, without pyplot or a GUI
+  backend. PNG goes through Agg, PDF through the PDF backend;
+- applies the style (rcParams, theme.PUBLICATION by default; theme.FAST
+  for bulk jobs) once, when it starts;
+- draws every job on a new figure, so nothing a plot adds to the figure
+  (suptitles, legends, extra axes) carries over to the next job. Reusing
+  figures was measured and was not faster: tick layout and encoding
+  dominate the per-figure time.
+
+Plot types are the names in PLOTS, which mirror the numbered plotting
+scripts, or any module-level function plot(ax, data, **params).
+"""
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+
+import matplotlib
+import numpy as np
+import seaborn as sns
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from density_scatter import density_scatter
+from km_engine import kaplan_meier, plot_survival
+from theme import PUBLICATION
+
+try:
+    import pypdf
+except ImportError:  # optional; without it render_pdf writes all pages from one worker
+    pypdf = None
+
+@dataclass
+class RenderJob:
+    plot_type: object  # a PLOTS name or a module-level plot(ax, data, **params)
+    data: object
+    params: dict = field(default_factory=dict)
+    output: str = None  # file path for render(); unused by render_pdf()
+    title: str = None
+    xlabel: str = None
+    ylabel: str = None
+    figsize: tuple = (6, 5)
+
+def bar_plot(ax, data, x="group", y="value", error="error", color="#2c5aa0"):
+    """Bars with error bars, as 02_barplot.py."""
+    sns.barplot(data=data, x=x, y=y, color=color, edgecolor="#1a1a1a", width=0.6, ax=ax)
+    if error is not None:
+        ax.errorbar(data[x], data[y], yerr=data[error], fmt="none", color="black", capsize=4, linewidth=1)
+
+def box_plot(ax, data, x="group", y="value", color="#2c5aa0", point_color="#a02c2c"):
+    """Boxes with jittered points, as 03_boxplot.py."""
+    sns.boxplot(data=data, x=x, y=y, ax=ax, color=color, linewidth=1.2, fliersize=0,
+                boxprops=dict(alpha=0.1), whiskerprops=dict(color="#1a1a1a"),
+                medianprops=dict(color="#1a1a1a"), capprops=dict(color="#1a1a1a"))
+    sns.stripplot(data=data, x=x, y=y, ax=ax, color=point_color, alpha=0.6, jitter=0.2, size=3)
+
+def histogram_plot(ax, data, bins=30, color="#2c5aa0", density_color="#a02c2c"):
+    """Density histogram with a KDE overlay, as 04_histogram_density_plot.py."""
+    sns.histplot(data, bins=bins, stat="density", color=color, edgecolor="black", alpha=0.2, ax=ax)
+    sns.kdeplot(data, fill=True, color=density_color, alpha=0.1, ax=ax)
+
+def scatter_plot(ax, data, x="x", y="y", hue="category", palette=None, xlim=None, ylim=None, s=40):
+    """Categorical scatter through density_scatter, as 05_scatter_plot.py."""
+    palette = palette or dict(zip(sorted(data[hue].unique()), sns.color_palette(n_colors=data[hue].nunique())))
+    ax.set_xlim(xlim or (data[x].min(), data[x].max()))
+    ax.set_ylim(ylim or (data[y].min(), data[y].max()))
+    density_scatter(ax, data[x], data[y], data[hue], palette, s=s, alpha=0.8, dpi=ax.figure.dpi)
+
+def volcano_plot(ax, data, fold_change_threshold=1, pvalue_threshold=0.05, xlim=(-10, 10), ylim=(0, 10)):
+    """Volcano of a logFC/pvalue table, as 06_volcano_plot.py."""
+    neg_log = -np.log10(data["pvalue"])
+    significant = (data["logFC"].abs() > fold_change_threshold) & (data["pvalue"] < pvalue_threshold)
+    ax.set_xlim(xlim)
+    ax.set_ylim(ylim)
+    density_scatter(ax, data["logFC"], neg_log, significant, {True: "#1a1a1a", False: "grey"}, highlight=significant,
+                    s=30, alpha=0.8, dpi=ax.figure.dpi)
+    for x in (0, fold_change_threshold, -fold_change_threshold):
+        ax.axvline(x=x, linestyle="dashed", color="black", linewidth=1)
+    ax.axhline(y=-np.log10(pvalue_threshold), linestyle="dashed", color="black", linewidth=1)
+
+def forest_plot(ax, data):
+    """Hazard ratios with confidence intervals from a cox_batch table, as 09_hazard_ratio_plot.py."""
+    data = data.sort_values("HazardRatio")
+    positions = np.arange(len(data))
+    ax.hlines(positions, data["LowerCI"], data["UpperCI"], color="grey", linewidth=2)
+    ax.scatter(data["HazardRatio"], positions, color=(0.2, 0.7, 0.1, 0.5), s=50)
+    ax.set_yticks(positions, data["Predictor"])
+    ax.axvline(x=1, linestyle="dashed", color="black", linewidth=1)
+
+def km_plot(ax, data, time="time", event="status", group="group", palette=None):
+    """Kaplan-Meier curves per group, as 11_km_plot.py."""
+    km = kaplan_meier(data[time], data[event], data[group])
+    for name in km["group"].unique():
+        plot_survival(ax, km, name, color=(palette or {}).get(name), linewidth=2)
+    ax.legend()
+
+PLOTS = {
+    "bar": bar_plot,
+    "box": box_plot,
+    "histogram": histogram_plot,
+    "scatter": scatter_plot,
+    "volcano": volcano_plot,
+    "forest": forest_plot,
+    "km": km_plot
+}
+
+def _init_worker(style):
+    matplotlib.rcParams.update(style)
+
+def _draw(job, dpi):
+    fig = Figure(figsize=job.figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    plot = PLOTS[job.plot_type] if isinstance(job.plot_type, str) else job.plot_type
+    plot(ax, job.data, **job.params)
+    if job.title is not None:
+        ax.set_title(job.title)
+    if job.xlabel is not None:
+        ax.set_xlabel(job.xlabel)
+    if job.ylabel is not None:
+        ax.set_ylabel(job.ylabel)
+    return fig
+
+def _render_files(jobs, dpi, savefig_kwargs):
+    for job in jobs:
+        _draw(job, dpi).savefig(job.output, dpi=dpi, **savefig_kwargs)
+    return [job.output for job in jobs]
+
+def _render_pages(jobs, dpi, path, savefig_kwargs):
+    with PdfPages(path) as pdf:
+        for job in jobs:
+            pdf.savefig(_draw(job, dpi), **savefig_kwargs)
+    return path
+
+def _chunks(items, n_chunks):
+    size = max(1, math.ceil(len(items) / n_chunks))
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+def render(jobs, max_workers=None, dpi=150, style=PUBLICATION, savefig_kwargs=None, chunks_per_worker=4):
+    """
+    Renders every job to job.output (the format follows the extension) on
+    max_workers processes. savefig_kwargs are passed to every savefig, e.g.
+    pil_kwargs={"compress_level": 1} trades PNG size for encoding time.
+    Returns the output paths in job order.
+    """
+    jobs = list(jobs)
+    missing = [i for i, job in enumerate(jobs) if job.output is None]
+    if missing:
+        raise ValueError(f"Jobs {missing[:5]} have no output path.")
+    max_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(style,)) as executor:
+        results = executor.map(_render_files, _chunks(jobs, max_workers * chunks_per_worker), repeat(dpi),
+                               repeat(savefig_kwargs or {}))
+        return [path for paths in results for path in paths]
+
+def render_pdf(jobs, path, max_workers=None, dpi=150, style=PUBLICATION, savefig_kwargs=None):
+    """
+    Renders the jobs as the pages of one PDF at path, in job order. With
+    pypdf installed, each worker writes a contiguous run of pages and the
+    parts are concatenated. Otherwise a single worker writes every page.
+    """
+    jobs = list(jobs)
+    max_workers = (max_workers or os.cpu_count() or 1) if pypdf is not None else 1
+    directory = os.path.dirname(os.path.abspath(path))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(style,)) as executor:
+        if max_workers == 1:
+            tmp_path = f"{path}.{os.getpid()}.tmp.pdf"
+            executor.submit(_render_pages, jobs, dpi, tmp_path, savefig_kwargs or {}).result()
+            os.replace(tmp_path, path)
+            return path
+        with tempfile.TemporaryDirectory(dir=directory) as part_dir:
+            chunks = _chunks(jobs, max_workers)
+            part_paths = [os.path.join(part_dir, f"part{i}.pdf") for i in range(len(chunks))]
+            list(executor.map(_render_pages, chunks, repeat(dpi), part_paths, repeat(savefig_kwargs or {})))
+            writer = pypdf.PdfWriter()
+            for part_path in part_paths:
+                writer.append(part_path)
+            tmp_path = os.path.join(part_dir, "merged.pdf")
+            with open(tmp_path, "wb") as f:
+                writer.write(f)
+            os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,95 @@
+"""
+Benchmarks batch_render throughput in figures per second, and per core.
+
+A mixed set of per-gene and per-cohort jobs (bar, box, histogram, volcano,
+forest and Kaplan-Meier plots) is rendered to PNG:
+- the scripts' way, serially: one pyplot figure per job, the per-axes
+  styling calls, then savefig and close;
+- with batch_render.render on 1..--workers processes (Figure objects
+  without pyplot, style applied once per worker);
+- as one multi-page PDF with batch_render.render_pdf.
+
+Usage:
+    python benchmarks/bench_batch_render.py --jobs 240 --workers 1 2 4
+"""
+import argparse
+import os
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from common import timed
+from batch_render import PLOTS, RenderJob, pypdf, render, render_pdf
+
+def make_jobs(n_jobs, out_dir, seed=0):
+    rng = np.random.default_rng(seed)
+    jobs = []
+    for i in range(n_jobs):
+        kind = ("bar", "box", "histogram", "volcano", "forest", "km")[i % 6]
+        if kind == "bar":
+            data = pd.DataFrame({"group": list("ABCD"), "value": rng.uniform(5, 20, 4), "error": rng.uniform(1, 3, 4)})
+        elif kind == "box":
+            data = pd.DataFrame({"group": np.repeat(list("ABC"), 100), "value": rng.normal(6, 1, 300)})
+        elif kind == "histogram":
+            data = rng.normal(size=1000)
+        elif kind == "volcano":
+            data = pd.DataFrame({"logFC": rng.normal(0, 2, 10_000), "pvalue": rng.uniform(0, 1, 10_000)})
+        elif kind == "forest":
+            ratio = rng.uniform(0.5, 2, 10)
+            data = pd.DataFrame({"Predictor": [f"Gene{g}" for g in range(10)], "HazardRatio": ratio,
+                                 "LowerCI": ratio * 0.7, "UpperCI": ratio * 1.4})
+        else:
+            data = pd.DataFrame({"time": rng.exponential(20, 100), "status": rng.integers(0, 2, 100),
+                                 "group": np.repeat(["Treatment", "Control"], 50)})
+        jobs.append(RenderJob(kind, data, output=os.path.join(out_dir, f"figure{i}.png"), title=f"{kind} {i}"))
+    return jobs
+
+def render_with_pyplot(jobs, dpi):
+    for job in jobs:
+        fig, ax = plt.subplots(figsize=job.figsize, dpi=dpi)
+        PLOTS[job.plot_type](ax, job.data, **job.params)
+        ax.set_title(job.title, fontsize=14)
+        ax.set_facecolor("#f2f2f2")
+        ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
+        ax.grid(which="minor", linestyle="-", linewidth=0.25, color="#dbe3db")
+        ax.spines["top"].set_visible(False)
+        ax.spines["right"].set_visible(False)
+        ax.spines["bottom"].set_linewidth(0.5)
+        ax.spines["left"].set_linewidth(0.5)
+        ax.tick_params(axis="x", labelsize=12)
+        ax.tick_params(axis="y", labelsize=12)
+        fig.savefig(job.output, dpi=dpi)
+        plt.close(fig)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=240)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.jobs} figures, pypdf {'installed' if pypdf is not None else 'not installed'}")
+    print(f"{'renderer':>26} {'workers':>8} {'seconds':>8} {'fig/s':>7} {'fig/s/core':>11}")
+
+    def report(name, workers, seconds):
+        print(f"{name:>26} {workers:>8} {seconds:>8.2f} {args.jobs / seconds:>7.1f} {args.jobs / seconds / workers:>11.1f}")
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        jobs = make_jobs(args.jobs, out_dir)
+        # Warm up font caches and first-call imports; forked workers inherit them.
+        render_with_pyplot(jobs[:6], args.dpi)
+        _, seconds = timed(render_with_pyplot, jobs, args.dpi)
+        report("pyplot, figure per job", 1, seconds)
+        for workers in args.workers:
+            _, seconds = timed(render, jobs, workers, args.dpi)
+            report("batch_render.render", workers, seconds)
+        for workers in args.workers:
+            _, seconds = timed(render_pdf, jobs, os.path.join(out_dir, "report.pdf"), workers, args.dpi)
+            report("batch_render.render_pdf", workers if pypdf is not None else 1, seconds)
+
+if __name__ == "__main__":
+    main()
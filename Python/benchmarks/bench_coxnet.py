@@ -0,0 +1,62 @@
+"""
+Benchmarks the elastic-net Cox path against lifelines.
+
+Simulates the 12_elastic_net_logistic_regression_survival.py design (three
+true genes, exponential survival times, random censoring) at each feature
+count. It times the full coxnet path, the cross-validated path with folds
+in parallel, and one penalized lifelines CoxPHFitter fit at a single
+lambda. lifelines builds a p x p Hessian, so it only runs up to
+--max-lifelines-features.
+
+Usage:
+    python benchmarks/bench_coxnet.py --features 1000 10000 50000 --samples 100
+"""
+import argparse
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+from lifelines import CoxPHFitter
+
+from common import timed
+from coxnet import coxnet_path, cv_coxnet
+
+def simulate(n_samples, n_features, seed=123):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_samples, n_features))
+    linear_predictor = X[:, :3] @ np.array([1.5, -1.0, 0.8])
+    time = rng.exponential(1 / (0.1 * np.exp(linear_predictor)))
+    event = rng.binomial(1, 0.5, n_samples)
+    return X, time, event
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--features", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--alpha", type=float, default=0.5)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-lifelines-features", type=int, default=1000)
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    print(f"{'features':>9} {'path (s)':>9} {'lambdas':>8} {'cv (s)':>8} {'lifelines 1 fit (s)':>20} {'max |coef diff|':>16}")
+    for n_features in args.features:
+        X, time, event = simulate(args.samples, n_features)
+        path, path_seconds = timed(coxnet_path, X, time, event, alpha=args.alpha)
+        _, cv_seconds = timed(cv_coxnet, X, time, event, alpha=args.alpha, n_folds=args.folds, max_workers=args.workers)
+
+        lifelines_seconds, difference = float("nan"), float("nan")
+        if n_features <= args.max_lifelines_features:
+            # Compare at a lambda on the path, where both solve the same problem.
+            lam = path.lambdas[len(path.lambdas) // 2]
+            df = pd.DataFrame(X, columns=path.feature_names).assign(time=time, status=event)
+            cph, lifelines_seconds = timed(CoxPHFitter(penalizer=lam, l1_ratio=args.alpha).fit, df, "time", "status")
+            mine = path.coefficients(lam).reindex(path.feature_names, fill_value=0.0)
+            difference = np.max(np.abs(cph.params_.to_numpy() - mine.to_numpy()))
+        print(f"{n_features:>9} {path_seconds:>9.2f} {len(path.lambdas):>8} {cv_seconds:>8.2f} "
+              f"{lifelines_seconds:>20.2f} {difference:>16.1e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmarks fast_heatmap.clustermap against sns.clustermap at increasing gene counts.
+
+For each size it times clustering plus saving a PDF, and reports the file
+size, for:
+- seaborn, as 07_heatmap_plot.py called it (vector cells, linewidths=0.1);
+  skipped above --max-seaborn-genes;
+- fast_heatmap with exact row clustering (skipped above --max-exact-genes)
+  and with approximate ordering, each drawn cold and again from the cached
+  linkage.
+
+Usage:
+    python benchmarks/bench_heatmap.py --genes 500 5000 20000 --samples 50
+"""
+import argparse
+import os
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from common import timed
+from fast_heatmap import clustermap
+
+def simulate(n_genes, n_samples, n_modules=10, seed=1):
+    rng = np.random.default_rng(seed)
+    values = rng.standard_normal((n_genes, n_samples))
+    values += 2 * rng.standard_normal((n_modules, n_samples))[rng.integers(0, n_modules, n_genes)]
+    data = pd.DataFrame(values, index=[f"Gene{i + 1}" for i in range(n_genes)],
+                        columns=[f"Sample{i + 1}" for i in range(n_samples)])
+    col_colors = pd.DataFrame({
+        "Condition": np.where(np.arange(n_samples) < n_samples // 2, "skyblue", "tomato"),
+        "Batch": np.where(np.arange(n_samples) % 2 == 0, "grey", "lightgreen")
+    }, index=data.columns)
+    return data, col_colors
+
+def render(draw, path):
+    """Runs draw() -> figure, saves it to path and returns the file size in KB."""
+    fig = draw()
+    fig.savefig(path)
+    plt.close(fig)
+    return os.path.getsize(path) / 1024
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--genes", type=int, nargs="+", default=[500, 5000, 20000])
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument("--max-seaborn-genes", type=int, default=5000)
+    parser.add_argument("--max-exact-genes", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'genes':>6} {'variant':>26} {'seconds':>8} {'PDF KB':>8}")
+    for n_genes in args.genes:
+        data, col_colors = simulate(n_genes, args.samples)
+        variants = []
+        if n_genes <= args.max_seaborn_genes:
+            variants.append(("seaborn", lambda: sns.clustermap(data, cmap="vlag", standard_scale=1, col_colors=col_colors,
+                                                               linewidths=0.1, figsize=(10, 10)).fig))
+        for mode in ("exact", "approximate"):
+            if mode == "exact" and n_genes > args.max_exact_genes:
+                continue
+            draw = lambda mode=mode: clustermap(data, standard_scale_axis=1, col_colors=col_colors, row_cluster=mode).fig
+            variants += [(f"fast {mode}", draw), (f"fast {mode} (cached)", draw)]
+
+        with tempfile.TemporaryDirectory() as out_dir:
+            for name, draw in variants:
+                size, seconds = timed(render, draw, os.path.join(out_dir, "heatmap.pdf"))
+                print(f"{n_genes:>6} {name:>26} {seconds:>8.2f} {size:>8.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmarks many-group Kaplan-Meier and log-rank against lifelines.
+
+The lifelines baseline is the 11_km_plot.py pattern: one KaplanMeierFitter
+fit per group on a boolean mask, plus one logrank_test per group against
+the rest. km_engine computes all curves, medians and group-vs-rest tests in
+one pass. Results are checked against lifelines on the groups it ran.
+
+Usage:
+    python benchmarks/bench_km_engine.py --groups 10 1000 10000 --rows-per-group 100
+"""
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+from lifelines import KaplanMeierFitter
+from lifelines.statistics import logrank_test
+
+from common import timed
+from km_engine import kaplan_meier, logrank_vs_rest, median_survival
+
+def simulate(n_groups, rows_per_group, seed=123):
+    rng = np.random.default_rng(seed)
+    n = n_groups * rows_per_group
+    group = np.repeat(np.arange(n_groups), rows_per_group)
+    rate = rng.uniform(0.05, 0.1, n_groups)[group]
+    return pd.DataFrame({
+        "time": np.round(rng.exponential(1 / rate), 1),
+        "status": rng.integers(0, 2, n),
+        "group": [f"G{g:05d}" for g in group]
+    })
+
+def lifelines_loop(df, groups):
+    survival, medians, statistics = {}, {}, {}
+    kmf = KaplanMeierFitter()
+    for group in groups:
+        mask = df["group"] == group
+        kmf.fit(df[mask]["time"], event_observed=df[mask]["status"])
+        survival[group] = kmf.survival_function_.iloc[:, 0].to_numpy()
+        medians[group] = kmf.median_survival_time_
+        statistics[group] = logrank_test(df[mask]["time"], df[~mask]["time"],
+                                         df[mask]["status"], df[~mask]["status"]).test_statistic
+    return survival, medians, statistics
+
+def engine(df):
+    km = kaplan_meier(df["time"], df["status"], df["group"])
+    return km, median_survival(km), logrank_vs_rest(df["time"], df["status"], df["group"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--rows-per-group", type=int, default=100)
+    parser.add_argument("--max-lifelines-groups", type=int, default=1000,
+                        help="time lifelines on at most this many groups and extrapolate linearly")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    print(f"{'groups':>7} {'lifelines (s)':>14} {'engine (s)':>11} {'speedup':>8} {'max |dS|':>10}")
+    for n_groups in args.groups:
+        df = simulate(n_groups, args.rows_per_group)
+        (km, medians, tests), engine_seconds = timed(engine, df)
+
+        groups = sorted(df["group"].unique())[:args.max_lifelines_groups]
+        (survival, lifelines_medians, statistics), lifelines_seconds = timed(lifelines_loop, df, groups)
+        lifelines_seconds *= n_groups / len(groups)
+
+        max_diff = max(np.abs(km.loc[km["group"] == group, "survival"].to_numpy() - survival[group]).max() for group in groups)
+        assert all(medians[group] == lifelines_medians[group] for group in groups)
+        assert np.allclose(tests.loc[groups, "test_statistic"], [statistics[group] for group in groups])
+        estimated = "*" if len(groups) < n_groups else " "
+        print(f"{n_groups:>7} {lifelines_seconds:>13.2f}{estimated} {engine_seconds:>11.3f} "
+              f"{lifelines_seconds / engine_seconds:>7.0f}x {max_diff:>10.1e}")
+    print("* extrapolated from --max-lifelines-groups groups")
+
+if __name__ == "__main__":
+    main()
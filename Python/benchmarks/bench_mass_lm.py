@@ -0,0 +1,68 @@
+"""
+Benchmarks mass-univariate linear models against a per-gene statsmodels loop.
+
+Simulates an expression matrix with a shared design (intercept, binary
+status, a continuous covariate and a three-level batch). It times
+mass_lm.fit_genes over all genes against sm.OLS fitted gene by gene, and
+checks that the two agree. The statsmodels loop runs on --loop-genes genes
+and is extrapolated.
+
+Usage:
+    python benchmarks/bench_mass_lm.py --genes 20000 60000 --samples 100
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+
+from common import timed
+from mass_lm import design_matrix, fit_genes
+
+FORMULA = "status + age + C(batch)"
+
+def simulate(n_samples, n_genes, seed=123):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({
+        "status": rng.integers(0, 2, n_samples),
+        "age": rng.normal(60, 10, n_samples),
+        "batch": rng.choice(["A", "B", "C"], n_samples)
+    })
+    expression = rng.standard_normal((n_samples, n_genes))
+    expression[:, :n_genes // 20] += 0.8 * data["status"].to_numpy()[:, None]
+    return data, expression
+
+def statsmodels_loop(expression, X, column):
+    rows = []
+    for g in range(expression.shape[1]):
+        fit = sm.OLS(expression[:, g], X).fit()
+        rows.append((fit.params[column], fit.bse[column], fit.pvalues[column]))
+    return np.array(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--genes", type=int, nargs="+", default=[20000, 60000])
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--loop-genes", type=int, default=2000, help="genes fitted by the statsmodels loop")
+    args = parser.parse_args()
+
+    print(f"{'genes':>7} {'statsmodels (s)':>16} {'fit_genes (s)':>14} {'speedup':>8} {'max |p diff|':>13}")
+    for n_genes in args.genes:
+        data, expression = simulate(args.samples, n_genes)
+        results, engine_seconds = timed(fit_genes, expression, FORMULA, data=data, terms=["status"])
+
+        loop_genes = min(args.loop_genes, n_genes)
+        X = design_matrix(FORMULA, data)
+        reference, loop_seconds = timed(statsmodels_loop, expression[:, :loop_genes], X.to_numpy(),
+                                        list(X.columns).index("status"))
+        loop_seconds *= n_genes / loop_genes
+
+        mine = results[["estimate", "std_error", "p"]].to_numpy()[:loop_genes]
+        assert np.allclose(mine[:, :2], reference[:, :2])
+        p_difference = np.max(np.abs(mine[:, 2] - reference[:, 2]))
+        print(f"{n_genes:>7} {loop_seconds:>15.2f}* {engine_seconds:>14.3f} {loop_seconds / engine_seconds:>7.0f}x "
+              f"{p_difference:>13.1e}")
+    print("* extrapolated from --loop-genes genes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Wall time and peak memory of the scalable_pca modes.
+
+Writes a synthetic cells x genes matrix (two groups, float32) to .npy and
+Parquet, plus a sparse copy with about --density nonzeros. Each mode then
+runs in a fresh subprocess, so its peak RSS (VmHWM) is measured on its own:
+
+    exact / randomized   load the whole matrix into memory
+    incremental (npy)    stream row blocks from the memory-mapped .npy
+    incremental (parquet) stream row batches from Parquet files (written with
+                         row groups of --batch-size rows; Parquet decodes a
+                         whole row group at a time)
+    sparse               load the CSR matrix only
+
+Usage:
+    python benchmarks/bench_pca.py --cells 200000 --genes 2000
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from common import MODULE_DIR
+
+VARIANTS = {
+    "exact": "data = np.load(npy_path); result = run_pca(data, 2, mode='exact')",
+    "randomized": "data = np.load(npy_path); result = run_pca(data, 2, mode='randomized')",
+    "incremental (npy)": "result = run_pca(npy_path, 2, mode='incremental', batch_size=batch_size)",
+    "incremental (parquet)": "result = run_pca(parquet_path, 2, mode='incremental', batch_size=batch_size)",
+    "sparse": "data = sparse.load_npz(sparse_path); result = run_pca(data, 2, mode='sparse')",
+}
+
+SCRIPT = """
+import resource, sys, time
+sys.path.insert(0, {module_dir!r})
+import numpy as np
+from scipy import sparse
+from scalable_pca import run_pca
+npy_path, parquet_path, sparse_path, batch_size = {npy_path!r}, {parquet_path!r}, {sparse_path!r}, {batch_size}
+start = time.perf_counter()
+{run}
+elapsed = time.perf_counter() - start
+try:
+    with open("/proc/self/status") as f:
+        peak_mb = next(int(line.split()[1]) for line in f if line.startswith("VmHWM")) / 1024
+except OSError:
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(elapsed, peak_mb, *result.explained_variance_ratio_)
+"""
+
+def write_inputs(tmpdir, n_cells, n_genes, density, row_group_size, seed=42):
+    rng = np.random.default_rng(seed)
+    matrix = np.lib.format.open_memmap(os.path.join(tmpdir, "expr.npy"), mode="w+", dtype=np.float32,
+                                       shape=(n_cells, n_genes))
+    for start in range(0, n_cells, 50_000):
+        block = rng.normal(10, 1, (min(50_000, n_cells - start), n_genes)).astype(np.float32)
+        block[(np.arange(start, start + len(block)) % 2 == 1), :n_genes // 5] += 0.3
+        matrix[start:start + len(block)] = block
+        pd.DataFrame(block, columns=[f"Gene{j + 1}" for j in range(n_genes)]).to_parquet(
+            os.path.join(tmpdir, "expr.parquet", f"part-{start // 50_000:05d}.parquet"), row_group_size=row_group_size)
+    matrix.flush()
+    counts = sparse.random(n_cells, n_genes, density=density, format="csr", dtype=np.float32, random_state=seed)
+    sparse.save_npz(os.path.join(tmpdir, "expr_sparse.npz"), counts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cells", type=int, default=200_000)
+    parser.add_argument("--genes", type=int, default=2000)
+    parser.add_argument("--density", type=float, default=0.05)
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.makedirs(os.path.join(tmpdir, "expr.parquet"))
+        write_inputs(tmpdir, args.cells, args.genes, args.density, args.batch_size)
+        paths = {"npy_path": os.path.join(tmpdir, "expr.npy"), "parquet_path": os.path.join(tmpdir, "expr.parquet"),
+                 "sparse_path": os.path.join(tmpdir, "expr_sparse.npz")}
+        print(f"{args.cells} cells x {args.genes} genes ({args.cells * args.genes * 4 / 1e6:.0f} MB float32 dense, "
+              f"{args.density:.0%} dense sparse copy)")
+        print(f"{'mode':>22} {'seconds':>8} {'peak_RSS_MB':>12} {'PC1 var %':>10}")
+        for name, run in VARIANTS.items():
+            script = SCRIPT.format(module_dir=MODULE_DIR, run=run, batch_size=args.batch_size, **paths)
+            output = subprocess.run([sys.executable, "-W", "ignore", "-c", script], capture_output=True, text=True, check=True)
+            seconds, peak_mb, ratio, _ = map(float, output.stdout.split())
+            print(f"{name:>22} {seconds:>8.1f} {peak_mb:>12.0f} {ratio * 100:>10.2f}")
+
+if __name__ == "__main__":
+    main()
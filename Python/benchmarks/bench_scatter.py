@@ -0,0 +1,78 @@
+"""
+Benchmarks volcano-plot rendering with density_scatter against per-point markers.
+
+For each point count it renders the 06_volcano_plot.py figure and saves it
+as PNG and PDF at --dpi. It reports the seconds (plotting plus saving) and
+the file sizes for:
+- sns.scatterplot, as the script called it (skipped above --max-vector-points);
+- density_scatter in vector mode, one marker per point (same limit);
+- density_scatter in density mode, where only the significant genes are
+  markers.
+
+Usage:
+    python benchmarks/bench_scatter.py --points 10000 100000 1000000
+"""
+import argparse
+import os
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from common import timed
+from density_scatter import density_scatter
+
+COLORS = {True: "#1a1a1a", False: "grey"}
+
+def simulate(n_points, seed=42):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({"logFC": rng.normal(0, 2, n_points), "pvalue": rng.uniform(0, 1, n_points)})
+    data["neg_log"] = -np.log10(data["pvalue"])
+    data["significant"] = (data["logFC"].abs() > 1) & (data["pvalue"] < 0.05)
+    return data
+
+def volcano(data, variant, dpi):
+    fig, ax = plt.subplots(figsize=(7, 6))
+    ax.set_xlim(-10, 10)
+    ax.set_ylim(0, 10)
+    if variant == "seaborn":
+        sns.scatterplot(data=data, x="logFC", y="neg_log", hue="significant", palette=COLORS, edgecolor="black",
+                        s=30, alpha=0.8, ax=ax, legend=False)
+    else:
+        density_scatter(ax, data["logFC"], data["neg_log"], data["significant"], COLORS, highlight=data["significant"],
+                        s=30, alpha=0.8, mode=variant, dpi=dpi)
+    return fig
+
+def render(data, variant, dpi, out_dir):
+    """Draws and saves the figure as PNG and PDF; returns their sizes in KB."""
+    fig = volcano(data, variant, dpi)
+    sizes = []
+    for extension in ("png", "pdf"):
+        path = os.path.join(out_dir, f"volcano.{extension}")
+        fig.savefig(path, dpi=dpi)
+        sizes.append(os.path.getsize(path) / 1024)
+    plt.close(fig)
+    return sizes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--max-vector-points", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'points':>8} {'variant':>8} {'seconds':>8} {'PNG KB':>8} {'PDF KB':>8}")
+    for n_points in args.points:
+        data = simulate(n_points)
+        variants = ["seaborn", "vector", "density"] if n_points <= args.max_vector_points else ["density"]
+        with tempfile.TemporaryDirectory() as out_dir:
+            for variant in variants:
+                (png_size, pdf_size), seconds = timed(render, data, variant, args.dpi, out_dir)
+                print(f"{n_points:>8} {variant:>8} {seconds:>8.2f} {png_size:>8.0f} {pdf_size:>8.0f}")
+
+if __name__ == "__main__":
+    main()
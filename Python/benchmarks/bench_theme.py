@@ -0,0 +1,96 @@
+"""
+Benchmarks per-figure build time with per-axes styling calls against the theme.
+
+Each variant builds --figures small figures (a bar and line plot on one
+axes). It reports the milliseconds per figure for building one (figure, plot,
+styling), for drawing it on the Agg canvas, and for both together:
+- per-axes: default rcParams followed by the scripts' dozen styling calls;
+- theme: the same figure inside theme.context();
+- theme fast: theme.context(fast=True), no minor grid or antialiasing.
+The variants are interleaved over --rounds rounds and the median is
+reported. The cost of the styling calls alone, on an existing axes, is
+printed for reference.
+
+Usage:
+    python benchmarks/bench_theme.py --figures 1000
+"""
+import argparse
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from common import timed
+import theme
+
+def style_per_axes(ax):
+    ax.set_facecolor("#f2f2f2")
+    ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
+    ax.grid(which="minor", linestyle="-", linewidth=0.25, color="#dbe3db")
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["bottom"].set_linewidth(0.5)
+    ax.spines["left"].set_linewidth(0.5)
+    ax.tick_params(axis="x", labelsize=12)
+    ax.tick_params(axis="y", labelsize=12)
+
+def build(values, styled_per_axes):
+    fig, ax = plt.subplots(figsize=(3, 2.5))
+    ax.bar(np.arange(len(values)), values, color="#2c5aa0", edgecolor="#1a1a1a")
+    ax.plot(np.arange(len(values)), values, color="#a02c2c")
+    ax.set_title("Figure", fontsize=14)
+    if styled_per_axes:
+        style_per_axes(ax)
+    return fig
+
+def run(n_figures, styled_per_axes, draw):
+    rng = np.random.default_rng(0)
+    build_seconds = draw_seconds = 0.0
+    for _ in range(n_figures):
+        fig, seconds = timed(build, rng.uniform(1, 10, 8), styled_per_axes)
+        build_seconds += seconds
+        if draw:
+            start = time.perf_counter()
+            fig.canvas.draw()
+            draw_seconds += time.perf_counter() - start
+        plt.close(fig)
+    return build_seconds, draw_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--figures", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    variants = [
+        ("per-axes", lambda: matplotlib.rc_context(), True),
+        ("theme", lambda: theme.context(), False),
+        ("theme fast", lambda: theme.context(fast=True), False)
+    ]
+    run(20, True, True)  # warm up font caches
+    build_ms = {name: [] for name, _, _ in variants}
+    draw_ms = {name: [] for name, _, _ in variants}
+    total_ms = {name: [] for name, _, _ in variants}
+    for _ in range(args.rounds):
+        for name, context, styled_per_axes in variants:
+            with context():
+                build_seconds, _ = run(args.figures, styled_per_axes, draw=False)
+                drawn_build_seconds, draw_seconds = run(args.figures, styled_per_axes, draw=True)
+            build_ms[name].append(build_seconds / args.figures * 1000)
+            draw_ms[name].append(draw_seconds / args.figures * 1000)
+            total_ms[name].append((drawn_build_seconds + draw_seconds) / args.figures * 1000)
+
+    fig, ax = plt.subplots(figsize=(3, 2.5))
+    _, seconds = timed(lambda: [style_per_axes(ax) for _ in range(args.figures)])
+    plt.close(fig)
+    print(f"styling calls alone: {seconds / args.figures * 1000:.2f} ms per axes")
+    print(f"{'variant':>12} {'build ms':>9} {'draw ms':>8} {'build+draw ms':>14}  "
+          f"(median per figure, {args.figures} figures x {args.rounds} rounds)")
+    for name, _, _ in variants:
+        print(f"{name:>12} {np.median(build_ms[name]):>9.2f} {np.median(draw_ms[name]):>8.2f} "
+              f"{np.median(total_ms[name]):>14.2f}")
+
+if __name__ == "__main__":
+    main()
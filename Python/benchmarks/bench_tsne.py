@@ -0,0 +1,70 @@
+"""
+Benchmarks the tsne_pipeline stages at increasing point counts.
+
+For each size it times:
+- float32 in-place scaling plus PCA;
+- the kNN graph, exact and approximate (pynndescent when installed,
+  otherwise the built-in IVF index), with the approximate graph's recall
+  measured on a sample of exact neighbours;
+- reloading the cached graph, which is what a perplexity or seed sweep pays;
+- the Barnes-Hut optimization.
+Exact kNN and t-SNE are skipped above --max-exact-points and
+--max-tsne-points.
+
+Usage:
+    python benchmarks/bench_tsne.py --points 10000 100000 1000000 --genes 100
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+from common import timed
+from tsne_pipeline import embed, knn_graph, neighbours_needed, pynndescent, reduce, scale_in_place
+
+def simulate(n_points, n_genes, n_clusters=20, seed=42):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_points, n_genes), dtype=np.float32)
+    X += rng.standard_normal((n_clusters, n_genes), dtype=np.float32)[rng.integers(0, n_clusters, n_points)]
+    return X
+
+def recall(Y, graph, k, n_queries=1000, seed=0):
+    queries = np.random.default_rng(seed).choice(len(Y), min(n_queries, len(Y)), replace=False)
+    exact = NearestNeighbors(n_neighbors=k + 1).fit(Y).kneighbors(Y[queries])[1][:, 1:]
+    approximate = graph[queries].indices.reshape(len(queries), -1)[:, :k]
+    return np.mean([len(np.intersect1d(a, b)) / k for a, b in zip(exact, approximate)])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--genes", type=int, default=100)
+    parser.add_argument("--perplexity", type=float, default=30.0)
+    parser.add_argument("--max-exact-points", type=int, default=100_000)
+    parser.add_argument("--max-tsne-points", type=int, default=100_000)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    k = neighbours_needed(args.perplexity)
+    approximate = "pynndescent" if pynndescent is not None else "ivf"
+    print(f"approximate kNN: {approximate}, k={k}, {args.jobs} threads")
+    print(f"{'points':>8} {'scale+PCA':>10} {'exact kNN':>10} {approximate + ' kNN':>12} {'recall':>7} "
+          f"{'cached':>7} {'t-SNE':>8}  (seconds)")
+    for n_points in args.points:
+        X = simulate(n_points, args.genes)
+        Y, reduce_seconds = timed(lambda: reduce(scale_in_place(X)))
+        exact_seconds = tsne_seconds = float("nan")
+        if n_points <= args.max_exact_points:
+            _, exact_seconds = timed(knn_graph, Y, k, "exact", args.jobs)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            graph, approximate_seconds = timed(knn_graph, Y, k, approximate, args.jobs, cache_dir)
+            _, cached_seconds = timed(knn_graph, Y, k, approximate, args.jobs, cache_dir)
+        graph_recall = recall(Y, graph, k - 1)
+        if n_points <= args.max_tsne_points:
+            _, tsne_seconds = timed(embed, Y, graph, args.perplexity, n_jobs=args.jobs)
+        print(f"{n_points:>8} {reduce_seconds:>10.1f} {exact_seconds:>10.1f} {approximate_seconds:>12.1f} "
+              f"{graph_recall:>7.3f} {cached_seconds:>7.2f} {tsne_seconds:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+import sys
+import time
+
+# Benchmarks run from the Python/ directory or this one; make the analysis
+# modules next to the numbered scripts importable.
+MODULE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, MODULE_DIR)
+
+def timed(func, *args, **kwargs):
+    """
+    Runs func once and returns (result, elapsed seconds).
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,133 @@
+"""
+Fits the same Cox proportional hazards model across many cohorts.
+
+The input is a long-format frame with a grouping column, e.g. one row per
+patient with a cohort or subgroup label. Each cohort is fitted with
+lifelines' CoxPHFitter on a process pool, and the results are collected
+into one tidy hazard-ratio table: the hr_df columns from 10_coxph.py plus
+the grouping column.
+
+When cache_dir is given, each cohort's coefficient summary is stored under
+a key made from the cohort data hash, the formula and the fit options.
+Re-runs then only fit the cohorts whose data or model changed.
+"""
+import hashlib
+import os
+import pickle
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from lifelines import CoxPHFitter
+from scipy.stats import norm
+
+HR_COLUMNS = ["Predictor", "HazardRatio", "LowerCI", "UpperCI"]
+
+def hazard_ratio_table(summary, confidence=0.95):
+    """
+    Builds the Predictor/HazardRatio/LowerCI/UpperCI table from a
+    CoxPHFitter summary (Wald intervals on the coefficient scale).
+    """
+    z = norm.ppf(0.5 + confidence / 2)
+    return pd.DataFrame({
+        "Predictor": summary.index,
+        "HazardRatio": np.exp(summary["coef"]),
+        "LowerCI": np.exp(summary["coef"] - z * summary["se(coef)"]),
+        "UpperCI": np.exp(summary["coef"] + z * summary["se(coef)"])
+    }).reset_index(drop=True)
+
+def cohort_key(cohort, formula, fit_options):
+    """Cache key from the cohort's values (not its row labels), formula and fit options."""
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(cohort, index=False).values.tobytes())
+    digest.update(repr((list(cohort.columns), list(cohort.dtypes.astype(str)), formula, sorted(fit_options.items()))).encode())
+    return digest.hexdigest()
+
+def fit_summary(cohort, duration_col, event_col, formula=None, penalizer=0.0):
+    """
+    Fits one cohort and returns the coefficient summary (coef, se(coef), p, ...).
+    """
+    cph = CoxPHFitter(penalizer=penalizer)
+    cph.fit(cohort, duration_col=duration_col, event_col=event_col, formula=formula)
+    return cph.summary[["coef", "se(coef)", "p"]]
+
+def _fit_job(job):
+    # Top-level so the process pool can pickle it; failures come back as values
+    # so one non-converging cohort does not abort the batch.
+    name, cohort, duration_col, event_col, formula, penalizer = job
+    try:
+        return name, fit_summary(cohort, duration_col, event_col, formula, penalizer), None
+    except Exception as error:  # lifelines raises several convergence error types
+        return name, None, f"{type(error).__name__}: {error}"
+
+def _cache_file(cache_dir, key):
+    return os.path.join(cache_dir, key[:2], f"{key}.pkl")
+
+def _load_cached(cache_dir, key):
+    try:
+        with open(_cache_file(cache_dir, key), "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+def _store_cached(cache_dir, key, summary):
+    path = _cache_file(cache_dir, key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(summary, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def fit_cohorts(df, group_col, duration_col="time", event_col="status", formula=None, covariates=None,
+                penalizer=0.0, confidence=0.95, max_workers=None, cache_dir=None):
+    """
+    Fits one Cox model per value of group_col and returns a tidy table with
+    columns [group_col, Predictor, HazardRatio, LowerCI, UpperCI, p], sorted
+    by cohort and then hazard ratio, as in 10_coxph.py.
+
+    covariates restricts the columns handed to the model (all other columns
+    by default); formula is passed to lifelines unchanged. Cohorts that fail
+    to fit are skipped with a warning.
+    """
+    columns = [duration_col, event_col] + (list(covariates) if covariates is not None
+                                           else [c for c in df.columns if c not in (group_col, duration_col, event_col)])
+    fit_options = {"duration_col": duration_col, "event_col": event_col, "penalizer": penalizer}
+
+    summaries, jobs, keys, order = {}, [], {}, []
+    for name, cohort in df.groupby(group_col, sort=True, observed=True)[columns]:
+        name = name[0] if isinstance(name, tuple) else name
+        order.append(name)
+        if cache_dir is not None:
+            keys[name] = cohort_key(cohort, formula, fit_options)
+            cached = _load_cached(cache_dir, keys[name])
+            if cached is not None:
+                summaries[name] = cached
+                continue
+        jobs.append((name, cohort, duration_col, event_col, formula, penalizer))
+
+    if max_workers == 1 or len(jobs) <= 1:
+        results = list(map(_fit_job, jobs))
+    else:
+        # Several cohorts per task keeps pickling overhead below the fit time for small cohorts.
+        chunksize = max(1, len(jobs) // ((max_workers or os.cpu_count() or 1) * 4))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_fit_job, jobs, chunksize=chunksize))
+
+    for name, summary, error in results:
+        if error is not None:
+            warnings.warn(f"Cox model for {group_col}={name!r} failed: {error}")
+            continue
+        summaries[name] = summary
+        if cache_dir is not None:
+            _store_cached(cache_dir, keys[name], summary)
+
+    tables = []
+    for name in (name for name in order if name in summaries):
+        table = hazard_ratio_table(summaries[name], confidence)
+        table["p"] = summaries[name]["p"].to_numpy()
+        table.insert(0, group_col, name)
+        tables.append(table.sort_values(by="HazardRatio"))
+    if not tables:
+        return pd.DataFrame(columns=[group_col] + HR_COLUMNS + ["p"])
+    return pd.concat(tables, ignore_index=True)
@@ -0,0 +1,253 @@
+"""
+Elastic-net penalized Cox regression on the full feature matrix.
+
+Fits the whole regularization path by coordinate descent on the IRLS
+quadratic approximation of the Breslow partial likelihood, following glmnet
+(Simon, Friedman, Hastie & Tibshirani 2011). Each lambda starts from the
+previous solution. Only the features that pass the sequential strong rule
+enter the inner loop, and a KKT check over all features catches anything
+the rule dropped wrongly. The cost per lambda is therefore dominated by a
+few n x p gradient products, not by p coordinate updates.
+
+Tied event times are handled with Breslow's approximation, as glmnet does;
+lifelines' CoxPHFitter uses Efron's. The two agree when there are no tied
+event times; with many ties Breslow's coefficients are slightly closer to
+zero than lifelines' would be.
+
+Features are standardized internally. Coefficients are reported on the
+original scale, and the penalty is applied on the standardized scale, as in
+glmnet and lifelines:
+
+    -loglik(beta) / n + lambda * (alpha * |beta|_1 + (1 - alpha) / 2 * |beta|_2^2)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+@dataclass
+class CoxNetPath:
+    lambdas: np.ndarray
+    coef: sparse.csc_matrix  # features x lambdas, original feature scale
+    feature_names: list
+    alpha: float
+    n_active: np.ndarray
+    deviance_ratio: np.ndarray
+
+    def coefficients(self, lam):
+        """Coefficients at the path lambda closest to lam, as a Series of the nonzero features."""
+        column = int(np.argmin(np.abs(np.log(self.lambdas) - np.log(lam))))
+        values = self.coef[:, column].toarray().ravel()
+        nonzero = np.flatnonzero(values)
+        return pd.Series(values[nonzero], index=[self.feature_names[j] for j in nonzero], name="coef")
+
+@dataclass
+class CoxNetCV:
+    path: CoxNetPath
+    cv_mean: np.ndarray  # partial-likelihood deviance per event, per lambda
+    cv_se: np.ndarray
+    lambda_min: float
+    lambda_1se: float
+
+class _Survival:
+    """
+    Sorted survival data with the tie structure needed for Breslow risk sets.
+    Rows of X must be in the same (ascending time) order.
+    """
+    def __init__(self, time, event):
+        self.order = np.argsort(time, kind="stable")
+        self.time = np.asarray(time, dtype=np.float64)[self.order]
+        self.event = np.asarray(event, dtype=np.float64)[self.order]
+        self.first = np.flatnonzero(np.r_[True, self.time[1:] != self.time[:-1]])
+        self.unique_index = np.cumsum(np.r_[True, self.time[1:] != self.time[:-1]]) - 1
+        self.deaths = np.add.reduceat(self.event, self.first)
+        self.n = len(self.time)
+
+    def terms(self, eta):
+        """
+        Returns (loglik, score, weight): the partial log-likelihood, its
+        gradient with respect to eta, and the diagonal of the negative Hessian.
+        """
+        shift = eta.max()
+        risk = np.exp(eta - shift)
+        risk_set = np.cumsum(risk[::-1])[::-1][self.first]
+        loglik = self.event @ eta - self.deaths @ (np.log(risk_set) + shift)
+        a = np.cumsum(self.deaths / risk_set)[self.unique_index]
+        b = np.cumsum(self.deaths / risk_set ** 2)[self.unique_index]
+        return loglik, self.event - risk * a, risk * a - risk ** 2 * b
+
+def _soft_threshold(value, threshold):
+    return np.sign(value) * max(abs(value) - threshold, 0.0)
+
+def _solve(X, survival, beta, eta, lam, alpha, strong, tol, max_iter):
+    """
+    IRLS + coordinate descent for one lambda over the strong set, updating
+    beta and eta in place. Returns the score vector at the solution.
+    """
+    n = survival.n
+    for _ in range(max_iter):
+        _, score, weight = survival.terms(eta)
+        weight = np.maximum(weight, 1e-12)
+        residual = score / weight  # working response minus eta
+        columns = X[:, strong]
+        weighted = columns * weight[:, None]
+        scale = np.einsum("ij,ij->j", weighted, columns) / n
+        start = beta[strong].copy()
+        for _ in range(max_iter):
+            max_change = 0.0
+            for k, j in enumerate(strong):
+                old = beta[j]
+                new = _soft_threshold(weighted[:, k] @ residual / n + scale[k] * old, lam * alpha) / (scale[k] + lam * (1 - alpha))
+                if new != old:
+                    delta = new - old
+                    beta[j] = new
+                    residual -= delta * columns[:, k]
+                    eta += delta * columns[:, k]
+                    max_change = max(max_change, scale[k] * delta ** 2)
+            if max_change < tol:
+                break
+        if np.max(scale * (beta[strong] - start) ** 2, initial=0.0) < tol:
+            break
+    return survival.terms(eta)[1]
+
+def _fit_path(X, survival, lambdas, alpha, tol, max_iter, max_active):
+    """
+    Warm-started path over lambdas for standardized, time-sorted X. Returns
+    (betas as a p x L dense array of the fitted prefix, log-likelihoods).
+    """
+    n, p = X.shape
+    beta, eta = np.zeros(p), np.zeros(n)
+    score = survival.terms(eta)[1]
+    gradient = X.T @ score / n
+    previous_lambda = lambdas[0]
+    betas, logliks = [], []
+    for lam in lambdas:
+        # Sequential strong rule, plus everything already active.
+        strong = np.flatnonzero((np.abs(gradient) >= alpha * (2 * lam - previous_lambda)) | (beta != 0))
+        while True:
+            score = _solve(X, survival, beta, eta, lam, alpha, strong, tol, max_iter)
+            gradient = X.T @ score / n
+            violations = np.abs(gradient) > lam * alpha * (1 + 1e-6)
+            violations[strong] = False
+            if not violations.any():
+                break
+            strong = np.union1d(strong, np.flatnonzero(violations))
+        betas.append(beta.copy())
+        logliks.append(survival.terms(eta)[0])
+        previous_lambda = lam
+        if np.count_nonzero(beta) >= max_active:
+            break
+    return np.column_stack(betas), np.array(logliks)
+
+def _standardize(X):
+    X = np.asarray(X, dtype=np.float64)
+    mean = X.mean(axis=0)
+    sd = X.std(axis=0)
+    sd[sd == 0] = 1.0
+    return np.asfortranarray((X - mean) / sd), sd
+
+def lambda_sequence(X, time, event, alpha=0.5, n_lambdas=100, lambda_min_ratio=None):
+    """
+    Log-spaced lambdas from the smallest value that keeps every coefficient
+    at zero, down to lambda_min_ratio times it (0.01 when p > n, else 1e-4).
+    """
+    survival = _Survival(time, event)
+    X_std, _ = _standardize(np.asarray(X)[survival.order])
+    return _lambda_sequence(X_std, survival, alpha, n_lambdas, lambda_min_ratio)
+
+def _lambda_sequence(X_std, survival, alpha, n_lambdas, lambda_min_ratio):
+    # lambda_sequence for an already standardized, time-sorted X.
+    score = survival.terms(np.zeros(survival.n))[1]
+    lambda_max = np.max(np.abs(X_std.T @ score)) / survival.n / max(alpha, 1e-3)
+    if lambda_min_ratio is None:
+        lambda_min_ratio = 0.01 if X_std.shape[1] > X_std.shape[0] else 1e-4
+    return np.geomspace(lambda_max, lambda_max * lambda_min_ratio, n_lambdas)
+
+def coxnet_path(X, time, event, alpha=0.5, lambdas=None, n_lambdas=100, lambda_min_ratio=None, tol=1e-7,
+                max_iter=100, max_active=None, feature_names=None):
+    """
+    Fits the elastic-net Cox path. X is an n x p array or DataFrame; alpha
+    is the L1 share of the penalty (1 = lasso). The path stops early once
+    max_active features (default n) are nonzero, as the fit is saturated
+    beyond that.
+    """
+    if feature_names is None:
+        feature_names = list(X.columns) if isinstance(X, pd.DataFrame) else [f"x{j}" for j in range(np.shape(X)[1])]
+    survival = _Survival(time, event)
+    X_std, sd = _standardize(np.asarray(X)[survival.order])
+    if lambdas is None:
+        lambdas = _lambda_sequence(X_std, survival, alpha, n_lambdas, lambda_min_ratio)
+    max_active = max_active or X_std.shape[0]
+
+    betas, logliks = _fit_path(X_std, survival, np.asarray(lambdas, dtype=np.float64), alpha, tol, max_iter, max_active)
+    null_loglik = survival.terms(np.zeros(survival.n))[0]
+    saturated = _saturated_loglik(survival)
+    return CoxNetPath(
+        lambdas=np.asarray(lambdas)[:betas.shape[1]],
+        coef=sparse.csc_matrix(betas / sd[:, None]),
+        feature_names=list(feature_names),
+        alpha=alpha,
+        n_active=np.count_nonzero(betas, axis=0),
+        deviance_ratio=(logliks - null_loglik) / (saturated - null_loglik)
+    )
+
+def _saturated_loglik(survival):
+    # Breslow saturated model: each tied event set is perfectly predicted.
+    deaths = survival.deaths[survival.deaths > 0]
+    return -np.sum(deaths * np.log(deaths))
+
+def _fold_deviance(job):
+    # Top-level for the process pool. Returns the per-lambda cross-validated
+    # partial-likelihood contribution of one fold (Verweij & van Houwelingen):
+    # loglik(all data) - loglik(training data) at the training-fold betas.
+    X, time, event, train, lambdas, alpha, tol, max_iter, max_active = job
+    mean, sd = X[train].mean(axis=0), X[train].std(axis=0)
+    sd[sd == 0] = 1.0
+    standardized = (X - mean) / sd
+
+    train_survival = _Survival(time[train], event[train])
+    betas, train_logliks = _fit_path(np.asfortranarray(standardized[train][train_survival.order]), train_survival,
+                                     lambdas, alpha, tol, max_iter, max_active)
+    full_survival = _Survival(time, event)
+    eta = standardized[full_survival.order] @ betas
+    full_logliks = np.array([full_survival.terms(eta[:, k])[0] for k in range(betas.shape[1])])
+    deviance = np.full(len(lambdas), np.nan)
+    deviance[:betas.shape[1]] = -2 * (full_logliks - train_logliks)
+    return deviance, event[~train].sum()
+
+def cv_coxnet(X, time, event, alpha=0.5, n_folds=5, max_workers=None, seed=0, tol=1e-7, max_iter=100,
+              max_active=None, feature_names=None, **lambda_options):
+    """
+    K-fold cross-validated coxnet_path, with the folds fitted in parallel.
+    lambda_min minimizes the cross-validated deviance per event; lambda_1se is
+    the largest lambda within one standard error of it.
+    """
+    path = coxnet_path(X, time, event, alpha=alpha, tol=tol, max_iter=max_iter, max_active=max_active,
+                       feature_names=feature_names, **lambda_options)
+    X = np.asarray(X, dtype=np.float64)
+    time, event = np.asarray(time, dtype=np.float64), np.asarray(event, dtype=np.float64)
+    folds = np.random.default_rng(seed).permutation(len(time)) % n_folds
+    max_active = max_active or len(time)
+    jobs = [(X, time, event, folds != k, path.lambdas, alpha, tol, max_iter, max_active) for k in range(n_folds)]
+    if max_workers == 1:
+        results = list(map(_fold_deviance, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers or min(n_folds, os.cpu_count() or 1)) as executor:
+            results = list(executor.map(_fold_deviance, jobs))
+
+    deviance = np.array([fold_deviance / max(events, 1) for fold_deviance, events in results])
+    weights = np.array([events for _, events in results], dtype=np.float64)
+    # Folds that saturate early leave NaN for the smallest lambdas; ignore them there.
+    valid = ~np.isnan(deviance)
+    weight_sum = np.where(valid, weights[:, None], 0).sum(axis=0)
+    cv_mean = np.where(valid, deviance * weights[:, None], 0).sum(axis=0) / weight_sum
+    variance = np.where(valid, (deviance - cv_mean) ** 2 * weights[:, None], 0).sum(axis=0) / weight_sum
+    cv_se = np.sqrt(variance / np.maximum(valid.sum(axis=0) - 1, 1))
+
+    best = int(np.nanargmin(cv_mean))
+    within = np.flatnonzero(cv_mean <= cv_mean[best] + cv_se[best])
+    return CoxNetCV(path=path, cv_mean=cv_mean, cv_se=cv_se, lambda_min=path.lambdas[best],
+                    lambda_1se=path.lambdas[within.min()])
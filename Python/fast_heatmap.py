@@ -0,0 +1,242 @@
+"""
+Clustered heatmaps for large gene x sample matrices.
+
+A drop-in for the sns.clustermap call in 07_heatmap_plot.py that still
+works with tens of thousands of genes:
+
+- Linkages are cached in memory (the LINKAGE_CACHE_SIZE most recently
+  used) and optionally on disk, under a hash of
+  the matrix, the metric and the method, so re-plotting the same data with
+  other colours or annotations does not recluster it.
+- Above APPROXIMATE_MIN_ROWS rows, rows are ordered approximately: they are
+  reduced with PCA and grouped by k-means, and only the cluster centroids
+  are linked hierarchically. Rows are then ordered by centroid leaf order
+  and, within a cluster, by their first principal component. This replaces
+  the O(n^2) full linkage.
+- The matrix is drawn as one raster image instead of one vector rectangle
+  per cell. Dendrograms, colour annotations, labels and the legend stay
+  vector.
+
+The returned ClusterMap exposes .fig and the axes like seaborn's ClusterGrid,
+so suptitle/legend code written for clustermap keeps working.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
+from scipy.cluster import hierarchy
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.decomposition import PCA
+
+APPROXIMATE_MIN_ROWS = 5000
+MAX_TICK_LABELS = 100
+LINKAGE_CACHE_SIZE = 8
+_LINKAGE_CACHE = OrderedDict()
+
+@dataclass
+class ClusterMap:
+    fig: plt.Figure
+    ax_heatmap: plt.Axes
+    ax_row_dendrogram: plt.Axes
+    ax_col_dendrogram: plt.Axes
+    ax_col_colors: plt.Axes
+    ax_cbar: plt.Axes
+    row_order: np.ndarray
+    col_order: np.ndarray
+
+def standard_scale(data, axis=1):
+    """Min-max scale each column (axis=1) or row (axis=0), as seaborn's standard_scale."""
+    values = data.to_numpy(dtype=np.float64)
+    along = 0 if axis == 1 else 1
+    low = values.min(axis=along, keepdims=True)
+    span = values.max(axis=along, keepdims=True) - low
+    span[span == 0] = 1.0
+    return pd.DataFrame((values - low) / span, index=data.index, columns=data.columns)
+
+def matrix_key(values, *settings):
+    digest = hashlib.sha256(np.ascontiguousarray(values).view(np.uint8).ravel())
+    digest.update(repr((values.shape, str(values.dtype)) + settings).encode())
+    return digest.hexdigest()
+
+def cached_linkage(values, method="average", metric="euclidean", cache_dir=None):
+    """
+    hierarchy.linkage of the rows of values, memoized under the matrix hash,
+    method and metric in memory (least recently used entries are evicted
+    beyond LINKAGE_CACHE_SIZE) and, with cache_dir, on disk.
+    """
+    key = matrix_key(values, method, metric)
+    if key in _LINKAGE_CACHE:
+        _LINKAGE_CACHE.move_to_end(key)
+        return _LINKAGE_CACHE[key]
+    path = os.path.join(cache_dir, f"linkage-{key}.npy") if cache_dir is not None else None
+    if path is not None and os.path.exists(path):
+        linkage = np.load(path)
+    else:
+        linkage = hierarchy.linkage(values, method=method, metric=metric)
+        if path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+            np.save(tmp_path, linkage)
+            os.replace(tmp_path, path)
+    _LINKAGE_CACHE[key] = linkage
+    while len(_LINKAGE_CACHE) > LINKAGE_CACHE_SIZE:
+        _LINKAGE_CACHE.popitem(last=False)
+    return linkage
+
+def _leaf_order(linkage, n):
+    return hierarchy.leaves_list(linkage) if n > 1 else np.arange(n)
+
+def exact_order(values, method="average", metric="euclidean", cache_dir=None):
+    """
+    Returns (order, linkage, leaf_positions) for full hierarchical clustering of the rows.
+    """
+    if len(values) < 2:
+        return np.arange(len(values)), None, None
+    linkage = cached_linkage(values, method, metric, cache_dir)
+    order = _leaf_order(linkage, len(values))
+    positions = np.empty(len(values))
+    positions[order] = np.arange(len(values)) + 0.5
+    return order, linkage, positions
+
+def approximate_order(values, n_clusters=None, n_components=20, method="average", metric="euclidean",
+                      cache_dir=None, random_state=0):
+    """
+    Returns (order, centroid linkage, centroid positions). Rows are reduced
+    to n_components principal components and grouped into n_clusters k-means
+    clusters (default ~sqrt(n)). The centroids are linked, and rows are laid
+    out cluster by cluster in centroid leaf order, sorted by PC1 within each
+    cluster.
+    """
+    n = len(values)
+    n_clusters = min(n, n_clusters or max(2, int(np.sqrt(n))))
+    reduced = PCA(n_components=min(n_components, *values.shape), svd_solver="randomized",
+                  random_state=random_state).fit_transform(values)
+    labels = MiniBatchKMeans(n_clusters=n_clusters, n_init=3, batch_size=4096,
+                             random_state=random_state).fit_predict(reduced)
+    # Renumber the non-empty clusters 0..m-1; these are the centroid linkage's leaf ids.
+    present, cluster = np.unique(labels, return_inverse=True)
+    sizes = np.bincount(cluster)
+    centroids = np.zeros((len(present), reduced.shape[1]))
+    np.add.at(centroids, cluster, reduced)
+    centroids /= sizes[:, None]
+    linkage = cached_linkage(centroids, method, metric, cache_dir) if len(present) > 1 else None
+
+    leaves = _leaf_order(linkage, len(present)) if linkage is not None else np.arange(len(present))
+    rank = np.empty(len(present), dtype=np.int64)
+    rank[leaves] = np.arange(len(present))
+    order = np.lexsort((reduced[:, 0], rank[cluster]))
+    ends = np.cumsum(sizes[leaves])
+    centres = np.empty(len(present))
+    centres[leaves] = ends - sizes[leaves] / 2
+    return order, linkage, centres
+
+def _draw_dendrogram(ax, linkage, leaf_positions, orientation):
+    """
+    Draws a dendrogram whose leaves sit at leaf_positions (heatmap row or
+    column coordinates) as one LineCollection.
+    """
+    n = len(leaf_positions)
+    x = np.concatenate([leaf_positions, np.zeros(n - 1)])
+    height = np.concatenate([np.zeros(n), linkage[:, 2]])
+    segments = []
+    for i, (left, right, distance, _) in enumerate(linkage):
+        left, right = int(left), int(right)
+        x[n + i] = (x[left] + x[right]) / 2
+        segments.append([(x[left], height[left]), (x[left], distance), (x[right], distance), (x[right], height[right])])
+    if orientation == "left":
+        segments = [[(h, position) for position, h in segment] for segment in segments]
+    ax.add_collection(LineCollection(segments, colors="black", linewidths=0.5))
+    top = linkage[:, 2].max() if len(linkage) else 1.0
+    if orientation == "left":
+        ax.set_xlim(top * 1.05, 0)
+    else:
+        ax.set_ylim(0, top * 1.05)
+    ax.set_axis_off()
+
+def clustermap(data, cmap="vlag", standard_scale_axis=None, col_colors=None, figsize=(10, 10), row_cluster="auto",
+               col_cluster=True, method="average", metric="euclidean", cache_dir=None, dendrogram_ratio=0.2,
+               colors_ratio=0.03, random_state=0):
+    """
+    Clustered heatmap of a DataFrame (genes as rows). standard_scale_axis
+    matches clustermap's standard_scale. col_colors is a DataFrame of colours
+    indexed by the data columns, one annotation per column, as in
+    07_heatmap_plot.py. row_cluster is "exact", "approximate", "auto" (exact
+    below APPROXIMATE_MIN_ROWS rows) or False.
+    """
+    if standard_scale_axis is not None:
+        data = standard_scale(data, standard_scale_axis)
+    values = data.to_numpy(dtype=np.float64)
+    n_rows, n_cols = values.shape
+
+    if row_cluster == "auto":
+        row_cluster = "approximate" if n_rows >= APPROXIMATE_MIN_ROWS else "exact"
+    if row_cluster == "exact":
+        row_order, row_linkage, row_positions = exact_order(values, method, metric, cache_dir)
+    elif row_cluster == "approximate":
+        row_order, row_linkage, row_positions = approximate_order(values, method=method, metric=metric,
+                                                                  cache_dir=cache_dir, random_state=random_state)
+    else:
+        row_order, row_linkage, row_positions = np.arange(n_rows), None, None
+    if col_cluster:
+        col_order, col_linkage, col_positions = exact_order(values.T, method, metric, cache_dir)
+    else:
+        col_order, col_linkage, col_positions = np.arange(n_cols), None, None
+
+    fig = plt.figure(figsize=figsize)
+    n_annotations = 0 if col_colors is None else col_colors.shape[1]
+    colors_height = colors_ratio * n_annotations
+    grid = fig.add_gridspec(3, 2, width_ratios=[dendrogram_ratio, 1 - dendrogram_ratio],
+                            height_ratios=[dendrogram_ratio, max(colors_height, 1e-6), 1 - dendrogram_ratio - colors_height],
+                            wspace=0.01, hspace=0.01)
+    ax_heatmap = fig.add_subplot(grid[2, 1])
+    ax_row_dendrogram = fig.add_subplot(grid[2, 0], sharey=ax_heatmap)
+    ax_col_dendrogram = fig.add_subplot(grid[0, 1], sharex=ax_heatmap)
+    ax_col_colors = fig.add_subplot(grid[1, 1], sharex=ax_heatmap)
+    ax_cbar = fig.add_axes([0.03, 0.82, 0.03, 0.15])
+
+    ordered = values[np.ix_(row_order, col_order)]
+    # Resolved through seaborn so its palettes (e.g. the default "vlag") work
+    # as well as matplotlib's colormaps.
+    cmap = sns.color_palette(cmap, as_cmap=True) if isinstance(cmap, str) else cmap
+    image = ax_heatmap.imshow(ordered, cmap=cmap, aspect="auto", interpolation="nearest",
+                              extent=(0, n_cols, n_rows, 0))
+    fig.colorbar(image, cax=ax_cbar)
+
+    ax_heatmap.yaxis.tick_right()
+    if n_rows <= MAX_TICK_LABELS:
+        ax_heatmap.set_yticks(np.arange(n_rows) + 0.5, data.index[row_order], fontsize=8)
+    else:
+        ax_heatmap.set_yticks([])
+    ax_heatmap.set_xticks(np.arange(n_cols) + 0.5, data.columns[col_order], rotation=90, fontsize=8)
+
+    if row_linkage is not None:
+        _draw_dendrogram(ax_row_dendrogram, row_linkage, row_positions, "left")
+    else:
+        ax_row_dendrogram.set_axis_off()
+    if col_linkage is not None:
+        _draw_dendrogram(ax_col_dendrogram, col_linkage, col_positions, "top")
+    else:
+        ax_col_dendrogram.set_axis_off()
+
+    if n_annotations:
+        annotation = col_colors.reindex(data.columns[col_order])
+        rgba = np.array([[to_rgba(color) for color in annotation[name]] for name in annotation.columns])
+        ax_col_colors.imshow(rgba, aspect="auto", interpolation="nearest", extent=(0, n_cols, n_annotations, 0))
+        ax_col_colors.set_yticks(np.arange(n_annotations) + 0.5, annotation.columns, fontsize=8)
+        ax_col_colors.yaxis.tick_right()
+        # The x ticks are shared with the heatmap, so hide rather than clear them.
+        ax_col_colors.tick_params(axis="both", length=0, labelbottom=False)
+    else:
+        ax_col_colors.set_axis_off()
+    ax_heatmap.set_xlim(0, n_cols)
+    ax_heatmap.set_ylim(n_rows, 0)
+
+    return ClusterMap(fig, ax_heatmap, ax_row_dendrogram, ax_col_dendrogram, ax_col_colors, ax_cbar,
+                      np.asarray(row_order), np.asarray(col_order))
@@ -0,0 +1,188 @@
+"""
+Kaplan-Meier curves and log-rank tests for many groups in one pass.
+
+The observations are sorted once by (group, time). Every group's event
+table, survival curve, exponential Greenwood confidence interval and median
+is then computed with grouped cumulative sums over the sorted arrays, with
+no per-group Python loop. The output matches lifelines' KaplanMeierFitter,
+logrank_test (group vs rest) and multivariate_logrank_test.
+"""
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2, norm
+
+KM_COLUMNS = ["group", "time", "at_risk", "events", "censored", "survival", "ci_lower", "ci_upper"]
+
+def _grouped_cumsum(values, group_start, group_index):
+    cumulative = np.cumsum(values)
+    offsets = (cumulative - values)[group_start]
+    return cumulative - offsets[group_index]
+
+def _event_table(time, event, group):
+    """
+    Sorted per-group event table: one row per distinct (group, time) with
+    deaths, removals and the number at risk.
+    """
+    time = np.asarray(time, dtype=np.float64)
+    event = np.asarray(event).astype(bool)
+    if group is None:
+        codes, labels = np.zeros(len(time), dtype=np.int64), np.array(["all"], dtype=object)
+    else:
+        codes, labels = pd.factorize(np.asarray(group), sort=True)
+    if (codes < 0).any():
+        raise ValueError("group contains missing values.")
+
+    order = np.lexsort((time, codes))
+    time, event, codes = time[order], event[order], codes[order]
+    row_start = np.flatnonzero(np.r_[True, (time[1:] != time[:-1]) | (codes[1:] != codes[:-1])])
+    removed = np.diff(np.r_[row_start, len(time)])
+    deaths = np.add.reduceat(event.astype(np.int64), row_start)
+    times, row_codes = time[row_start], codes[row_start]
+
+    group_start = np.r_[True, row_codes[1:] != row_codes[:-1]]
+    group_index = np.cumsum(group_start) - 1
+    sizes = np.bincount(codes, minlength=len(labels))
+    removed_before = _grouped_cumsum(removed, group_start, group_index) - removed
+    at_risk = sizes[row_codes] - removed_before
+    return labels, sizes, times, row_codes, group_start, group_index, at_risk, deaths, removed
+
+def kaplan_meier(time, event, group=None, confidence=0.95):
+    """
+    Returns a tidy frame with columns KM_COLUMNS: one row per group and
+    distinct time, plus a leading time-0 row per group (as in lifelines'
+    survival_function_). ci_lower/ci_upper use the exponential Greenwood
+    ("log-log") interval that lifelines uses.
+    """
+    labels, sizes, times, codes, group_start, group_index, at_risk, deaths, removed = _event_table(time, event, group)
+
+    complete = deaths >= at_risk
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_terms = np.where(complete, 0.0, np.log1p(-deaths / at_risk))
+        greenwood_terms = np.where(complete, 0.0, deaths / (at_risk * (at_risk - deaths)))
+    # The sums run across groups, so the infinite terms are applied afterwards
+    # instead of summed (inf - inf would turn later groups into NaN).
+    exhausted = _grouped_cumsum(complete, group_start, group_index) > 0
+    survival = np.exp(_grouped_cumsum(log_terms, group_start, group_index))
+    survival[exhausted] = 0.0
+    greenwood = _grouped_cumsum(greenwood_terms, group_start, group_index)
+    greenwood[exhausted] = np.inf
+
+    z = norm.ppf(0.5 + confidence / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_survival = np.log(survival)
+        shift = z * np.sqrt(greenwood) / log_survival
+        ci_lower = np.exp(-np.exp(np.log(-log_survival) - shift))
+        ci_upper = np.exp(-np.exp(np.log(-log_survival) + shift))
+    # lifelines reports a degenerate interval of 1 before the first event and 0 after S reaches 0.
+    ci_lower = np.where(survival == 1.0, 1.0, np.where(survival == 0.0, 0.0, ci_lower))
+    ci_upper = np.where(survival == 1.0, 1.0, np.where(survival == 0.0, 0.0, ci_upper))
+
+    table = {
+        "group": codes, "time": times, "at_risk": at_risk, "events": deaths, "censored": removed - deaths,
+        "survival": survival, "ci_lower": ci_lower, "ci_upper": ci_upper
+    }
+    # Prepend S(0) = 1 for groups whose first observation is after time 0.
+    first_rows = np.flatnonzero(group_start)
+    needs_origin = first_rows[times[first_rows] > 0]
+    origin = {
+        "group": codes[needs_origin], "time": 0.0, "at_risk": sizes[codes[needs_origin]], "events": 0, "censored": 0,
+        "survival": 1.0, "ci_lower": 1.0, "ci_upper": 1.0
+    }
+    table = {column: np.insert(values, needs_origin, origin[column]) for column, values in table.items()}
+    table["group"] = labels[table["group"]]
+    return pd.DataFrame(table, columns=KM_COLUMNS)
+
+def median_survival(km):
+    """
+    Median survival time per group from a kaplan_meier() table: the first
+    time at which survival drops to 0.5 or below, inf if it never does.
+    """
+    groups = km["group"].to_numpy()
+    group_rows = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    position = np.where(km["survival"].to_numpy() <= 0.5, np.arange(len(km)), len(km))
+    first_below = np.minimum.reduceat(position, group_rows)
+    times = np.append(km["time"].to_numpy(), np.inf)
+    return pd.Series(times[first_below], index=pd.Index(groups[group_rows], name="group"), name="median")
+
+def _pooled_increments(times, codes, group_start, at_risk, deaths, removed):
+    """
+    Log-rank sums over the pooled sample. For every group row, returns the
+    increments of the cumulative pooled hazard (d/n), of c = d(n-d)/(n(n-1))
+    and of c/n over the pooled times since that group's previous row. The
+    group is at risk at a constant count throughout each increment.
+    """
+    pooled_times, pooled_index = np.unique(times, return_inverse=True)
+    pooled_deaths = np.bincount(pooled_index, weights=deaths)
+    pooled_removed = np.bincount(pooled_index, weights=removed)
+    pooled_at_risk = pooled_removed.sum() - (np.cumsum(pooled_removed) - pooled_removed)
+
+    hazard = pooled_deaths / pooled_at_risk
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = np.where(pooled_at_risk > 1,
+                     pooled_deaths * (pooled_at_risk - pooled_deaths) / (pooled_at_risk * (pooled_at_risk - 1)), 0.0)
+    cumulative = np.cumsum(np.column_stack([hazard, c, c / pooled_at_risk]), axis=0)
+    current = cumulative[pooled_index]
+    previous = np.where(group_start[:, None], 0.0, np.roll(current, 1, axis=0))
+    return pooled_times, pooled_index, hazard, c, current - previous
+
+def logrank_vs_rest(time, event, group):
+    """
+    Two-sample log-rank test of every group against all other groups pooled,
+    in one pass over the data. Returns a frame indexed by group with
+    observed, expected, variance, test_statistic and p.
+    """
+    labels, _, times, codes, group_start, _, at_risk, deaths, removed = _event_table(time, event, group)
+    _, _, _, _, increments = _pooled_increments(times, codes, group_start, at_risk, deaths, removed)
+    n_groups = len(labels)
+    observed = np.bincount(codes, weights=deaths, minlength=n_groups)
+    expected = np.bincount(codes, weights=at_risk * increments[:, 0], minlength=n_groups)
+    variance = np.bincount(codes, weights=at_risk * increments[:, 1] - at_risk ** 2 * increments[:, 2],
+                           minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        statistic = (observed - expected) ** 2 / variance
+    return pd.DataFrame({
+        "observed": observed, "expected": expected, "variance": variance,
+        "test_statistic": statistic, "p": chi2.sf(statistic, 1)
+    }, index=pd.Index(labels, name="group"))
+
+def logrank_test(time, event, group):
+    """
+    K-group log-rank test (for two groups, the usual pairwise test). Returns
+    (test_statistic, degrees_of_freedom, p). Builds a groups x event-times
+    at-risk matrix, so it is meant for tens to hundreds of groups; use
+    logrank_vs_rest for thousands.
+    """
+    labels, _, times, codes, group_start, _, at_risk, deaths, removed = _event_table(time, event, group)
+    pooled_times, pooled_index, _, c, increments = _pooled_increments(times, codes, group_start, at_risk, deaths, removed)
+    n_groups = len(labels)
+    if n_groups < 2:
+        raise ValueError("logrank_test needs at least two groups.")
+
+    # At-risk counts per group on the pooled time grid: each group row covers
+    # the pooled times after the group's previous row up to its own time.
+    start = np.where(group_start, 0, np.roll(pooled_index, 1) + 1)
+    steps = np.zeros((n_groups, len(pooled_times) + 1))
+    np.add.at(steps, (codes, start), at_risk)
+    np.add.at(steps, (codes, pooled_index + 1), -at_risk)
+    risk = np.cumsum(steps, axis=1)[:, :-1]
+    pooled_at_risk = risk.sum(axis=0)
+
+    observed = np.bincount(codes, weights=deaths, minlength=n_groups)
+    expected = np.bincount(codes, weights=at_risk * increments[:, 0], minlength=n_groups)
+    covariance = np.diag(risk @ c) - (risk * (c / pooled_at_risk)) @ risk.T
+    difference = (observed - expected)[:-1]
+    statistic = float(difference @ np.linalg.solve(covariance[:-1, :-1], difference))
+    return statistic, n_groups - 1, float(chi2.sf(statistic, n_groups - 1))
+
+def plot_survival(ax, km, group, label=None, color=None, ci_show=True, ci_alpha=0.3, **kwargs):
+    """
+    Draws one group's step curve (and CI band) from a kaplan_meier() table
+    onto ax, like KaplanMeierFitter.plot.
+    """
+    curve = km[km["group"] == group]
+    line, = ax.step(curve["time"], curve["survival"], where="post", label=label if label is not None else group,
+                    color=color, **kwargs)
+    if ci_show:
+        ax.fill_between(curve["time"], curve["ci_lower"], curve["ci_upper"], step="post", alpha=ci_alpha,
+                        color=line.get_color(), linewidth=0)
+    return line
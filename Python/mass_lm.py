@@ -0,0 +1,127 @@
+"""
+One linear model per gene against a shared design, for all genes at once.
+
+Every gene is regressed on the same n x k design matrix (intercept,
+variables of interest, covariates). The design is factorized once (QR).
+Coefficients, residual variances, standard errors, t-statistics and
+p-values for all genes then come from a few matrix products over blocks of
+genes, instead of one statsmodels OLS fit per gene. Contrasts, i.e. linear
+combinations of coefficients such as a group difference, are tested the
+same way. Benjamini-Hochberg adjustment is applied per term across genes.
+"""
+import numpy as np
+import pandas as pd
+import patsy
+from scipy import linalg
+from scipy.stats import t as t_dist
+
+RESULT_COLUMNS = ["gene", "term", "estimate", "std_error", "t", "p", "p_adjusted"]
+
+def design_matrix(design, data=None, add_intercept=True):
+    """
+    Returns the design as a DataFrame. design is either a patsy formula
+    right-hand side evaluated on data (e.g. "status + age + C(batch)"), or a
+    DataFrame of numeric columns, optionally with an added intercept.
+    """
+    if isinstance(design, str):
+        return patsy.dmatrix(design, data, return_type="dataframe", NA_action="raise")
+    matrix = pd.DataFrame(design).astype(np.float64)
+    if add_intercept and "Intercept" not in matrix.columns:
+        matrix.insert(0, "Intercept", 1.0)
+    return matrix
+
+def benjamini_hochberg(p):
+    """
+    BH-adjusted p-values along axis 0 (genes), for each column separately.
+    NaN p-values are left out of the ranking and stay NaN.
+    """
+    p = np.asarray(p, dtype=np.float64)
+    flat = p.ndim == 1
+    p = p[:, None] if flat else p
+    adjusted = np.full_like(p, np.nan)
+    for column in range(p.shape[1]):
+        valid = np.flatnonzero(~np.isnan(p[:, column]))
+        order = valid[np.argsort(p[valid, column])]
+        ranked = p[order, column] * len(valid) / np.arange(1, len(valid) + 1)
+        adjusted[order, column] = np.minimum(np.minimum.accumulate(ranked[::-1])[::-1], 1.0)
+    return adjusted[:, 0] if flat else adjusted
+
+def _contrast_matrix(contrasts, columns):
+    names, rows = [], []
+    for name, weights in (contrasts or {}).items():
+        if isinstance(weights, dict):
+            unknown = set(weights) - set(columns)
+            if unknown:
+                raise ValueError(f"Contrast '{name}' uses unknown design columns {sorted(unknown)}.")
+            weights = [weights.get(column, 0.0) for column in columns]
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.shape != (len(columns),):
+            raise ValueError(f"Contrast '{name}' needs {len(columns)} weights, one per design column.")
+        names.append(name)
+        rows.append(weights)
+    return names, np.array(rows).reshape(len(rows), len(columns))
+
+def fit_genes(expression, design, data=None, contrasts=None, terms=None, adjust=True, add_intercept=True,
+              block_size=8192):
+    """
+    Fits expression[:, g] ~ design for every gene g.
+
+    expression is samples x genes (a DataFrame, whose columns name the
+    genes, or an array, possibly memory-mapped); it must have no missing
+    values. contrasts maps a name to weights over the design columns, given
+    either as a list or as a {column: weight} dict. terms limits the reported
+    design columns (all by default). Returns a long frame with
+    RESULT_COLUMNS: one row per gene and term or contrast.
+    """
+    X = design_matrix(design, data, add_intercept)
+    genes = list(expression.columns) if isinstance(expression, pd.DataFrame) else [f"Gene{g + 1}" for g in range(expression.shape[1])]
+    Y = expression.to_numpy(dtype=np.float64) if isinstance(expression, pd.DataFrame) else expression
+    n, k = X.shape
+    if Y.shape[0] != n:
+        raise ValueError(f"expression has {Y.shape[0]} samples but the design has {n} rows.")
+    residual_df = n - k
+    if residual_df <= 0:
+        raise ValueError(f"The design has {k} columns for {n} samples; no residual degrees of freedom remain.")
+
+    Q, R = linalg.qr(X.to_numpy(), mode="economic")
+    if np.min(np.abs(np.diag(R))) < 1e-10 * np.max(np.abs(np.diag(R))):
+        raise ValueError("The design matrix is rank deficient.")
+    R_inverse = linalg.solve_triangular(R, np.eye(k))
+    unscaled_covariance = R_inverse @ R_inverse.T
+
+    terms = list(X.columns) if terms is None else list(terms)
+    term_index = [list(X.columns).index(term) for term in terms]
+    contrast_names, C = _contrast_matrix(contrasts, list(X.columns))
+    # Each reported row is a linear combination of coefficients: unit vectors for terms, then contrasts.
+    L = np.vstack([np.eye(k)[term_index], C])
+    scale = np.sqrt(np.einsum("ij,jk,ik->i", L, unscaled_covariance, L))
+
+    n_genes = Y.shape[1]
+    estimate = np.empty((len(L), n_genes))
+    sigma = np.empty(n_genes)
+    for start in range(0, n_genes, block_size):
+        block = np.asarray(Y[:, start:start + block_size], dtype=np.float64)
+        projected = Q.T @ block
+        coefficients = linalg.solve_triangular(R, projected)
+        residual = block - Q @ projected
+        estimate[:, start:start + block.shape[1]] = L @ coefficients
+        sigma[start:start + block.shape[1]] = np.sqrt(np.einsum("ij,ij->j", residual, residual) / residual_df)
+    if np.isnan(sigma).any():
+        raise ValueError("expression contains missing values.")
+
+    std_error = scale[:, None] * sigma[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_values = estimate / std_error
+    p_values = 2 * t_dist.sf(np.abs(t_values), residual_df)
+    p_adjusted = benjamini_hochberg(p_values.T).T if adjust else np.full_like(p_values, np.nan)
+
+    labels = terms + contrast_names
+    return pd.DataFrame({
+        "gene": np.tile(genes, len(labels)),
+        "term": np.repeat(labels, n_genes),
+        "estimate": estimate.ravel(),
+        "std_error": std_error.ravel(),
+        "t": t_values.ravel(),
+        "p": p_values.ravel(),
+        "p_adjusted": p_adjusted.ravel()
+    }, columns=RESULT_COLUMNS)
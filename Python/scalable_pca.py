@@ -0,0 +1,188 @@
+"""
+PCA for expression matrices that are large, on disk or sparse.
+
+run_pca returns the pca_df / explained-variance structure that 14_PCA.py
+uses, whichever mode computes it:
+
+    exact        sklearn PCA with a full SVD (small in-memory matrices)
+    randomized   sklearn PCA with randomized SVD (large in-memory matrices)
+    incremental  IncrementalPCA over row blocks streamed from an array,
+                 a memory-mapped .npy file or a Parquet file; only one block
+                 is in memory at a time
+    sparse       truncated SVD of the implicitly centered scipy.sparse
+                 matrix, so it is never densified
+
+Rows are samples (or cells) and columns are genes, as in expr_df.
+"""
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, svds
+from sklearn.decomposition import PCA, IncrementalPCA
+
+MODES = ("auto", "exact", "randomized", "incremental", "sparse")
+# Above this many matrix entries, auto mode switches exact SVD for randomized SVD.
+RANDOMIZED_MIN_ENTRIES = 10_000_000
+
+@dataclass
+class PCAResult:
+    pca_df: pd.DataFrame  # scores, columns PC1..PCk, indexed like the input rows
+    explained_variance_: np.ndarray
+    explained_variance_ratio_: np.ndarray
+    components_: np.ndarray  # k x genes loadings
+    mean_: np.ndarray
+
+def _flip_signs(components, scores):
+    # Deterministic signs (largest absolute loading positive), as sklearn does.
+    signs = np.sign(components[np.arange(len(components)), np.argmax(np.abs(components), axis=1)])
+    signs[signs == 0] = 1
+    return components * signs[:, None], scores * signs
+
+def _is_file(data):
+    return isinstance(data, (str, os.PathLike))
+
+def _as_float(block):
+    # Keep float32 input as float32 (IncrementalPCA preserves it); promote everything else.
+    block = np.asarray(block)
+    return block if block.dtype in (np.float32, np.float64) else block.astype(np.float64)
+
+def _npy_blocks(path, batch_size):
+    """
+    Reads a C-order .npy file block by block with plain reads. Unlike a
+    memory map, the pages read do not stay mapped, so RSS stays at one block.
+    """
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        shape, fortran_order, dtype = read_header(f)
+        if fortran_order or len(shape) != 2:
+            yield from _array_blocks(np.load(path, mmap_mode="r"), batch_size)
+            return
+        for start in range(0, shape[0], batch_size):
+            rows = min(batch_size, shape[0] - start)
+            yield None, _as_float(np.fromfile(f, dtype=dtype, count=rows * shape[1]).reshape(rows, shape[1]))
+
+def _array_blocks(array, batch_size):
+    labels = array.index.to_numpy() if isinstance(array, pd.DataFrame) else None
+    values = array.to_numpy() if isinstance(array, pd.DataFrame) else array
+    for start in range(0, values.shape[0], batch_size):
+        yield (labels[start:start + batch_size] if labels is not None else None,
+               _as_float(values[start:start + batch_size]))
+
+def _row_blocks(data, batch_size, index_column=None):
+    """
+    Yields (row labels or None, float block) for an array, a .npy path, or a
+    Parquet file or directory of Parquet files.
+    """
+    if not _is_file(data):
+        yield from _array_blocks(data, batch_size)
+    elif str(data).endswith(".npy"):
+        yield from _npy_blocks(data, batch_size)
+    else:
+        yield from _parquet_blocks(data, batch_size, index_column)
+
+def _parquet_blocks(path, batch_size, index_column):
+    """
+    Reads Parquet row batches one file at a time, straight into NumPy (no
+    pandas frame). Parquet decodes a whole row group at once, so peak
+    memory follows the files' row-group size.
+    """
+    import pyarrow.parquet as pq
+
+    files = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".parquet")) \
+        if os.path.isdir(path) else [path]
+    for file in files:
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=batch_size, use_threads=False):
+            names = batch.schema.names
+            labels = batch.column(names.index(index_column)).to_numpy(zero_copy_only=False) if index_column is not None else None
+            # pandas stores a non-default index as __index_level_N__; it is not a gene.
+            columns = [batch.column(i).to_numpy() for i, name in enumerate(names)
+                       if name != index_column and not name.startswith("__index_level_")]
+            yield labels, _as_float(np.column_stack(columns))
+
+def _incremental(data, n_components, batch_size, index_column):
+    model = IncrementalPCA(n_components=n_components)
+    # IncrementalPCA needs at least n_components rows per partial fit, so a short
+    # final block is merged into the one before it.
+    previous = None
+    for _, block in _row_blocks(data, batch_size, index_column):
+        if previous is not None and block.shape[0] < n_components:
+            previous = np.vstack([previous, block])
+            continue
+        if previous is not None:
+            model.partial_fit(previous)
+        previous = block
+    if previous is None or previous.shape[0] < n_components:
+        raise ValueError(f"Incremental PCA needs at least {n_components} rows.")
+    model.partial_fit(previous)
+
+    labels, scores = [], []
+    for block_labels, block in _row_blocks(data, batch_size, index_column):
+        scores.append(model.transform(block))
+        if block_labels is not None:
+            labels.append(block_labels)
+    index = np.concatenate(labels) if labels else None
+    return (model.components_, np.vstack(scores), model.explained_variance_, model.explained_variance_ratio_,
+            model.mean_, index)
+
+def _sparse(matrix, n_components, random_state):
+    matrix = sparse.csr_matrix(matrix, dtype=np.float64)
+    n_rows, n_columns = matrix.shape
+    mean = np.asarray(matrix.mean(axis=0)).ravel()
+    centered = LinearOperator(
+        (n_rows, n_columns), dtype=np.float64,
+        matvec=lambda v: matrix @ v - mean @ v,
+        rmatvec=lambda u: matrix.T @ u - mean * u.sum(),
+        matmat=lambda V: matrix @ V - mean @ V,
+        rmatmat=lambda U: matrix.T @ U - np.outer(mean, U.sum(axis=0))
+    )
+    v0 = np.random.default_rng(random_state).uniform(-1, 1, min(n_rows, n_columns))
+    u, s, vt = svds(centered, k=n_components, v0=v0)
+    order = np.argsort(s)[::-1]
+    u, s, vt = u[:, order], s[order], vt[order]
+
+    explained_variance = s ** 2 / (n_rows - 1)
+    squared_mean = np.asarray(matrix.multiply(matrix).mean(axis=0)).ravel()
+    total_variance = np.sum(squared_mean - mean ** 2) * n_rows / (n_rows - 1)
+    return vt, u * s, explained_variance, explained_variance / total_variance, mean
+
+def choose_mode(data):
+    if sparse.issparse(data):
+        return "sparse"
+    if _is_file(data) or isinstance(data, np.memmap):
+        return "incremental"
+    return "randomized" if np.prod(np.shape(data)) > RANDOMIZED_MIN_ENTRIES else "exact"
+
+def run_pca(data, n_components=2, mode="auto", batch_size=10_000, index_column=None, random_state=0):
+    """
+    Runs PCA on data: a DataFrame or array, a scipy.sparse matrix, or a
+    path to a .npy or .parquet file (samples as rows). index_column names
+    the Parquet column that holds row labels. Returns a PCAResult whose
+    pca_df is indexed by the row labels when the input has them.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown PCA mode '{mode}'; expected one of {MODES}.")
+    mode = choose_mode(data) if mode == "auto" else mode
+    index = data.index if isinstance(data, pd.DataFrame) else None
+
+    if mode == "incremental":
+        components, scores, variance, ratio, mean, file_index = _incremental(data, n_components, batch_size, index_column)
+        index = file_index if file_index is not None else index
+    elif mode == "sparse":
+        if not sparse.issparse(data):
+            raise ValueError("mode='sparse' needs a scipy.sparse matrix.")
+        components, scores, variance, ratio, mean = _sparse(data, n_components, random_state)
+    else:
+        if sparse.issparse(data) or _is_file(data):
+            raise ValueError(f"mode='{mode}' needs an in-memory dense matrix.")
+        model = PCA(n_components=n_components, svd_solver="full" if mode == "exact" else "randomized",
+                    random_state=random_state)
+        scores = model.fit_transform(data)
+        components, variance, ratio, mean = model.components_, model.explained_variance_, model.explained_variance_ratio_, model.mean_
+
+    components, scores = _flip_signs(components, scores)
+    pca_df = pd.DataFrame(scores, columns=[f"PC{i + 1}" for i in range(n_components)], index=index)
+    return PCAResult(pca_df, variance, ratio, components, mean)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The scripts and modules in Python/ import each other by their flat names
+# (e.g. "from km_engine import kaplan_meier"); tests render headless.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("MPLBACKEND", "Agg")
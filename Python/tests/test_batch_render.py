@@ -0,0 +1,75 @@
+import os
+import re
+import tempfile
+import unittest
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from batch_render import RenderJob, forest_plot, render, render_pdf
+from theme import PUBLICATION
+
+def forest_table(seed):
+    rng = np.random.default_rng(seed)
+    hazard_ratio = np.exp(rng.normal(size=6))
+    return pd.DataFrame({"Predictor": [f"Gene{i + 1}" for i in range(6)], "HazardRatio": hazard_ratio,
+                         "LowerCI": hazard_ratio * 0.7, "UpperCI": hazard_ratio * 1.4})
+
+def scatter_table(seed, n=300):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.normal(size=n), "y": rng.normal(size=n), "category": rng.choice(["A", "B"], n)})
+
+def titled_forest(ax, data):
+    # Adds figure-level artists that must not leak into the worker's next job.
+    forest_plot(ax, data)
+    ax.figure.suptitle("Cohorts")
+    ax.figure.text(0.01, 0.01, "note")
+    ax.figure.add_axes([0.8, 0.8, 0.1, 0.1])
+
+def pyplot_png(job, path, dpi):
+    # The reference: a fresh pyplot figure per job, as the numbered scripts draw them.
+    with matplotlib.rc_context(PUBLICATION):
+        fig, ax = plt.subplots(figsize=job.figsize, dpi=dpi)
+        forest_plot(ax, job.data)
+        ax.set_title(job.title)
+        fig.savefig(path, dpi=dpi)
+        plt.close(fig)
+    return plt.imread(path)
+
+class TestBatchRender(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_render_matches_pyplot(self):
+        # One worker, so the forest jobs run right after one that adds figure-level artists.
+        jobs = [RenderJob("scatter", scatter_table(0), output=self.path("scatter.png"), figsize=(4, 3))]
+        jobs += [RenderJob(titled_forest, forest_table(9), output=self.path("titled.png"))]
+        jobs += [RenderJob("forest", forest_table(seed), output=self.path(f"forest{seed}.png"), title=f"Cohort {seed}")
+                 for seed in range(2)]
+        self.assertEqual(render(jobs, max_workers=1, dpi=50), [job.output for job in jobs])
+        self.assertEqual(plt.imread(jobs[0].output).shape[:2], (150, 200))
+        for job in jobs[2:]:
+            expected = pyplot_png(job, self.path("expected.png"), 50)
+            np.testing.assert_array_equal(plt.imread(job.output), expected)
+
+    def test_render_rejects_jobs_without_output(self):
+        with self.assertRaisesRegex(ValueError, "no output path"):
+            render([RenderJob("forest", forest_table(0))], max_workers=1)
+
+    def test_render_pdf_pages(self):
+        jobs = [RenderJob("forest", forest_table(seed), title=f"Cohort {seed}") for seed in range(5)]
+        jobs.append(RenderJob("volcano", pd.DataFrame({"logFC": [-3.0, 0.5, 2.0], "pvalue": [1e-4, 0.5, 1e-3]})))
+        path = render_pdf(jobs, self.path("report.pdf"), max_workers=2, dpi=50)
+        with open(path, "rb") as f:
+            pages = re.findall(rb"/Type\s*/Page\b", f.read())
+        self.assertEqual(len(pages), len(jobs))
+        self.assertEqual(os.listdir(self.tmpdir.name), ["report.pdf"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import tempfile
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from lifelines import CoxPHFitter
+from cox_batch import fit_cohorts
+
+def simulate_cohorts(n_cohorts=3, n_patients=150, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for cohort in range(n_cohorts):
+        x = rng.normal(size=(n_patients, 2))
+        hazard = 0.1 * np.exp(x @ np.array([0.7, -0.4 * cohort]))
+        frames.append(pd.DataFrame({
+            "cohort": f"C{cohort}",
+            "Age": x[:, 0],
+            "Stage": x[:, 1],
+            "time": rng.exponential(1 / hazard),
+            "status": rng.integers(0, 2, n_patients)
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+class TestCoxBatch(unittest.TestCase):
+    def setUp(self):
+        self.df = simulate_cohorts()
+
+    def assert_matches_lifelines(self, table):
+        for name, cohort in self.df.groupby("cohort"):
+            cph = CoxPHFitter().fit(cohort.drop(columns="cohort"), duration_col="time", event_col="status")
+            expected = cph.summary.sort_values("exp(coef)")
+            rows = table[table["cohort"] == name]
+            self.assertEqual(list(rows["Predictor"]), list(expected.index))
+            np.testing.assert_allclose(rows["HazardRatio"], expected["exp(coef)"], rtol=1e-6)
+            np.testing.assert_allclose(rows["LowerCI"], expected["exp(coef) lower 95%"], rtol=1e-6)
+            np.testing.assert_allclose(rows["UpperCI"], expected["exp(coef) upper 95%"], rtol=1e-6)
+            np.testing.assert_allclose(rows["p"], expected["p"], rtol=1e-6)
+
+    def test_matches_lifelines_per_cohort(self):
+        self.assert_matches_lifelines(fit_cohorts(self.df, "cohort", max_workers=1))
+        self.assert_matches_lifelines(fit_cohorts(self.df, "cohort", max_workers=2))
+
+    def test_cache_reuses_unchanged_cohorts(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = fit_cohorts(self.df, "cohort", max_workers=1, cache_dir=cache_dir)
+            pd.testing.assert_frame_equal(fit_cohorts(self.df, "cohort", max_workers=1, cache_dir=cache_dir), first)
+            changed = self.df.copy()
+            changed.loc[changed["cohort"] == "C1", "time"] *= 2
+            table = fit_cohorts(changed, "cohort", max_workers=1, cache_dir=cache_dir)
+            pd.testing.assert_frame_equal(table[table["cohort"] != "C1"], first[first["cohort"] != "C1"])
+
+    def test_failing_cohort_is_skipped(self):
+        df = self.df.copy()
+        df.loc[df["cohort"] == "C2", "status"] = 0
+        df.loc[df["cohort"] == "C2", "Age"] = np.nan
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            table = fit_cohorts(df, "cohort", max_workers=1)
+        self.assertEqual(sorted(table["cohort"].unique()), ["C0", "C1"])
+        self.assertTrue(any("cohort='C2'" in str(warning.message) for warning in caught))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+from lifelines import CoxPHFitter
+from coxnet import coxnet_path, cv_coxnet, lambda_sequence
+
+def simulate(n_samples=120, n_genes=6, seed=0):
+    # Continuous times have no ties, where Breslow (coxnet) and Efron (lifelines) agree.
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n_samples, n_genes)) * rng.uniform(0.5, 3, n_genes),
+                     columns=[f"Gene{j + 1}" for j in range(n_genes)])
+    hazard = 0.1 * np.exp(X.iloc[:, :3].to_numpy() @ np.array([0.5, -0.3, 0.2]))
+    return X, rng.exponential(1 / hazard), rng.integers(0, 2, n_samples) | (rng.random(n_samples) < 0.5)
+
+class TestCoxNet(unittest.TestCase):
+    def setUp(self):
+        self.X, self.time, self.event = simulate()
+        self.data = self.X.assign(time=self.time, status=self.event.astype(int))
+
+    def lifelines_coef(self, **options):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            cph = CoxPHFitter(**options).fit(self.data, duration_col="time", event_col="status")
+        return cph.params_.to_numpy()
+
+    def test_unpenalized_limit_matches_lifelines(self):
+        path = coxnet_path(self.X, self.time, self.event, alpha=1.0, lambdas=[1e-9], tol=1e-12)
+        np.testing.assert_allclose(path.coef.toarray()[:, 0], self.lifelines_coef(), rtol=1e-4, atol=1e-6)
+
+    def test_ridge_matches_lifelines(self):
+        # lifelines standardizes with the sample (ddof=1) standard deviation, coxnet with ddof=0.
+        n = len(self.time)
+        for lam in (0.01, 0.1):
+            path = coxnet_path(self.X, self.time, self.event, alpha=0.0, lambdas=[lam], tol=1e-12)
+            expected = self.lifelines_coef(penalizer=lam * (n - 1) / n, l1_ratio=0.0)
+            np.testing.assert_allclose(path.coef.toarray()[:, 0], expected, rtol=1e-4, atol=1e-6)
+
+    def test_lambda_sequence_starts_at_the_null_model(self):
+        lambdas = lambda_sequence(self.X, self.time, self.event, alpha=0.5, n_lambdas=20)
+        path = coxnet_path(self.X, self.time, self.event, alpha=0.5, lambdas=lambdas)
+        np.testing.assert_array_equal(path.lambdas, lambdas)
+        self.assertEqual(path.n_active[0], 0)
+        self.assertGreater(path.n_active[1], 0)
+        self.assertTrue(np.all(np.diff(path.deviance_ratio) >= -1e-9))
+
+    def test_cross_validation_selects_the_signal_genes(self):
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(120, 100))
+        time = rng.exponential(1 / (0.1 * np.exp(X[:, :3] @ np.array([1.5, -1.0, 0.8]))))
+        cv = cv_coxnet(X, time, rng.random(120) < 0.7, alpha=0.5, n_folds=5, max_workers=1,
+                       feature_names=[f"Gene{j + 1}" for j in range(100)], n_lambdas=20, lambda_min_ratio=0.05)
+        self.assertGreaterEqual(cv.lambda_1se, cv.lambda_min)
+        self.assertTrue({"Gene1", "Gene2", "Gene3"} <= set(cv.path.coefficients(cv.lambda_1se).index))
+
+if __name__ == "__main__":
+    unittest.main()
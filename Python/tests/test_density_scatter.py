@@ -0,0 +1,74 @@
+import unittest
+import matplotlib.pyplot as plt
+import numpy as np
+from density_scatter import DENSITY_MIN_POINTS, density_image, density_scatter
+
+PALETTE = {"Up": "red", "Down": "blue"}
+
+def points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(0.5, 0.15, n), rng.normal(0.5, 0.15, n), rng.choice(list(PALETTE), n)
+
+def agg_scatter(x, y, hue, shape, dpi, alpha):
+    # The reference: the same markers drawn one by one by Agg on a transparent
+    # canvas of exactly shape pixels.
+    fig = plt.figure(figsize=(shape[1] / dpi, shape[0] / dpi), dpi=dpi)
+    fig.patch.set_alpha(0)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.scatter(x, y, c=[PALETTE[key] for key in hue], s=30, alpha=alpha, edgecolors="black",
+               linewidths=0.08 * np.sqrt(30))
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba())[::-1] / 255
+    plt.close(fig)
+    return image
+
+class TestDensityScatter(unittest.TestCase):
+    def tearDown(self):
+        plt.close("all")
+
+    def test_density_image_matches_agg(self):
+        shape, dpi = (300, 400), 100
+        for n, alpha in ((200, 1.0), (3000, 0.8)):
+            x, y, hue = points(n)
+            expected = agg_scatter(x, y, hue, shape, dpi, alpha)
+            image = density_image(x, y, hue, PALETTE, (0, 1), (0, 1), shape, dpi, s=30, alpha=alpha)
+            self.assertEqual(image.shape, shape + (4,))
+            self.assertAlmostEqual(image[..., 3].sum() / expected[..., 3].sum(), 1, delta=0.1)
+            self.assertLess(np.abs(image[..., 3] - expected[..., 3]).mean(), 0.05)
+            premultiplied = np.abs(image[..., :3] * image[..., 3:] - expected[..., :3] * expected[..., 3:])
+            self.assertLess(premultiplied.mean(), 0.06)
+
+    def test_overlapping_markers_compound_opacity(self):
+        image = density_image(np.full(3, 0.5), np.full(3, 0.5), np.array(["Up"] * 3), PALETTE, (0, 1), (0, 1),
+                              (100, 100), 100, alpha=0.5, edgecolor=None)
+        self.assertAlmostEqual(image[50, 50, 3], 1 - 0.5 ** 3)
+        np.testing.assert_allclose(image[50, 50, :3], [1, 0, 0])
+        self.assertEqual(image[0, 0, 3], 0)
+
+    def test_modes(self):
+        x, y, hue = points(DENSITY_MIN_POINTS + 10)
+        highlight = np.zeros(len(x), dtype=bool)
+        highlight[:10] = True
+        for mode, n_images, n_markers in (("vector", 0, len(x)), ("density", 1, 10), ("auto", 1, 10)):
+            fig, ax = plt.subplots()
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            density_scatter(ax, x, y, hue, PALETTE, highlight=highlight, mode=mode, dpi=50)
+            self.assertEqual(len(ax.images), n_images)
+            self.assertEqual(len(ax.collections[0].get_offsets()), n_markers)
+            self.assertEqual((ax.get_xlim(), ax.get_ylim()), ((0, 1), (0, 1)))
+
+        fig, ax = plt.subplots()
+        density_scatter(ax, x[:100], y[:100], hue[:100], PALETTE)
+        self.assertEqual(len(ax.images), 0)
+        with self.assertRaisesRegex(ValueError, "Unknown mode"):
+            density_scatter(ax, x, y, hue, PALETTE, mode="raster")
+        ax.set_yscale("log")
+        with self.assertRaisesRegex(ValueError, "linear"):
+            density_scatter(ax, x, y, hue, PALETTE, mode="density")
+
+if __name__ == "__main__":
+    unittest.main()
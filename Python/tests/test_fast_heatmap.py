@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+import fast_heatmap
+from fast_heatmap import approximate_order, cached_linkage, clustermap, standard_scale
+
+def expression(n_genes=60, n_samples=12, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=(n_genes, n_samples))
+    values[: n_genes // 2, : n_samples // 2] += 3.0
+    return pd.DataFrame(values, index=[f"Gene{i + 1}" for i in range(n_genes)],
+                        columns=[f"Sample{j + 1}" for j in range(n_samples)])
+
+class TestFastHeatmap(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.df = expression()
+        fast_heatmap._LINKAGE_CACHE.clear()
+
+    def tearDown(self):
+        plt.close("all")
+        self.tmpdir.cleanup()
+
+    def test_standard_scale_matches_seaborn(self):
+        for axis in (0, 1):
+            pd.testing.assert_frame_equal(standard_scale(self.df, axis),
+                                          sns.matrix.ClusterGrid.standard_scale(self.df, axis))
+
+    def test_exact_orders_match_seaborn(self):
+        grid = sns.clustermap(self.df, method="average", metric="euclidean", standard_scale=1)
+        result = clustermap(self.df, standard_scale_axis=1, row_cluster="exact", cache_dir=self.tmpdir.name)
+        np.testing.assert_array_equal(result.row_order, grid.dendrogram_row.reordered_ind)
+        np.testing.assert_array_equal(result.col_order, grid.dendrogram_col.reordered_ind)
+        np.testing.assert_allclose(result.ax_heatmap.images[0].get_array(), grid.data2d.to_numpy())
+        self.assertEqual(result.ax_heatmap.images[0].get_cmap().name, "vlag")
+
+    def test_approximate_order_keeps_clusters_together(self):
+        values = self.df.to_numpy()
+        order, linkage, centres = approximate_order(values, n_clusters=2)
+        self.assertEqual(sorted(order), list(range(len(values))))
+        self.assertEqual(len(centres), 2)
+        # The two planted gene groups each land in one contiguous block.
+        blocks = (order < len(values) // 2).astype(int)
+        self.assertEqual(np.count_nonzero(np.diff(blocks)), 1)
+
+    def test_linkage_cache(self):
+        values = self.df.to_numpy()
+        linkage = cached_linkage(values, cache_dir=self.tmpdir.name)
+        self.assertEqual(len(os.listdir(self.tmpdir.name)), 1)
+        fast_heatmap._LINKAGE_CACHE.clear()
+        np.testing.assert_array_equal(cached_linkage(values, cache_dir=self.tmpdir.name), linkage)
+
+        for shift in range(fast_heatmap.LINKAGE_CACHE_SIZE + 3):
+            cached_linkage(values + shift)
+        self.assertEqual(len(fast_heatmap._LINKAGE_CACHE), fast_heatmap.LINKAGE_CACHE_SIZE)
+
+if __name__ == "__main__":
+    unittest.main()
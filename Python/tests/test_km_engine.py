@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import pandas as pd
+from lifelines import KaplanMeierFitter
+from lifelines.statistics import logrank_test as lifelines_logrank_test, multivariate_logrank_test
+from km_engine import kaplan_meier, logrank_test, logrank_vs_rest, median_survival
+
+def simulate_groups(seed=0):
+    """
+    Three groups: integer times with many ties, heavy censoring with a
+    censored last observation, and one whose last observation is an event
+    (survival drops to zero; sorted between the others).
+    """
+    rng = np.random.default_rng(seed)
+    tied_time = rng.integers(1, 8, 60).astype(float)
+    censored_time = rng.exponential(10, 50)
+    exhausted_time = np.r_[rng.exponential(5, 29), 40.0]
+    frames = [
+        pd.DataFrame({"group": "tied", "time": tied_time, "status": rng.integers(0, 2, 60)}),
+        pd.DataFrame({"group": "censored", "time": censored_time,
+                      "status": np.r_[rng.random(49) < 0.3, False].astype(int)}),
+        pd.DataFrame({"group": "exhausted", "time": exhausted_time, "status": np.r_[rng.integers(0, 2, 29), 1]}),
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+class TestKaplanMeier(unittest.TestCase):
+    def setUp(self):
+        self.df = simulate_groups()
+        self.km = kaplan_meier(self.df["time"], self.df["status"], self.df["group"])
+
+    def test_matches_kaplan_meier_fitter(self):
+        for name, cohort in self.df.groupby("group"):
+            kmf = KaplanMeierFitter().fit(cohort["time"], cohort["status"])
+            curve = self.km[self.km["group"] == name].set_index("time")
+            expected = kmf.survival_function_.join(kmf.confidence_interval_).join(kmf.event_table)
+            self.assertEqual(list(curve.index), list(expected.index))
+            np.testing.assert_allclose(curve["survival"], expected["KM_estimate"], atol=1e-12)
+            np.testing.assert_allclose(curve["ci_lower"], expected["KM_estimate_lower_0.95"], atol=1e-10)
+            np.testing.assert_allclose(curve["ci_upper"], expected["KM_estimate_upper_0.95"], atol=1e-10)
+            self.assertEqual(list(curve["at_risk"]), list(expected["at_risk"]))
+            self.assertEqual(list(curve["events"]), list(expected["observed"]))
+            self.assertEqual(list(curve["censored"]), list(expected["censored"]))
+            self.assertEqual(median_survival(self.km)[name], kmf.median_survival_time_)
+
+    def test_zero_survival_group(self):
+        curve = self.km[self.km["group"] == "exhausted"]
+        self.assertEqual(curve["survival"].iloc[-1], 0.0)
+        self.assertEqual((curve["ci_lower"].iloc[-1], curve["ci_upper"].iloc[-1]), (0.0, 0.0))
+        # Groups sorted after an exhausted group are unaffected.
+        self.assertFalse(self.km[["survival", "ci_lower", "ci_upper"]].isna().any(axis=None))
+
+    def test_logrank_matches_lifelines(self):
+        statistic, degrees_of_freedom, p = logrank_test(self.df["time"], self.df["status"], self.df["group"])
+        expected = multivariate_logrank_test(self.df["time"], self.df["group"], self.df["status"])
+        self.assertAlmostEqual(statistic, expected.test_statistic, places=8)
+        self.assertEqual(degrees_of_freedom, 2)
+        self.assertAlmostEqual(p, expected.p_value, places=10)
+
+        vs_rest = logrank_vs_rest(self.df["time"], self.df["status"], self.df["group"])
+        for name in vs_rest.index:
+            inside = self.df["group"] == name
+            expected = lifelines_logrank_test(self.df.loc[inside, "time"], self.df.loc[~inside, "time"],
+                                              self.df.loc[inside, "status"], self.df.loc[~inside, "status"])
+            self.assertAlmostEqual(vs_rest.loc[name, "test_statistic"], expected.test_statistic, places=8)
+            self.assertAlmostEqual(vs_rest.loc[name, "p"], expected.p_value, places=10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from statsmodels.stats.multitest import multipletests
+from mass_lm import benjamini_hochberg, fit_genes
+
+class TestMassLm(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n_samples, n_genes = 60, 40
+        self.data = pd.DataFrame({
+            "status": rng.integers(0, 2, n_samples),
+            "time": rng.exponential(10, n_samples),
+            "batch": rng.choice(["a", "b", "c"], n_samples)
+        })
+        signal = np.outer(np.log(self.data["time"]), rng.normal(0, 1, n_genes))
+        self.expression = pd.DataFrame(signal + rng.normal(size=(n_samples, n_genes)),
+                                       columns=[f"Gene{g + 1}" for g in range(n_genes)])
+
+    def test_matches_statsmodels_per_gene(self):
+        formula = "status + np.log(time) + C(batch)"
+        results = fit_genes(self.expression, formula, data=self.data,
+                            contrasts={"b_vs_c": {"C(batch)[T.b]": 1, "C(batch)[T.c]": -1}})
+        results = results.set_index(["gene", "term"])
+        for gene in self.expression.columns:
+            fit = sm.OLS.from_formula(f"{gene} ~ {formula}", self.expression.join(self.data)).fit()
+            for term in fit.params.index:
+                row = results.loc[(gene, term)]
+                np.testing.assert_allclose(row[["estimate", "std_error", "t", "p"]],
+                                           [fit.params[term], fit.bse[term], fit.tvalues[term], fit.pvalues[term]],
+                                           rtol=1e-8)
+            contrast = fit.t_test("C(batch)[T.b] - C(batch)[T.c] = 0")
+            np.testing.assert_allclose(results.loc[(gene, "b_vs_c"), ["estimate", "p"]],
+                                       [contrast.effect[0], contrast.pvalue], rtol=1e-8)
+
+    def test_benjamini_hochberg_matches_statsmodels(self):
+        p = np.random.default_rng(1).uniform(size=200) ** 3
+        np.testing.assert_allclose(benjamini_hochberg(p), multipletests(p, method="fdr_bh")[1])
+        p[[3, 50]] = np.nan
+        adjusted = benjamini_hochberg(p)
+        self.assertTrue(np.isnan(adjusted[[3, 50]]).all())
+        valid = ~np.isnan(p)
+        np.testing.assert_allclose(adjusted[valid], multipletests(p[valid], method="fdr_bh")[1])
+
+    def test_rejects_designs_without_residual_degrees_of_freedom(self):
+        with self.assertRaisesRegex(ValueError, "residual degrees of freedom"):
+            fit_genes(self.expression.iloc[:3], "status + np.log(time) + C(batch)", data=self.data.iloc[:3])
+
+if __name__ == "__main__":
+    unittest.main()
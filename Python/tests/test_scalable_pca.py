@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.decomposition import PCA
+from scalable_pca import choose_mode, run_pca
+
+def low_rank(n_samples=300, n_genes=80, seed=0):
+    # Three well separated components, so every solver finds the same subspace.
+    rng = np.random.default_rng(seed)
+    scores = rng.normal(size=(n_samples, 3)) * np.array([10.0, 5.0, 2.5])
+    values = scores @ rng.normal(size=(3, n_genes)) + 0.1 * rng.normal(size=(n_samples, n_genes)) + 5.0
+    return pd.DataFrame(values, index=[f"Sample{i + 1}" for i in range(n_samples)],
+                        columns=[f"Gene{j + 1}" for j in range(n_genes)])
+
+def reference(values, n_components=3):
+    model = PCA(n_components=n_components, svd_solver="full")
+    scores = model.fit_transform(values)
+    # Same sign convention as scalable_pca: largest absolute loading positive.
+    signs = np.sign(model.components_[np.arange(n_components), np.argmax(np.abs(model.components_), axis=1)])
+    return model, scores * signs, model.components_ * signs[:, None]
+
+class TestScalablePca(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.df = low_rank()
+        self.model, self.scores, self.components = reference(self.df.to_numpy())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assert_matches_reference(self, result, rtol=1e-6):
+        np.testing.assert_allclose(result.pca_df.to_numpy(), self.scores, rtol=rtol, atol=rtol * 10)
+        np.testing.assert_allclose(result.components_, self.components, rtol=rtol, atol=rtol)
+        np.testing.assert_allclose(result.explained_variance_ratio_, self.model.explained_variance_ratio_, rtol=rtol)
+        np.testing.assert_allclose(result.mean_, self.model.mean_, rtol=1e-10)
+
+    def test_in_memory_modes(self):
+        for mode in ("exact", "randomized", "incremental"):
+            result = run_pca(self.df, n_components=3, mode=mode, batch_size=64)
+            self.assert_matches_reference(result, rtol=1e-3 if mode == "incremental" else 1e-6)
+            self.assertEqual(list(result.pca_df.index), list(self.df.index))
+            self.assertEqual(list(result.pca_df.columns), ["PC1", "PC2", "PC3"])
+
+    def test_files_are_streamed(self):
+        npy_file = os.path.join(self.tmpdir.name, "expr.npy")
+        np.save(npy_file, self.df.to_numpy())
+        parquet_file = os.path.join(self.tmpdir.name, "expr.parquet")
+        self.df.rename_axis("sample").reset_index().to_parquet(parquet_file, row_group_size=100)
+        self.assertEqual(choose_mode(npy_file), "incremental")
+        self.assert_matches_reference(run_pca(npy_file, n_components=3, batch_size=64), rtol=1e-3)
+        result = run_pca(parquet_file, n_components=3, batch_size=64, index_column="sample")
+        self.assert_matches_reference(result, rtol=1e-3)
+        self.assertEqual(list(result.pca_df.index), list(self.df.index))
+
+    def test_sparse_matches_dense(self):
+        rng = np.random.default_rng(1)
+        counts = sparse.random(300, 80, density=0.1, random_state=2, data_rvs=lambda k: rng.poisson(3, k) + 1.0)
+        counts = sparse.csr_matrix(counts + sparse.csr_matrix(self.df.to_numpy() > 12).astype(float) * 20)
+        self.model, self.scores, self.components = reference(counts.toarray())
+        self.assertEqual(choose_mode(counts), "sparse")
+        self.assert_matches_reference(run_pca(counts, n_components=3), rtol=1e-6)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import theme
+
+def style_02_to_06(ax, tick_labels=True):
+    # The per-axes calls 02-05 made; 06 made the same without tick labels.
+    ax.set_facecolor("#f2f2f2")
+    ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
+    ax.grid(which="minor", linestyle="-", linewidth=0.25, color="#dbe3db")
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["bottom"].set_linewidth(0.5)
+    ax.spines["left"].set_linewidth(0.5)
+    if tick_labels:
+        ax.tick_params(axis="x", labelsize=12)
+        ax.tick_params(axis="y", labelsize=12)
+
+def style_09(ax):
+    ax.set_facecolor("#f9f9f9")
+    ax.grid(which="major", linestyle="-", linewidth=0.5, color="#dbe3db")
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["left"].set_visible(False)
+    ax.spines["bottom"].set_linewidth(0.5)
+
+def render(style=None):
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=50)
+    ax.bar(np.arange(5), [3, 5, 2, 6, 4], color="#2c5aa0", edgecolor="#1a1a1a")
+    ax.plot(np.arange(5), [2, 4, 3, 5, 1], color="#a02c2c")
+    ax.set_title("Figure", fontsize=14)
+    if style is not None:
+        style(ax)
+    fig.canvas.draw()
+    image = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return image
+
+class TestTheme(unittest.TestCase):
+    def test_matches_per_axes_styling(self):
+        cases = [
+            (None, lambda ax: style_02_to_06(ax)),
+            ({"xtick.labelsize": "medium", "ytick.labelsize": "medium"}, lambda ax: style_02_to_06(ax, False)),
+            ({"axes.facecolor": "#f9f9f9", "axes.spines.left": False, "axes.grid.which": "major",
+              "xtick.labelsize": "medium", "ytick.labelsize": "medium"}, style_09),
+        ]
+        for overrides, style in cases:
+            with matplotlib.rc_context():
+                expected = render(style)
+            with theme.context(overrides=overrides):
+                np.testing.assert_array_equal(render(), expected)
+
+    def test_registered_and_scoped(self):
+        self.assertIn("publication", matplotlib.style.available)
+        self.assertIn("publication-fast", matplotlib.style.available)
+        self.assertTrue(set(theme.FAST) <= set(matplotlib.rcParams))
+        facecolor = matplotlib.rcParams["axes.facecolor"]
+        with theme.context(overrides={"axes.facecolor": "#f9f9f9"}):
+            self.assertEqual(matplotlib.rcParams["axes.facecolor"], "#f9f9f9")
+            self.assertEqual(matplotlib.rcParams["grid.color"], "#dbe3db")
+        self.assertEqual(matplotlib.rcParams["axes.facecolor"], facecolor)
+
+    def test_fast(self):
+        with theme.context(fast=True):
+            self.assertEqual(matplotlib.rcParams["axes.grid.which"], "major")
+            self.assertFalse(matplotlib.rcParams["lines.antialiased"])
+            self.assertFalse(matplotlib.rcParams["patch.antialiased"])
+            self.assertEqual(matplotlib.rcParams["axes.facecolor"], "#f2f2f2")
+            self.assertEqual(render().shape, (150, 200, 4))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.manifold import TSNE, trustworthiness
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import StandardScaler
+from tsne_pipeline import embed, knn_graph, neighbours_for, neighbours_needed, reduce, run_tsne, scale_in_place
+
+def clusters(n_per_cluster=150, n_features=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(scale=4.0, size=(4, n_features))
+    return np.vstack([centre + rng.normal(size=(n_per_cluster, n_features)) for centre in centres]).astype(np.float32)
+
+def exact_neighbours(Y, k):
+    return NearestNeighbors(n_neighbors=k + 1).fit(Y).kneighbors(Y)
+
+class TestTsnePipeline(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.X = clusters()
+        self.Y = reduce(scale_in_place(self.X.copy()), 10)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_scale_in_place(self):
+        X = self.X.copy()
+        self.assertIs(scale_in_place(X), X)
+        np.testing.assert_allclose(X, StandardScaler().fit_transform(self.X.astype(np.float64)), atol=1e-5)
+
+    def test_exact_graph_matches_nearest_neighbors(self):
+        k = 15
+        distances, indices = exact_neighbours(self.Y, k)
+        graph = knn_graph(self.Y, k, "exact")
+        self.assertEqual(graph.shape, (len(self.Y), len(self.Y)))
+        np.testing.assert_array_equal(graph.indices.reshape(-1, k), indices[:, 1:])
+        np.testing.assert_allclose(graph.data.reshape(-1, k), distances[:, 1:], rtol=1e-5)
+
+    def test_ivf_graph_recall(self):
+        k = 15
+        _, indices = exact_neighbours(self.Y, k)
+        graph = knn_graph(self.Y, k, "ivf")
+        found = graph.indices.reshape(-1, k)
+        recall = np.mean([len(np.intersect1d(a, b)) / k for a, b in zip(found, indices[:, 1:])])
+        self.assertGreater(recall, 0.95)
+
+    def test_graph_cache(self):
+        graph = knn_graph(self.Y, 15, "ivf", cache_dir=self.tmpdir.name)
+        self.assertEqual(len(os.listdir(self.tmpdir.name)), 1)
+        cached = knn_graph(self.Y, 15, "ivf", cache_dir=self.tmpdir.name)
+        np.testing.assert_array_equal(cached.indices, graph.indices)
+        np.testing.assert_array_equal(cached.data, graph.data)
+        knn_graph(self.Y, 20, "ivf", cache_dir=self.tmpdir.name)
+        self.assertEqual(len(os.listdir(self.tmpdir.name)), 2)
+
+    def test_neighbours_for_keeps_the_nearest_neighbours(self):
+        perplexity = 5
+        needed = neighbours_needed(perplexity)
+        graph = knn_graph(self.Y, 3 * needed, "exact")
+        # What sklearn's TSNE reads from a precomputed graph: it must be the
+        # same neighbours as its own search on Y.
+        seen = NearestNeighbors(n_neighbors=needed, metric="precomputed").fit(neighbours_for(graph, perplexity))
+        _, indices = exact_neighbours(self.Y, needed)
+        np.testing.assert_array_equal(seen.kneighbors_graph(mode="distance").indices.reshape(-1, needed),
+                                      indices[:, 1:])
+        with self.assertRaisesRegex(ValueError, "neighbours"):
+            neighbours_for(graph, 30)
+
+    def test_embedding_matches_sklearn(self):
+        perplexity = 10
+        graph = knn_graph(self.Y, neighbours_needed(perplexity), "exact")
+        embedding = embed(self.Y, graph, perplexity, random_state=0)
+        init = (self.Y[:, :2] / np.std(self.Y[:, 0]) * 1e-4).astype(np.float32)
+        reference = TSNE(perplexity=perplexity, init=init, random_state=0)
+        expected = reference.fit_transform(self.Y)
+        self.assertAlmostEqual(trustworthiness(self.Y, embedding, n_neighbors=10),
+                               trustworthiness(self.Y, expected, n_neighbors=10), delta=0.01)
+
+    def test_run_tsne(self):
+        df = pd.DataFrame(self.X, index=[f"Sample{i + 1}" for i in range(len(self.X))])
+        tsne_df = run_tsne(df, perplexity=10, n_pca=10, cache_dir=self.tmpdir.name, random_state=0)
+        self.assertEqual(list(tsne_df.columns), ["tSNE1", "tSNE2"])
+        self.assertEqual(list(tsne_df.index), list(df.index))
+        self.assertGreater(trustworthiness(self.Y, tsne_df.to_numpy(), n_neighbors=10), 0.9)
+
+if __name__ == "__main__":
+    unittest.main()
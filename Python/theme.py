@@ -0,0 +1,75 @@
+"""
+The plotting scripts' shared look as a registered matplotlib style.
+
+The scripts used to restyle every axes after drawing: face colour, major and
+minor grid, spines and tick label sizes. The same settings are now rcParams,
+so new axes are created already styled. Importing this module registers two
+styles:
+
+    publication       the scripts' look
+    publication-fast  the same without minor grid lines or antialiasing of
+                      lines and patches, for bulk rendering
+
+Use them with theme.use() / theme.context(), or through matplotlib directly
+(plt.style.use("publication")).
+
+Not every script used every setting. Scripts pass overrides to keep their
+own look, e.g. 08 and 09 keep their #f9f9f9 face colour, major grid only and
+default tick label sizes. Axes titles and labels default to 14 pt, the size
+the scripts pass explicitly, for batch_render's jobs.
+
+Separate major and minor grid widths need matplotlib's grid.major.* and
+grid.minor.* rcParams, which only recent matplotlib releases have. On older
+versions both grids use grid.linewidth, the major width.
+"""
+import matplotlib
+import matplotlib.style
+from matplotlib import RcParams
+
+_GRID_WIDTHS = {"grid.major.linewidth": 0.5, "grid.minor.linewidth": 0.25}
+
+PUBLICATION = {
+    "axes.facecolor": "#f2f2f2",
+    "axes.grid": True,
+    "axes.grid.which": "both",
+    "grid.color": "#dbe3db",
+    "grid.linestyle": "-",
+    "grid.linewidth": 0.5,
+    **{key: value for key, value in _GRID_WIDTHS.items() if key in matplotlib.rcParams},
+    "axes.spines.top": False,
+    "axes.spines.right": False,
+    "axes.linewidth": 0.5,
+    "axes.titlesize": 14,
+    "axes.labelsize": 14,
+    "xtick.labelsize": 12,
+    "ytick.labelsize": 12
+}
+
+FAST = {
+    **PUBLICATION,
+    "axes.grid.which": "major",
+    "lines.antialiased": False,
+    "patch.antialiased": False
+}
+
+STYLES = {"publication": PUBLICATION, "publication-fast": FAST}
+
+def register():
+    """Adds STYLES to matplotlib's style library (done on import)."""
+    for name, params in STYLES.items():
+        matplotlib.style.library[name] = RcParams(params)
+        if name not in matplotlib.style.available:
+            matplotlib.style.available.append(name)
+
+def _styles(fast, overrides):
+    return ["publication-fast" if fast else "publication", overrides or {}]
+
+def use(fast=False, overrides=None):
+    """Applies the theme globally, as the numbered scripts do at the top."""
+    matplotlib.style.use(_styles(fast, overrides))
+
+def context(fast=False, overrides=None):
+    """The theme as a context manager, for code that must not change global rcParams."""
+    return matplotlib.style.context(_styles(fast, overrides))
+
+register()
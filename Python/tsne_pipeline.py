@@ -0,0 +1,202 @@
+"""
+t-SNE for large sample counts: PCA, then a cached kNN graph, then Barnes-Hut.
+
+The steps, each reusable on its own:
+
+    scale_in_place   standardize features in float32 without a second copy
+    reduce           randomized PCA to ~50 components (scalable_pca)
+    knn_graph        k nearest neighbours of every point. Uses pynndescent
+                     when it is installed, otherwise a built-in IVF index
+                     (k-means cells, probing the closest cells); below
+                     EXACT_MAX_POINTS the search is exact. The graph is
+                     cached on disk under a hash of the reduced data and the
+                     search settings, so perplexity or seed sweeps only
+                     build it once.
+    embed            sklearn's Barnes-Hut t-SNE on the precomputed sparse
+                     graph; its gradient runs on all OpenMP threads
+
+run_tsne chains the steps and returns the tsne_df shape that 15_tSNE.py plots.
+"""
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.manifold import TSNE
+from sklearn.neighbors import NearestNeighbors
+
+from scalable_pca import run_pca
+
+try:
+    import pynndescent
+except ImportError:  # optional; the IVF index below is used instead
+    pynndescent = None
+
+EXACT_MAX_POINTS = 20_000
+
+def scale_in_place(X):
+    """
+    Standardizes the columns of X to zero mean and unit variance, in place
+    when X is already a writable float32 array (otherwise after one float32
+    copy). Returns the scaled array.
+    """
+    X = X.to_numpy() if isinstance(X, pd.DataFrame) else X
+    if not (isinstance(X, np.ndarray) and X.dtype == np.float32 and X.flags.writeable):
+        X = np.array(X, dtype=np.float32)
+    mean = X.mean(axis=0, dtype=np.float64).astype(np.float32)
+    X -= mean
+    std = np.sqrt(np.einsum("ij,ij->j", X, X, dtype=np.float64) / len(X)).astype(np.float32)
+    std[std == 0] = 1.0
+    X /= std
+    return X
+
+def reduce(X, n_components=50, random_state=0):
+    """PCA to at most n_components dimensions, as float32."""
+    n_components = min(n_components, X.shape[1], X.shape[0] - 1)
+    return run_pca(X, n_components, mode="randomized", random_state=random_state).pca_df.to_numpy(dtype=np.float32)
+
+def _exact_knn(Y, k, n_jobs):
+    distances, indices = NearestNeighbors(n_neighbors=k + 1, n_jobs=n_jobs).fit(Y).kneighbors(Y)
+    return indices[:, 1:], distances[:, 1:]
+
+def _ivf_knn(Y, k, n_jobs, n_probe=16, random_state=0):
+    """
+    Approximate kNN: points are bucketed into ~sqrt(n) k-means cells, and
+    each cell's points are searched against the points of the n_probe cells
+    nearest its centroid (including itself) with one block distance product.
+    """
+    n = len(Y)
+    n_cells = max(1, min(int(np.sqrt(n)), n // (2 * k)))
+    kmeans = MiniBatchKMeans(n_clusters=n_cells, batch_size=4096, n_init=1, random_state=random_state)
+    kmeans.fit(Y[np.random.default_rng(random_state).choice(n, min(n, 256 * n_cells), replace=False)])
+    cells = kmeans.predict(Y)
+    members = np.split(np.argsort(cells, kind="stable"), np.cumsum(np.bincount(cells, minlength=n_cells))[:-1])
+    centroids = kmeans.cluster_centers_
+    probes = NearestNeighbors(n_neighbors=min(n_probe, n_cells)).fit(centroids).kneighbors(centroids)[1]
+    squared_norms = np.einsum("ij,ij->i", Y, Y)
+
+    indices = np.empty((n, k), dtype=np.int64)
+    distances = np.empty((n, k), dtype=np.float32)
+
+    def search(cell):
+        queries = members[cell]
+        if len(queries) == 0:
+            return
+        candidates = np.concatenate([members[probe] for probe in probes[cell]])
+        # Widen the probe if the nearby cells hold fewer than k other points.
+        extra = n_probe
+        while len(candidates) <= k and extra < n_cells:
+            extra = min(n_cells, extra * 2)
+            nearest = NearestNeighbors(n_neighbors=extra).fit(centroids).kneighbors(centroids[cell:cell + 1])[1][0]
+            candidates = np.concatenate([members[probe] for probe in nearest])
+        block = squared_norms[queries, None] + squared_norms[None, candidates] - 2 * Y[queries] @ Y[candidates].T
+        block[candidates[None, :] == queries[:, None]] = np.inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(block, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1)
+        indices[queries] = candidates[np.take_along_axis(nearest, order, axis=1)]
+        distances[queries] = np.sqrt(np.maximum(np.take_along_axis(nearest_distances, order, axis=1), 0))
+
+    # The distance products run in BLAS, which releases the GIL.
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        list(executor.map(search, range(n_cells)))
+    return indices, distances
+
+def _pynndescent_knn(Y, k, n_jobs, random_state=0):
+    index = pynndescent.NNDescent(Y, n_neighbors=k + 1, n_jobs=n_jobs, random_state=random_state)
+    indices, distances = index.neighbor_graph
+    return indices[:, 1:], distances[:, 1:]
+
+def graph_key(Y, k, method):
+    digest = hashlib.sha256(np.ascontiguousarray(Y).view(np.uint8).ravel())
+    digest.update(repr((Y.shape, str(Y.dtype), k, method)).encode())
+    return digest.hexdigest()
+
+def knn_graph(Y, k=91, method="auto", n_jobs=None, cache_dir=None, random_state=0):
+    """
+    Returns the kNN graph of Y as an n x n CSR matrix of Euclidean distances
+    (k per row, sorted, self excluded). method is "exact", "ivf",
+    "pynndescent" or "auto". With cache_dir, a graph built earlier for the
+    same data and settings is loaded instead of rebuilt.
+    """
+    n = len(Y)
+    k = min(k, n - 1)
+    if method == "auto":
+        method = "exact" if n <= EXACT_MAX_POINTS else "pynndescent" if pynndescent is not None else "ivf"
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    path = None
+    if cache_dir is not None:
+        path = os.path.join(cache_dir, f"knn-{graph_key(Y, k, method)}.npz")
+        if os.path.exists(path):
+            with np.load(path) as cached:
+                indices, distances = cached["indices"], cached["distances"]
+            return _to_csr(indices, distances, n)
+
+    if method == "exact":
+        indices, distances = _exact_knn(Y, k, n_jobs)
+    elif method == "ivf":
+        indices, distances = _ivf_knn(Y, k, n_jobs, random_state=random_state)
+    elif method == "pynndescent":
+        if pynndescent is None:
+            raise ImportError("method='pynndescent' needs the pynndescent package.")
+        indices, distances = _pynndescent_knn(Y, k, n_jobs, random_state)
+    else:
+        raise ValueError(f"Unknown kNN method '{method}'.")
+
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, indices=indices.astype(np.int32 if n < 2**31 else np.int64), distances=distances.astype(np.float32))
+        os.replace(tmp_path, path)
+    return _to_csr(indices, distances, n)
+
+def _to_csr(indices, distances, n):
+    k = indices.shape[1]
+    return sparse.csr_matrix((distances.ravel().astype(np.float32), indices.ravel(), np.arange(0, n * k + 1, k)), shape=(n, n))
+
+def neighbours_needed(perplexity):
+    return int(3 * perplexity + 1)
+
+def neighbours_for(graph, perplexity):
+    """
+    Keeps the 3 * perplexity + 1 neighbours Barnes-Hut t-SNE uses for this
+    perplexity, so one graph built for the largest perplexity of a sweep
+    serves them all. Each point is prepended as its own neighbour at
+    distance 0: sklearn drops the first column of a precomputed graph as the
+    self match, which would otherwise discard the true nearest neighbour.
+    """
+    k = graph.indptr[1] - graph.indptr[0]
+    needed = neighbours_needed(perplexity)
+    if needed > k:
+        raise ValueError(f"Perplexity {perplexity} needs {needed} neighbours; the graph has {k}.")
+    n = graph.shape[0]
+    indices = np.hstack([np.arange(n)[:, None], graph.indices.reshape(n, k)[:, :needed]])
+    distances = np.hstack([np.zeros((n, 1), dtype=graph.data.dtype), graph.data.reshape(n, k)[:, :needed]])
+    return _to_csr(indices, distances, n)
+
+def embed(Y, graph, perplexity=30.0, random_state=42, n_jobs=None, **tsne_options):
+    """
+    Barnes-Hut t-SNE from a precomputed kNN graph. Initialized from the first
+    two principal components of Y, scaled like sklearn's init="pca".
+    """
+    init = Y[:, :2] / np.std(Y[:, 0]) * 1e-4
+    tsne = TSNE(n_components=2, perplexity=perplexity, metric="precomputed", init=init.astype(np.float32),
+                method="barnes_hut", random_state=random_state, n_jobs=n_jobs, **tsne_options)
+    return tsne.fit_transform(neighbours_for(graph, perplexity))
+
+def run_tsne(X, perplexity=30.0, n_pca=50, knn_method="auto", cache_dir=None, random_state=42, n_jobs=None,
+             index=None, **tsne_options):
+    """
+    Scales X (in place if it is a float32 array), reduces it with PCA, builds
+    or loads the kNN graph and runs t-SNE. Returns tsne_df with columns
+    tSNE1/tSNE2.
+    """
+    index = X.index if isinstance(X, pd.DataFrame) and index is None else index
+    Y = reduce(scale_in_place(X), n_pca, random_state)
+    graph = knn_graph(Y, neighbours_needed(perplexity), knn_method, n_jobs, cache_dir, random_state)
+    embedding = embed(Y, graph, perplexity, random_state, n_jobs, **tsne_options)
+    return pd.DataFrame(embedding, columns=["tSNE1", "tSNE2"], index=index)
@@ -0,0 +1,72 @@
+"""
+Benchmarks Snakemake DAG construction for large sample sheets.
+
+For each sample count, creates a work directory with a sample sheet and
+empty stub FASTQ files, then times `snakemake --dry-run` twice: cold (no
+sample sheet cache, so every FASTQ is checked) and warm (validated index
+served from the sidecar cache). Also times load_sample_sheet on its own.
+
+Usage:
+    python benchmarks/bench_dag_build.py --samples 1000 10000 20000
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+from sample_sheet import cache_path, load_sample_sheet  # noqa: E402
+
+def write_workdir(work_dir, n_samples):
+    reads_dir = os.path.join(work_dir, "data", "raw_reads")
+    os.makedirs(reads_dir)
+    names = [f"S{i:06d}" for i in range(n_samples)]
+    with open(os.path.join(work_dir, "data", "samples.tsv"), "w") as f:
+        f.write("sample\tcondition\n" + "".join(f"{name}\t{'case' if i % 2 else 'control'}\n" for i, name in enumerate(names)))
+    for name in names:
+        for read in ("R1", "R2"):
+            open(os.path.join(reads_dir, f"{name}_{read}.fastq.gz"), "w").close()
+    shutil.copy(os.path.join(ROOT_DIR, "snakemake_config.yaml"), work_dir)
+
+def dry_run(work_dir):
+    start = time.perf_counter()
+    subprocess.run(["snakemake", "--snakefile", os.path.join(ROOT_DIR, "snakemake.py"), "--directory", work_dir,
+                    "--cores", "8", "--dry-run", "--quiet", "all"], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+def timed_load(sheet):
+    start = time.perf_counter()
+    load_sample_sheet(sheet)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, nargs="+", default=[1000, 10000, 20000])
+    parser.add_argument("--skip-snakemake", action="store_true", help="only time the sample sheet loader")
+    args = parser.parse_args()
+
+    print(f"{'samples':>8} {'load cold (s)':>14} {'load warm (s)':>14} {'DAG cold (s)':>13} {'DAG warm (s)':>13}")
+    for n_samples in args.samples:
+        with tempfile.TemporaryDirectory() as work_dir:
+            write_workdir(work_dir, n_samples)
+            sheet = os.path.join(work_dir, "data", "samples.tsv")
+            cwd = os.getcwd()
+            os.chdir(work_dir)
+            try:
+                load_cold = timed_load("data/samples.tsv")
+                load_warm = timed_load("data/samples.tsv")
+            finally:
+                os.chdir(cwd)
+            dag_cold = dag_warm = float("nan")
+            if not args.skip_snakemake:
+                os.remove(cache_path(sheet))
+                dag_cold = dry_run(work_dir)
+                dag_warm = dry_run(work_dir)
+            print(f"{n_samples:>8} {load_cold:>14.3f} {load_warm:>14.3f} {dag_cold:>13.1f} {dag_warm:>13.1f}")
+
+if __name__ == "__main__":
+    main()
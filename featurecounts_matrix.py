@@ -0,0 +1,72 @@
+"""
+Turns a multi-sample featureCounts table into a gene-by-sample count matrix.
+
+featureCounts run over several BAMs writes one table with the annotation
+columns (Geneid, Chr, Start, End, Strand, Length) followed by one count
+column per BAM, named by BAM path. This writes the counts as a TSV matrix
+with sample names as columns, plus a compact NPZ copy (counts, genes,
+samples) for downstream Python analysis.
+
+Usage:
+    python featurecounts_matrix.py counts.txt --samples S1 S2 --tsv matrix.tsv --npz matrix.npz
+"""
+import argparse
+import csv
+
+import numpy as np
+
+ANNOTATION_COLUMNS = ["Geneid", "Chr", "Start", "End", "Strand", "Length"]
+
+def read_featurecounts(path, samples=None):
+    """
+    Returns (genes, samples, counts) from a featureCounts output file.
+    samples renames the count columns in order; by default the BAM
+    paths from the header are kept.
+    """
+    with open(path) as f:
+        rows = csv.reader((line for line in f if not line.startswith("#")), delimiter="\t")
+        header = next(rows)
+        if header[:len(ANNOTATION_COLUMNS)] != ANNOTATION_COLUMNS:
+            raise ValueError(f"'{path}' does not look like featureCounts output: header {header[:6]}")
+        columns = header[len(ANNOTATION_COLUMNS):]
+        genes, counts = [], []
+        for row in rows:
+            genes.append(row[0])
+            counts.append(row[len(ANNOTATION_COLUMNS):])
+
+    samples = list(samples) if samples is not None else columns
+    if len(samples) != len(columns):
+        raise ValueError(f"Got {len(samples)} sample names for {len(columns)} count columns in '{path}'.")
+    counts = np.array(counts, dtype=np.int64).reshape(len(genes), len(columns))
+    return genes, samples, counts
+
+def write_matrix_tsv(path, genes, samples, counts):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, delimiter="\t", lineterminator="\n")
+        writer.writerow(["Geneid"] + list(samples))
+        for gene, row in zip(genes, counts):
+            writer.writerow([gene] + row.tolist())
+
+def write_matrix_npz(path, genes, samples, counts):
+    """
+    Writes a compressed NPZ with counts (uint32 when it fits), genes and samples.
+    """
+    if counts.size == 0 or counts.max() <= np.iinfo(np.uint32).max:
+        counts = counts.astype(np.uint32)
+    with open(path, "wb") as f:
+        np.savez_compressed(f, counts=counts, genes=np.array(genes), samples=np.array(samples))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("counts", help="featureCounts output over all sample BAMs")
+    parser.add_argument("--samples", nargs="+", help="sample names, in BAM order")
+    parser.add_argument("--tsv", required=True)
+    parser.add_argument("--npz", required=True)
+    args = parser.parse_args()
+
+    genes, samples, counts = read_featurecounts(args.counts, args.samples)
+    write_matrix_tsv(args.tsv, genes, samples, counts)
+    write_matrix_npz(args.npz, genes, samples, counts)
+
+if __name__ == "__main__":
+    main()
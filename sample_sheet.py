@@ -0,0 +1,122 @@
+"""
+Loads and validates the workflow sample sheet.
+
+The sheet is a TSV whose header names a `sample` column. It may also have
+`r1` and `r2` columns with FASTQ paths; when these are missing or empty the
+paths default to data/raw_reads/<sample>_R1/_R2.fastq.gz. Every other column
+is kept as string metadata.
+
+Snakemake evaluates the Snakefile more than once per run, so the validated
+index is cached in a JSON sidecar next to the sheet. The cache is keyed by
+the sheet's mtime, size and SHA-256. A cache hit skips parsing and the FASTQ
+existence checks. A cache miss runs those checks on a thread pool, because
+they are dominated by stat latency on network filesystems.
+"""
+import csv
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+
+CACHE_VERSION = 1
+DEFAULT_READS = "data/raw_reads/{sample}_{read}.fastq.gz"
+SAMPLE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+@dataclass(frozen=True)
+class Sample:
+    name: str
+    r1: str
+    r2: str
+    metadata: dict = field(default_factory=dict)
+
+def cache_path(sheet_path):
+    directory, name = os.path.split(sheet_path)
+    return os.path.join(directory, f".{name}.index.json")
+
+def sheet_key(sheet_path):
+    stat = os.stat(sheet_path)
+    with open(sheet_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return {"version": CACHE_VERSION, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+
+def parse_sample_sheet(sheet_path):
+    """
+    Parses the sheet into {sample: Sample}, in file order. Raises ValueError
+    listing every malformed row.
+    """
+    with open(sheet_path, newline="") as f:
+        rows = list(csv.reader((line for line in f if line.strip() and not line.startswith("#")), delimiter="\t"))
+    if not rows or "sample" not in rows[0]:
+        raise ValueError(f"Sample sheet '{sheet_path}' needs a header row with a 'sample' column.")
+
+    header, errors, samples = rows[0], [], {}
+    for line_number, row in enumerate(rows[1:], start=2):
+        if len(row) != len(header):
+            errors.append(f"row {line_number}: expected {len(header)} columns, found {len(row)}")
+            continue
+        values = dict(zip(header, (value.strip() for value in row)))
+        name = values.pop("sample")
+        if not SAMPLE_NAME.match(name):
+            errors.append(f"row {line_number}: invalid sample name '{name}'")
+            continue
+        if name in samples:
+            errors.append(f"row {line_number}: duplicate sample '{name}'")
+            continue
+        r1 = values.pop("r1", "") or DEFAULT_READS.format(sample=name, read="R1")
+        r2 = values.pop("r2", "") or DEFAULT_READS.format(sample=name, read="R2")
+        if r1 == r2:
+            errors.append(f"row {line_number}: R1 and R2 are the same file '{r1}'")
+            continue
+        samples[name] = Sample(name, r1, r2, values)
+
+    if errors:
+        raise ValueError(f"Invalid sample sheet '{sheet_path}':\n  " + "\n  ".join(errors[:20]))
+    if not samples:
+        raise ValueError(f"Sample sheet '{sheet_path}' lists no samples.")
+    return samples
+
+def missing_inputs(samples, max_workers=32):
+    """FASTQ paths of samples that do not exist, checked concurrently."""
+    paths = [path for sample in samples.values() for path in (sample.r1, sample.r2)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        exists = list(executor.map(os.path.exists, paths, chunksize=256))
+    return [path for path, found in zip(paths, exists) if not found]
+
+def load_sample_sheet(sheet_path, check_inputs=True, use_cache=True):
+    """
+    Returns the validated {sample: Sample} index, from the sidecar cache when
+    the sheet is unchanged. Raises ValueError for malformed sheets and
+    FileNotFoundError when check_inputs is set and FASTQ files are missing.
+    """
+    key = sheet_key(sheet_path)
+    sidecar = cache_path(sheet_path)
+    if use_cache:
+        try:
+            with open(sidecar) as f:
+                cached = json.load(f)
+            if cached["key"] == key and (cached["inputs_checked"] or not check_inputs):
+                return {entry["name"]: Sample(**entry) for entry in cached["samples"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    samples = parse_sample_sheet(sheet_path)
+    if check_inputs:
+        missing = missing_inputs(samples)
+        if missing:
+            raise FileNotFoundError(f"{len(missing)} FASTQ files listed by '{sheet_path}' are missing, e.g. "
+                                    + ", ".join(missing[:5]))
+
+    if use_cache:
+        payload = {"key": key, "inputs_checked": check_inputs, "samples": [asdict(sample) for sample in samples.values()]}
+        tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, sidecar)
+        except OSError:
+            # A read-only sheet directory only costs the cache.
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return samples
@@ -1,30 +1,74 @@
-# Load sample information
-SAMPLES = [line.strip().split("\t")[0] for line in open("data/samples.tsv") if line.strip()]
+import os
+import sys
+
+sys.path.insert(0, workflow.basedir)
+from sample_sheet import load_sample_sheet
+
+configfile: "snakemake_config.yaml"
+
+# Load sample information (validated once, then served from a sidecar cache)
+SAMPLE_SHEET = load_sample_sheet(config["samples"], check_inputs=config.get("check_sample_inputs", True))
+SAMPLES = list(SAMPLE_SHEET)
+
+def sort_threads(threads):
+    """samtools sort threads within the align_reads budget (threads may be capped by --cores)."""
+    return max(1, min(config["align_reads"]["sort_threads"], threads - 1))
+
+def trimmed_reads(read):
+    """Trimmed FASTQ path: gzipped on disk, or an uncompressed stream when not kept."""
+    if config["keep_trimmed_reads"]:
+        return f"results/trimmed_reads/{{sample}}_{read}.trimmed.fastq.gz"
+    return f"results/trimmed_reads/{{sample}}_{read}.trimmed.fastq"
+
+def trimmed_reads_output(read):
+    """
+    With keep_trimmed_reads off, fastp writes into a named pipe that hisat2
+    reads as it is produced, so no trimmed FASTQ is compressed or stored.
+    """
+    return trimmed_reads(read) if config["keep_trimmed_reads"] else pipe(trimmed_reads(read))
+
+def count_outputs():
+    outputs = []
+    if config["counting"] in ("matrix", "both"):
+        outputs += ["results/counts/counts_matrix.tsv", "results/counts/counts_matrix.npz"]
+    if config["counting"] in ("per_sample", "both"):
+        outputs += expand("results/counts/{sample}.counts.txt", sample=SAMPLES)
+    return outputs
 
 rule all:
     input:
-        expand("results/counts/{sample}.counts.txt", sample=SAMPLES)
+        count_outputs()
 
 rule trim_reads:
     input:
-        r1="data/raw_reads/{sample}_R1.fastq.gz",
-        r2="data/raw_reads/{sample}_R2.fastq.gz"
+        r1=lambda wildcards: SAMPLE_SHEET[wildcards.sample].r1,
+        r2=lambda wildcards: SAMPLE_SHEET[wildcards.sample].r2
     output:
-        r1="results/trimmed_reads/{sample}_R1.trimmed.fastq.gz",
-        r2="results/trimmed_reads/{sample}_R2.trimmed.fastq.gz"
+        r1=trimmed_reads_output("R1"),
+        r2=trimmed_reads_output("R2")
+    threads: config["trim_reads"]["threads"]
+    resources:
+        mem_mb=config["trim_reads"]["mem_mb"]
     shell:
-        "fastp -i {input.r1} -I {input.r2} -o {output.r1} -O {output.r2}"
+        "fastp -w {threads} -i {input.r1} -I {input.r2} -o {output.r1} -O {output.r2}"
 
 rule align_reads:
     input:
-        r1="results/trimmed_reads/{sample}_R1.trimmed.fastq.gz",
-        r2="results/trimmed_reads/{sample}_R2.trimmed.fastq.gz"
+        r1=trimmed_reads("R1"),
+        r2=trimmed_reads("R2")
     output:
         "results/alignments/{sample}.bam"
     params:
-        index="ref/genome_index"
+        index=config["genome_index"],
+        hisat2_threads=lambda wildcards, threads: max(1, threads - sort_threads(threads)),
+        sort_threads=lambda wildcards, threads: sort_threads(threads),
+        sort_mem=config["align_reads"]["sort_mem_per_thread"]
+    threads: config["align_reads"]["threads"]
+    resources:
+        mem_mb=config["align_reads"]["mem_mb"]
     shell:
-        "hisat2 -x {params.index} -1 {input.r1} -2 {input.r2} | samtools sort -o {output}"
+        "hisat2 -p {params.hisat2_threads} -x {params.index} -1 {input.r1} -2 {input.r2} | "
+        "samtools sort -@ {params.sort_threads} -m {params.sort_mem} -o {output}"
 
 rule count_reads:
     input:
@@ -32,6 +76,27 @@ rule count_reads:
     output:
         "results/counts/{sample}.counts.txt"
     params:
-        gtf="ref/annotations.gtf"
+        gtf=config["annotation"]
+    threads: config["count_reads"]["threads"]
+    resources:
+        mem_mb=config["count_reads"]["mem_mb"]
+    shell:
+        "featureCounts -T {threads} -a {params.gtf} -o {output} {input}"
+
+rule count_matrix:
+    input:
+        expand("results/alignments/{sample}.bam", sample=SAMPLES)
+    output:
+        raw="results/counts/featurecounts_all.txt",
+        tsv="results/counts/counts_matrix.tsv",
+        npz="results/counts/counts_matrix.npz"
+    params:
+        gtf=config["annotation"],
+        samples=SAMPLES,
+        script=os.path.join(workflow.basedir, "featurecounts_matrix.py")
+    threads: config["count_matrix"]["threads"]
+    resources:
+        mem_mb=config["count_matrix"]["mem_mb"]
     shell:
-        "featureCounts -a {params.gtf} -o {output} {input}"
+        "featureCounts -T {threads} -a {params.gtf} -o {output.raw} {input} && "
+        "python {params.script} {output.raw} --samples {params.samples} --tsv {output.tsv} --npz {output.npz}"
@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from featurecounts_matrix import read_featurecounts, write_matrix_npz, write_matrix_tsv  # noqa: E402
+
+FEATURECOUNTS_OUTPUT = """\
+# Program:featureCounts v2.0.6; Command:"featureCounts" "-a" "ref/annotations.gtf" "-o" "counts.txt" "a.bam" "b.bam"
+Geneid\tChr\tStart\tEnd\tStrand\tLength\tresults/alignments/A.bam\tresults/alignments/B.bam
+ENSG01\tchr1;chr1\t11;50\t40;90\t+;+\t71\t5\t0
+ENSG02\tchr2\t100\t300\t-\t201\t12\t7
+"""
+
+class TestFeatureCountsMatrix(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.counts_file = os.path.join(self.tmpdir.name, "counts.txt")
+        with open(self.counts_file, "w") as f:
+            f.write(FEATURECOUNTS_OUTPUT)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_read_featurecounts(self):
+        genes, samples, counts = read_featurecounts(self.counts_file, ["A", "B"])
+        self.assertEqual(genes, ["ENSG01", "ENSG02"])
+        self.assertEqual(samples, ["A", "B"])
+        np.testing.assert_array_equal(counts, [[5, 0], [12, 7]])
+        self.assertEqual(read_featurecounts(self.counts_file)[1], ["results/alignments/A.bam", "results/alignments/B.bam"])
+        with self.assertRaises(ValueError):
+            read_featurecounts(self.counts_file, ["A"])
+
+    def test_write_matrix(self):
+        genes, samples, counts = read_featurecounts(self.counts_file, ["A", "B"])
+        tsv = os.path.join(self.tmpdir.name, "matrix.tsv")
+        npz = os.path.join(self.tmpdir.name, "matrix.npz")
+        write_matrix_tsv(tsv, genes, samples, counts)
+        write_matrix_npz(npz, genes, samples, counts)
+        with open(tsv) as f:
+            self.assertEqual(f.read(), "Geneid\tA\tB\nENSG01\t5\t0\nENSG02\t12\t7\n")
+        with np.load(npz) as matrix:
+            self.assertEqual(matrix["counts"].dtype, np.uint32)
+            np.testing.assert_array_equal(matrix["counts"], counts)
+            self.assertEqual(list(matrix["genes"]), genes)
+
+if __name__ == "__main__":
+    unittest.main()
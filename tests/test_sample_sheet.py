@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import sample_sheet  # noqa: E402
+from sample_sheet import Sample, cache_path, load_sample_sheet  # noqa: E402
+
+class TestSampleSheet(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.sheet = os.path.join(self.tmpdir.name, "samples.tsv")
+        self.fastq = os.path.join(self.tmpdir.name, "{sample}_{read}.fastq.gz")
+        for sample in ("A", "B"):
+            for read in ("R1", "R2"):
+                open(self.fastq.format(sample=sample, read=read), "w").close()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_sheet(self, text):
+        with open(self.sheet, "w") as f:
+            f.write(text)
+
+    def test_header_paths_and_metadata(self):
+        a1, a2 = self.fastq.format(sample="A", read="R1"), self.fastq.format(sample="A", read="R2")
+        self.write_sheet(f"sample\tr1\tr2\tcondition\nA\t{a1}\t{a2}\tcase\nB\t\t\tcontrol\n")
+        samples = load_sample_sheet(self.sheet, check_inputs=False)
+        self.assertEqual(list(samples), ["A", "B"])
+        self.assertEqual(samples["A"], Sample("A", a1, a2, {"condition": "case"}))
+        self.assertEqual(samples["B"].r1, "data/raw_reads/B_R1.fastq.gz")
+
+    def test_invalid_sheets(self):
+        for text in ("A\nB\n", "sample\nA\nA\n", "sample\tcondition\nA\n", "sample\nbad/name\n", "sample\n"):
+            self.write_sheet(text)
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                load_sample_sheet(self.sheet, check_inputs=False, use_cache=False)
+
+    def test_missing_inputs(self):
+        b1 = self.fastq.format(sample="B", read="R1")
+        self.write_sheet(f"sample\tr1\tr2\nB\t{b1}\t{b1}.missing\n")
+        with self.assertRaises(FileNotFoundError):
+            load_sample_sheet(self.sheet)
+        self.assertFalse(os.path.exists(cache_path(self.sheet)))
+
+    def test_cache_is_reused_until_the_sheet_changes(self):
+        a1, a2 = self.fastq.format(sample="A", read="R1"), self.fastq.format(sample="A", read="R2")
+        self.write_sheet(f"sample\tr1\tr2\nA\t{a1}\t{a2}\n")
+        first = load_sample_sheet(self.sheet)
+        with open(cache_path(self.sheet)) as f:
+            self.assertTrue(json.load(f)["inputs_checked"])
+
+        with mock.patch.object(sample_sheet, "parse_sample_sheet") as parse, \
+                mock.patch.object(sample_sheet, "missing_inputs") as missing:
+            self.assertEqual(load_sample_sheet(self.sheet), first)
+        parse.assert_not_called()
+        missing.assert_not_called()
+
+        self.write_sheet(f"sample\tr1\tr2\tcondition\nA\t{a1}\t{a2}\tcase\n")
+        self.assertEqual(load_sample_sheet(self.sheet)["A"].metadata, {"condition": "case"})
+
+if __name__ == "__main__":
+    unittest.main()
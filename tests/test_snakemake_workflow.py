@@ -0,0 +1,187 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAKEFILE = os.path.join(ROOT_DIR, "snakemake.py")
+
+# Stub fastp/hisat2/samtools/featureCounts: log each call with its start and
+# end time, sleep briefly so concurrent jobs overlap, and create the outputs.
+STUB = textwrap.dedent("""\
+    #!{python}
+    import os, sys, time
+    tool, args = os.path.basename(sys.argv[0]), sys.argv[1:]
+    def flag(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+    start = time.time()
+    time.sleep(float(os.environ.get("STUB_SECONDS", "0.5")))
+    if tool == "fastp":
+        # Write the mates record by record, both at once, and more than a pipe buffer holds.
+        outputs = [open(flag("-o"), "w"), open(flag("-O"), "w")]
+        for record in range(int(os.environ.get("STUB_RECORDS", "5000"))):
+            for out, source in zip(outputs, (flag("-i"), flag("-I"))):
+                out.write(f"trimmed {{source}} {{record}}\\n")
+        for out in outputs:
+            out.close()
+    elif tool == "hisat2":
+        # Read the mates in lockstep, one record from each in turn.
+        mates = [open(flag("-1")), open(flag("-2"))]
+        sys.stdout.write("aligned " + "".join(first + second for first, second in zip(*mates)))
+    elif tool == "samtools":
+        open(flag("-o"), "w").write(sys.stdin.read())
+    elif tool == "featureCounts":
+        bams = args[args.index(flag("-o")) + 1:]
+        with open(flag("-o"), "w") as out:
+            out.write("# Program:featureCounts v2.0.6; Command:" + " ".join(args) + "\\n")
+            out.write("\\t".join(["Geneid", "Chr", "Start", "End", "Strand", "Length"] + bams) + "\\n")
+            for gene in range(3):
+                counts = [str(gene * 10 + i) for i in range(len(bams))]
+                out.write("\\t".join([f"G{{gene}}", "chr1", "1", "100", "+", "100"] + counts) + "\\n")
+    with open(os.environ["STUB_LOG"], "a") as log:
+        log.write(f"{{tool}}\\t{{start}}\\t{{time.time()}}\\t{{' '.join(args)}}\\n")
+""")
+
+def write_stub_tools(bin_dir):
+    os.makedirs(bin_dir)
+    for tool in ("fastp", "hisat2", "samtools", "featureCounts"):
+        path = os.path.join(bin_dir, tool)
+        with open(path, "w") as f:
+            f.write(STUB.format(python=sys.executable))
+        os.chmod(path, 0o755)
+
+def write_inputs(work_dir, samples):
+    os.makedirs(os.path.join(work_dir, "data", "raw_reads"))
+    with open(os.path.join(work_dir, "data", "samples.tsv"), "w") as f:
+        f.write("sample\n" + "".join(f"{sample}\n" for sample in samples))
+    for sample in samples:
+        for read in ("R1", "R2"):
+            open(os.path.join(work_dir, "data", "raw_reads", f"{sample}_{read}.fastq.gz"), "w").close()
+
+def max_overlap(intervals):
+    """Largest total weight of (start, end, weight) intervals running at once."""
+    events = sorted([(start, weight) for start, end, weight in intervals] + [(end, -weight) for start, end, weight in intervals],
+                    key=lambda event: (event[0], event[1]))
+    current = peak = 0
+    for _, weight in events:
+        current += weight
+        peak = max(peak, current)
+    return peak
+
+@unittest.skipUnless(shutil.which("snakemake"), "snakemake is not installed")
+class TestSnakemakeScheduling(unittest.TestCase):
+    CONFIG = textwrap.dedent("""\
+        samples: "data/samples.tsv"
+        genome_index: "ref/genome_index"
+        annotation: "ref/annotations.gtf"
+        trim_reads: {threads: 4, mem_mb: 3000}
+        align_reads: {threads: 6, mem_mb: 6000, sort_threads: 2, sort_mem_per_thread: "512M"}
+        count_reads: {threads: 2, mem_mb: 1000}
+        count_matrix: {threads: 2, mem_mb: 1000}
+    """)
+    THREADS = {"fastp": 4, "hisat2": 6, "featureCounts": 2}
+    MEM_MB = {"fastp": 3000, "hisat2": 6000, "featureCounts": 1000}
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.work_dir = self.tmpdir.name
+        self.bin_dir = os.path.join(self.work_dir, "bin")
+        self.log = os.path.join(self.work_dir, "stub.log")
+        write_stub_tools(self.bin_dir)
+        write_inputs(self.work_dir, [f"S{i}" for i in range(6)])
+        self.write_config()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_config(self, counting="matrix", keep_trimmed_reads=True):
+        with open(os.path.join(self.work_dir, "snakemake_config.yaml"), "w") as f:
+            f.write(self.CONFIG + f"counting: {counting}\nkeep_trimmed_reads: {str(keep_trimmed_reads).lower()}\n")
+
+    def snakemake(self, *args, stub_seconds=0.5):
+        env = dict(os.environ, PATH=self.bin_dir + os.pathsep + os.environ["PATH"], STUB_LOG=self.log,
+                   STUB_SECONDS=str(stub_seconds))
+        return subprocess.run(
+            ["snakemake", "-s", SNAKEFILE, "--directory", self.work_dir, "--quiet", *args],
+            env=env, capture_output=True, text=True,
+        )
+
+    def calls(self):
+        with open(self.log) as f:
+            return [line.rstrip("\n").split("\t") for line in f]
+
+    def test_jobs_are_packed_within_cores_and_memory(self):
+        result = self.snakemake("--cores", "8", "--resources", "mem_mb=7000")
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        jobs = [(float(start), float(end), tool) for tool, start, end, _ in self.calls() if tool in self.THREADS]
+        self.assertEqual(len(jobs), 13)
+        self.assertLessEqual(max_overlap([(start, end, self.THREADS[tool]) for start, end, tool in jobs]), 8)
+        self.assertLessEqual(max_overlap([(start, end, self.MEM_MB[tool]) for start, end, tool in jobs]), 7000)
+        # Two 4-thread trims (or a trim plus counts) fit side by side, so jobs must overlap.
+        self.assertGreater(max_overlap([(start, end, 1) for start, end, tool in jobs]), 1)
+
+    def test_threads_and_memory_reach_the_tools(self):
+        result = self.snakemake("--cores", "8", stub_seconds=0)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        args = {tool: arguments.split() for tool, _, _, arguments in self.calls()}
+        self.assertEqual(args["fastp"][:2], ["-w", "4"])
+        self.assertEqual(args["hisat2"][:2], ["-p", "4"])
+        self.assertEqual(args["samtools"][:5], ["sort", "-@", "2", "-m", "512M"])
+        self.assertEqual(args["featureCounts"][:2], ["-T", "2"])
+
+    def test_cores_cap_thread_requests(self):
+        result = self.snakemake("--cores", "2", stub_seconds=0)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        args = {tool: arguments.split() for tool, _, _, arguments in self.calls()}
+        self.assertEqual(args["fastp"][:2], ["-w", "2"])
+        self.assertEqual(args["hisat2"][:2], ["-p", "1"])
+        self.assertEqual(args["samtools"][:3], ["sort", "-@", "1"])
+
+    def test_count_matrix_and_per_sample_outputs(self):
+        self.write_config(counting="both")
+        result = self.snakemake("--cores", "8", stub_seconds=0)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        counts_dir = os.path.join(self.work_dir, "results", "counts")
+        self.assertTrue(all(os.path.exists(os.path.join(counts_dir, f"S{i}.counts.txt")) for i in range(6)))
+        feature_counts_calls = [arguments for tool, _, _, arguments in self.calls() if tool == "featureCounts"]
+        self.assertEqual(sum("featurecounts_all.txt" in arguments for arguments in feature_counts_calls), 1)
+
+        with open(os.path.join(counts_dir, "counts_matrix.tsv")) as f:
+            header, *rows = [line.rstrip("\n").split("\t") for line in f]
+        self.assertEqual(header, ["Geneid"] + [f"S{i}" for i in range(6)])
+        self.assertEqual(rows[2], ["G2"] + [str(20 + i) for i in range(6)])
+
+        with np.load(os.path.join(counts_dir, "counts_matrix.npz")) as npz:
+            self.assertEqual(npz["counts"].shape, (3, 6))
+            self.assertEqual(list(npz["samples"]), [f"S{i}" for i in range(6)])
+
+    def test_streaming_feeds_hisat2_the_same_reads(self):
+        def alignments():
+            bam_dir = os.path.join(self.work_dir, "results", "alignments")
+            return {name: open(os.path.join(bam_dir, name)).read() for name in sorted(os.listdir(bam_dir))}
+
+        result = self.snakemake("--cores", "10", stub_seconds=0)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        kept = alignments()
+        self.assertEqual(len(os.listdir(os.path.join(self.work_dir, "results", "trimmed_reads"))), 12)
+
+        shutil.rmtree(os.path.join(self.work_dir, "results"))
+        self.write_config(keep_trimmed_reads=False)
+        result = self.snakemake("--cores", "10", stub_seconds=0)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(alignments(), kept)
+        hisat2_args = [arguments.split() for tool, _, _, arguments in self.calls() if tool == "hisat2"]
+        self.assertTrue(hisat2_args[-1][hisat2_args[-1].index("-1") + 1].endswith("_R1.trimmed.fastq"))
+        self.assertIn("aligned trimmed data/raw_reads/S0_R1.fastq.gz", kept["S0.bam"])
+        trimmed_dir = os.path.join(self.work_dir, "results", "trimmed_reads")
+        self.assertEqual(os.listdir(trimmed_dir) if os.path.isdir(trimmed_dir) else [], [])
+
+if __name__ == "__main__":
+    unittest.main()